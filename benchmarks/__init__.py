@@ -0,0 +1,6 @@
+"""Benchmarks for the SENSE bot
+
+Each module runs from the repository root with `python -m benchmarks.<name>`.
+`suite` is the load benchmark used for regression tracking; the others are
+focused micro-benchmarks for individual optimisations.
+"""
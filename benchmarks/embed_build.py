@@ -0,0 +1,60 @@
+"""Micro-benchmark: per-interaction embed build cost, fresh vs. template
+
+"fresh" builds the embed from scratch on every use, the way the menus did
+before templates. Templates registered with cached=False are built that
+way by render() too, so they should come out even.
+
+Run from the repository root:
+
+    python -m benchmarks.embed_build
+"""
+import timeit
+
+import discord
+
+from bot import embed_templates
+
+ITERATIONS = 20000
+REPEATS = 5  # Best of, to keep scheduler noise out of the small numbers
+
+# (template name, placeholder values) for every menu embed
+CASES = [
+    ("main_menu", {}),
+    ("registration_guide", {"group_url": "https://www.roblox.com/communities/35908807/about"}),
+    ("faq", {}),
+    ("role_request", {"required_role": "💚・Our Lovely Sense Member"}),
+    ("faq_schedule", {}),
+    ("faq_rules", {}),
+    ("livechat_request", {"staff": "<@&1431246790954451156>", "user": "<@1>"}),
+    ("tutorial_request", {"staff": "<@&1431246790954451156>", "user": "<@1>"}),
+    ("manual_role_request", {"staff": "<@&1431246790954451156>", "display_name": "uppucs"}),
+]
+
+
+def build_fresh(name, values):
+    """Build the embed from scratch, filling placeholders the way render() does"""
+    if name in embed_templates._direct:
+        embed = embed_templates._builders[name](**values)
+    else:
+        embed = embed_templates._builders[name]()
+        for index, field in enumerate(embed.fields):
+            if values and embed_templates._PLACEHOLDER.search(field.value):
+                embed.set_field_at(index, name=field.name, value=field.value.format(**values), inline=field.inline)
+    embed.timestamp = discord.utils.utcnow()
+    return embed
+
+
+def main():
+    embed_templates.build_all()
+
+    print(f"{'template':<22}{'fresh (us)':>12}{'render (us)':>13}{'speedup':>10}")
+    for name, values in CASES:
+        fresh = min(timeit.repeat(lambda: build_fresh(name, values), number=ITERATIONS, repeat=REPEATS))
+        render = min(timeit.repeat(lambda: embed_templates.render(name, **values), number=ITERATIONS, repeat=REPEATS))
+        fresh_us = fresh / ITERATIONS * 1e6
+        render_us = render / ITERATIONS * 1e6
+        print(f"{name:<22}{fresh_us:>12.2f}{render_us:>13.2f}{fresh_us / render_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
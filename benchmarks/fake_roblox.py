@@ -0,0 +1,151 @@
+"""Local stand-in for users.roblox.com and groups.roblox.com
+
+Serves the endpoints the bot calls with synthetic data, plus knobs for the
+things that matter under load: response latency, the share of requests
+answered with 429 or 503, and how many groups each user's roles payload
+lists.
+
+Every username resolves to an account whose id is derived from the name;
+users with an even id hold the required role in the bot's group. The role
+roster lists the role holders among `{username_prefix}0..{roster_size - 1}`.
+"""
+import asyncio
+import hashlib
+import random
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+ROSTER_PAGE_LIMIT = 100
+
+
+@dataclass
+class FakeRobloxConfig:
+    latency: float = 0.05  # Seconds added to every response
+    jitter: float = 0.0  # Extra uniformly distributed latency, in seconds
+    rate_429: float = 0.0  # Fraction of requests answered with 429
+    retry_after: float = 0.1  # Retry-After seconds sent with a 429
+    rate_5xx: float = 0.0  # Fraction of requests answered with 503 (1.0 = outage)
+    groups_per_user: int = 5  # Entries in each groups/roles payload
+    group_id: int = 0
+    role_name: str = ""
+    username_prefix: str = "bench"  # Usernames the role roster is built from
+    roster_size: int = 1000  # Usernames considered for the role roster
+    counters: dict = field(default_factory=dict)
+
+
+def user_id_for(username):
+    """Stable Roblox id for a synthetic username"""
+    digest = hashlib.blake2b(username.lower().encode(), digest_size=6).digest()
+    return int.from_bytes(digest, "big") + 1
+
+
+def _holds_role(user_id):
+    return user_id % 2 == 0
+
+
+class FakeRoblox:
+    """aiohttp application emulating the Roblox endpoints the bot uses"""
+
+    def __init__(self, config):
+        self.config = config
+        self.runner = None
+        self.base_url = None
+        candidates = (user_id_for(f"{config.username_prefix}{index}") for index in range(config.roster_size))
+        self.roster = sorted((user_id for user_id in candidates if _holds_role(user_id)), reverse=True)
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_post("/v1/usernames/users", self._usernames)
+        self.app.router.add_get("/v2/users/{user_id}/groups/roles", self._user_groups)
+        self.app.router.add_get("/v1/groups/{group_id}/roles", self._group_roles)
+        self.app.router.add_get("/v1/groups/{group_id}/roles/{role_id}/users", self._role_users)
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.runner = web.AppRunner(self.app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def close(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def reset_counters(self):
+        self.config.counters.clear()
+
+    def _count(self, key):
+        counters = self.config.counters
+        counters[key] = counters.get(key, 0) + 1
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        self._count("requests")
+        delay = self.config.latency + random.uniform(0, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.config.rate_429 and random.random() < self.config.rate_429:
+            self._count("429")
+            return web.json_response(
+                {"errors": [{"code": 0, "message": "Too many requests"}]},
+                status=429,
+                headers={"Retry-After": str(self.config.retry_after)},
+            )
+        if self.config.rate_5xx and random.random() < self.config.rate_5xx:
+            self._count("5xx")
+            return web.json_response({"errors": [{"code": 0, "message": "Service unavailable"}]}, status=503)
+        return await handler(request)
+
+    async def _usernames(self, request):
+        payload = await request.json()
+        data = []
+        for username in payload.get("usernames", []):
+            data.append({
+                "requestedUsername": username,
+                "hasVerifiedBadge": False,
+                "id": user_id_for(username),
+                "name": username,
+                "displayName": username,
+            })
+        return web.json_response({"data": data})
+
+    async def _user_groups(self, request):
+        user_id = int(request.match_info["user_id"])
+        config = self.config
+        data = [
+            {
+                "group": {"id": config.group_id + 1 + index, "name": f"Group {index}", "memberCount": 1000},
+                "role": {"id": index + 1, "name": "Member", "rank": 1},
+            }
+            for index in range(max(0, config.groups_per_user - 1))
+        ]
+        if config.groups_per_user > 0:
+            role_name = config.role_name if _holds_role(user_id) else "Guest"
+            data.append({
+                "group": {"id": config.group_id, "name": "SENSE", "memberCount": len(self.roster)},
+                "role": {"id": 255, "name": role_name, "rank": 10},
+            })
+        return web.json_response({"data": data})
+
+    async def _group_roles(self, request):
+        group_id = int(request.match_info["group_id"])
+        return web.json_response({
+            "groupId": group_id,
+            "roles": [
+                {"id": 1, "name": "Guest", "rank": 0, "memberCount": 0},
+                {"id": 255, "name": self.config.role_name, "rank": 10, "memberCount": len(self.roster)},
+            ],
+        })
+
+    async def _role_users(self, request):
+        limit = min(int(request.query.get("limit", ROSTER_PAGE_LIMIT)), ROSTER_PAGE_LIMIT)
+        start = int(request.query.get("cursor") or 0)
+        end = min(start + limit, len(self.roster))
+        data = [{"userId": user_id, "username": f"user{user_id}"} for user_id in self.roster[start:end]]
+        return web.json_response({
+            "previousPageCursor": str(start) if start else None,
+            "nextPageCursor": str(end) if end < len(self.roster) else None,
+            "data": data,
+        })
@@ -0,0 +1,257 @@
+"""Lightweight stand-ins for the discord.py objects the bot's callbacks touch
+
+Only the attributes and coroutines the callbacks actually use are
+implemented. Every Discord API call sleeps for `discord_latency` seconds
+so callback timings include a realistic round trip without a gateway.
+"""
+import asyncio
+import datetime
+import itertools
+
+import discord
+
+_ids = itertools.count(10_000)
+
+
+class _FakeHTTPResponse:
+    """Just enough of aiohttp's response for discord.HTTPException"""
+
+    def __init__(self, status, reason="fake"):
+        self.status = status
+        self.reason = reason
+
+
+class FakeDiscordAPI:
+    """Shared latency setting and call counters for every fake object"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = {}
+
+    async def call(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+
+class FakeRole:
+    def __init__(self, role_id, name):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+    def __eq__(self, other):
+        return isinstance(other, FakeRole) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeGuild:
+    def __init__(self, api, guild_id, roles):
+        self.api = api
+        self.id = guild_id
+        self.me = None
+        self.filesize_limit = 10 * 1024 * 1024
+        self._roles = {role.id: role for role in roles}
+        self._channels = {}
+
+    def get_role(self, role_id):
+        return self._roles.get(role_id)
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def add_channel(self, channel):
+        self._channels[channel.id] = channel
+        return channel
+
+
+class FakeMember:
+    bot = False
+
+    def __init__(self, guild, member_id, display_name):
+        self.guild = guild
+        self.id = member_id
+        self.display_name = display_name
+        self.name = display_name
+        self.mention = f"<@{member_id}>"
+        self.roles = []
+
+    async def add_roles(self, *roles, reason=None):
+        await self.guild.api.call("add_roles")
+        self.roles.extend(role for role in roles if role not in self.roles)
+
+    async def remove_roles(self, *roles, reason=None):
+        await self.guild.api.call("remove_roles")
+        self.roles = [role for role in self.roles if role not in roles]
+
+
+class FakeAttachment:
+    content_type = "image/png"
+
+    def __init__(self, attachment_id, filename, size):
+        self.id = attachment_id
+        self.filename = filename
+        self.size = size
+        self.url = f"https://cdn.discordapp.com/attachments/1/{attachment_id}/{filename}"
+
+
+class FakeHistoryMessage:
+    """A message yielded by FakeChannel.history()"""
+    type = discord.MessageType.default
+    edited_at = None
+    reference = None
+    pinned = False
+
+    def __init__(self, message_id, author, content, created_at, embeds=(), attachments=()):
+        self.id = message_id
+        self.author = author
+        self.content = content
+        self.created_at = created_at
+        self.embeds = list(embeds)
+        self.attachments = list(attachments)
+
+
+class FakeCategory:
+    def __init__(self, guild, category_id):
+        self.guild = guild
+        self.id = category_id
+
+    @property
+    def text_channels(self):
+        return [
+            channel for channel in self.guild._channels.values()
+            if isinstance(channel, FakeChannel) and channel.category_id == self.id
+        ]
+
+
+class FakeChannel:
+    HISTORY_PAGE = 100  # Messages per history request, as Discord returns them
+    last_message_id = None
+
+    def __init__(self, guild, channel_id, name, category_id=None, overwrites=None, history_size=0):
+        self.guild = guild
+        self.id = channel_id
+        self.name = name
+        self.category_id = category_id
+        self.mention = f"<#{channel_id}>"
+        self.overwrites = overwrites or {}
+        self.history_size = history_size
+        self.sent = 0
+
+    async def send(self, content=None, **kwargs):
+        await self.guild.api.call("channel.send")
+        self.sent += 1
+
+    async def delete(self, reason=None):
+        await self.guild.api.call("channel.delete")
+        if self.guild._channels.pop(self.id, None) is None:
+            raise discord.NotFound(_FakeHTTPResponse(404), "Unknown Channel")
+
+    async def history(self, limit=100, oldest_first=False):
+        """Synthetic ticket conversation, built one page at a time"""
+        count = self.history_size if limit is None else min(limit, self.history_size)
+        opener = FakeMember(self.guild, 1, "Soul (@player_1)")
+        staff = FakeMember(self.guild, 2, "Attuned Staff")
+        helper = FakeMember(self.guild, 3, "SENSE")
+        helper.bot = True
+        started = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        order = range(count) if oldest_first else range(count - 1, -1, -1)
+        for position, index in enumerate(order):
+            if position % self.HISTORY_PAGE == 0:
+                await self.guild.api.call("channel.history")
+            created_at = started + datetime.timedelta(seconds=index * 7)
+            if index % 10 == 0:
+                embed = discord.Embed(title="🌸 SENSE Support Center", description=f"Menu opened ({index})")
+                yield FakeHistoryMessage(index + 1, helper, "", created_at, embeds=[embed])
+            elif index % 25 == 0:
+                attachment = FakeAttachment(index + 1, f"screenshot_{index}.png", 150_000 + index)
+                yield FakeHistoryMessage(index + 1, opener, "here's my screenshot", created_at, attachments=[attachment])
+            else:
+                author = opener if index % 3 else staff
+                content = f"Message {index}: " + "my roblox name should be verified but the role is missing " * (1 + index % 4)
+                yield FakeHistoryMessage(index + 1, author, content, created_at)
+
+
+class FakeResponse:
+    def __init__(self, api):
+        self.api = api
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def _respond(self, name):
+        if self._done:
+            raise discord.InteractionResponded(None)
+        self._done = True
+        await self.api.call(name)
+
+    async def defer(self, ephemeral=False, thinking=False):
+        await self._respond("response.defer")
+
+    async def edit_message(self, **kwargs):
+        await self._respond("response.edit_message")
+
+    async def send_message(self, content=None, **kwargs):
+        await self._respond("response.send_message")
+
+
+class FakeMessage:
+    def __init__(self, api):
+        self.api = api
+
+    async def edit(self, **kwargs):
+        await self.api.call("message.edit")
+
+
+class FakeFollowup:
+    def __init__(self, api):
+        self.api = api
+
+    async def send(self, content=None, wait=False, **kwargs):
+        await self.api.call("followup.send")
+        return FakeMessage(self.api) if wait else None
+
+
+class FakeInteraction:
+    """Component or slash command interaction from `user` in `channel`"""
+
+    def __init__(self, api, user, channel, custom_id=None):
+        self.id = next(_ids)
+        self.user = user
+        self.guild = user.guild
+        self.channel = channel
+        self.channel_id = channel.id
+        self.message = None
+        self.data = {"custom_id": custom_id, "component_type": 2}
+        self.response = FakeResponse(api)
+        self.followup = FakeFollowup(api)
+
+
+class ClickRouter:
+    """Delivers button clicks through a real discord.py view store
+
+    Clicks take the same path as gateway interactions (custom_id lookup,
+    interaction checks, then the callback), so a view that discord.py
+    would silently drop fails here instead of looking healthy.
+    """
+
+    def __init__(self, views):
+        self.client = discord.Client(intents=discord.Intents.none())
+        self.store = self.client._connection._view_store
+        for view in views:
+            self.client.add_view(view)
+        # dispatch_view hands the view's task to add_task synchronously
+        self._dispatched = []
+        self.store.add_task = self._dispatched.append
+
+    async def click(self, custom_id, interaction):
+        """Dispatch a click, wait for its callback and check it was answered"""
+        self.store.dispatch_view(2, custom_id, interaction)
+        if not self._dispatched:
+            raise AssertionError(f"click on {custom_id!r} was dropped by the view store")
+        await self._dispatched.pop()
+        if not interaction.response.is_done():
+            raise AssertionError(f"click on {custom_id!r} got no response")
@@ -0,0 +1,99 @@
+"""Micro-benchmark: per-guild settings lookups across many partner guilds
+
+Writes a config file for N guilds, loads it through GuildConfigRegistry,
+then times what every event and button callback now does:
+GuildConfigRegistry.get (first resolve and steady state) and a ticket
+channel check. For comparison, it also times re-reading and parsing the
+file per event, which is what a naive hot-reloadable config would cost.
+
+Run from the repository root:
+
+    python -m benchmarks.guild_config [guilds]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+import bot
+from benchmarks.fakes import FakeCategory, FakeChannel, FakeDiscordAPI, FakeGuild, FakeRole
+
+GUILDS = 500
+EVENTS = 200_000
+
+
+def _config(guild_count):
+    return {
+        "defaults": None,
+        "guilds": {
+            str(guild_id): {
+                "roblox_group_id": 1_000 + guild_id % 50,
+                "required_role_name": "Member",
+                "verified_role_id": guild_id * 10 + 1,
+                "staff_role_id": guild_id * 10 + 2,
+                "ticket_category_id": guild_id * 10 + 3,
+            }
+            for guild_id in range(1, guild_count + 1)
+        },
+    }
+
+
+def _timed(label, count, func):
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34}{count:>9}{elapsed:>9.3f}s{elapsed / count * 1e9:>12.0f} ns/event")
+
+
+async def main():
+    guild_count = int(sys.argv[1]) if len(sys.argv) > 1 else GUILDS
+    api = FakeDiscordAPI()
+    guilds = []
+    channels = []
+    for guild_id in range(1, guild_count + 1):
+        guild = FakeGuild(api, guild_id, [FakeRole(guild_id * 10 + 1, "verified"), FakeRole(guild_id * 10 + 2, "staff")])
+        guild.add_channel(FakeCategory(guild, guild_id * 10 + 3))
+        channels.append(guild.add_channel(FakeChannel(guild, guild_id * 10 + 4, "ticket-0001", guild_id * 10 + 3)))
+        guilds.append(guild)
+
+    with tempfile.TemporaryDirectory(prefix="sense-config-") as scratch:
+        path = os.path.join(scratch, "guilds.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(_config(guild_count), f)
+
+        bot.group_rosters = bot.GroupRosterRegistry(scratch)
+        registry = bot.GuildConfigRegistry(path)
+        started = time.perf_counter()
+        await registry.load()
+        print(f"loaded {guild_count} guilds, {len(list(bot.group_rosters))} rosters in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        events = [guilds[index % guild_count] for index in range(EVENTS)]
+        ticket_events = [channels[index % guild_count] for index in range(EVENTS)]
+
+        _timed("get (first resolve)", guild_count, lambda: [registry.get(guild) for guild in guilds])
+        _timed("get (resolved)", EVENTS, lambda: [registry.get(guild) for guild in events])
+        _timed(
+            "ticket channel check",
+            EVENTS,
+            lambda: [registry.get(channel.guild).is_ticket_channel(channel) for channel in ticket_events],
+        )
+        _timed(
+            "get + staff role mention",
+            EVENTS,
+            lambda: [registry.get(guild).staff_mention for guild in events],
+        )
+
+        def parse_per_event():
+            for guild in events[:2_000]:
+                with open(path, encoding="utf-8") as f:
+                    entry = json.load(f)["guilds"][str(guild.id)]
+                guild.get_role(entry["verified_role_id"])
+
+        _timed("re-read + parse per event", 2_000, parse_per_event)
+        print(f"registry stats: {registry.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
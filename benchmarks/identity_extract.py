@@ -0,0 +1,95 @@
+"""Micro-benchmark: Bloxlink username extraction and identity index lookups
+
+Compares, over synthetic display names:
+  * the original per-call parser (string patterns looked up in re's cache,
+    full split) - also used to check the new parsers give identical results
+  * extract_roblox_username (precompiled patterns, '@' fast path)
+  * extract_roblox_usernames (batch path)
+  * MemberIdentityIndex.lookup for members whose names are already indexed
+
+Run from the repository root:
+
+    python -m benchmarks.identity_extract [names]
+"""
+import random
+import re
+import sys
+import time
+
+from bot import MemberIdentityIndex, extract_roblox_username, extract_roblox_usernames
+
+NAMES = 1_000_000
+LOOKUPS = 1_000_000
+
+# Shapes seen in real servers: Bloxlink nicknames, plain names, decorations
+TEMPLATES = [
+    "{nick} (@{user})",
+    "@{user}",
+    "{nick} | @{user}",
+    "{user}",
+    "{nick}.{user} ✨",
+    "🌸 {nick} 🌸",
+    "✨✨",
+    "[{nick}] {user}",
+]
+
+
+def original_extract(display_name):
+    """extract_roblox_username as it was before the identity index"""
+    match = re.search(r'@(\w+)', display_name)
+    if match:
+        return match.group(1)
+    words = re.sub(r'[^\w\s]', '', display_name).split()
+    return words[0] if words else None
+
+
+def synthetic_names(count, seed=1234):
+    rng = random.Random(seed)
+    names = []
+    for index in range(count):
+        template = TEMPLATES[rng.randrange(len(TEMPLATES))]
+        names.append(template.format(nick=f"Soul{rng.randrange(10_000)}", user=f"player_{index}"))
+    return names
+
+
+class _Guild:
+    id = 1
+
+
+class _Member:
+    __slots__ = ("guild", "id", "display_name")
+
+    def __init__(self, member_id, display_name):
+        self.guild = _Guild
+        self.id = member_id
+        self.display_name = display_name
+
+
+def _timed(label, count, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34}{elapsed:>9.3f}s{elapsed / count * 1e9:>12.0f} ns/name")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else NAMES
+    names = synthetic_names(count)
+    print(f"{count} synthetic display names")
+
+    expected = _timed("original (per call)", count, lambda: [original_extract(name) for name in names])
+    single = _timed("extract_roblox_username", count, lambda: [extract_roblox_username(name) for name in names])
+    batch = _timed("extract_roblox_usernames (batch)", count, lambda: extract_roblox_usernames(names))
+    assert single == expected and batch == expected, "parsers disagree with the original"
+
+    members = [_Member(index, name) for index, name in enumerate(names)]
+    index = MemberIdentityIndex()
+    _timed("index.update_many (cold)", count, lambda: index.update_many(members))
+    lookups = min(LOOKUPS, count)
+    _timed("index.lookup (indexed)", lookups, lambda: [index.lookup(member) for member in members[:lookups]])
+    print(f"index stats: {index.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Startup time / RSS comparison: default vs. lean gateway mode
+
+Each mode runs in its own subprocess so RSS numbers are independent. A
+synthetic large guild is fed through discord.py's real gateway parsers:
+GUILD_CREATE (with the online members a large guild sends), then, in
+default mode only, the GUILD_MEMBERS_CHUNK events that startup chunking
+would request for every member.
+
+Run from the repository root:
+
+    python -m benchmarks.lean_startup [members]
+"""
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import discord
+from discord.state import ChunkRequest
+
+MEMBERS = 100_000
+ONLINE_MEMBERS = 250  # Members included in GUILD_CREATE for a large guild
+CHUNK_SIZE = 1000  # Members per GUILD_MEMBERS_CHUNK event (gateway maximum)
+GUILD_ID = 1_000_000
+ROLE_COUNT = 50
+
+
+def _member(user_id):
+    return {
+        "user": {"id": str(user_id), "username": f"member{user_id}", "discriminator": "0", "avatar": None, "global_name": None},
+        "nick": f"@roblox{user_id} | member",
+        "roles": [str(GUILD_ID + 1 + user_id % ROLE_COUNT)],
+        "joined_at": "2025-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def _guild_create(members):
+    return {
+        "id": str(GUILD_ID),
+        "name": "Synthetic Guild",
+        "owner_id": "1",
+        "large": True,
+        "member_count": members,
+        "unavailable": False,
+        "roles": [
+            {"id": str(GUILD_ID + 1 + index), "name": f"role{index}", "color": 0, "hoist": False,
+             "position": index, "permissions": "0", "managed": False, "mentionable": False, "flags": 0}
+            for index in range(ROLE_COUNT)
+        ],
+        "channels": [],
+        "members": [_member(10 + index) for index in range(ONLINE_MEMBERS)],
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "presences": [],
+        "voice_states": [],
+        "threads": [],
+    }
+
+
+async def _measure(lean, members):
+    import bot
+
+    intents, member_cache_flags, chunk_guilds = bot.build_gateway_options(lean)
+    client = discord.Client(intents=intents, member_cache_flags=member_cache_flags, chunk_guilds_at_startup=chunk_guilds)
+    state = client._connection
+    payload = _guild_create(members)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+
+    guild = state._add_guild_from_data(payload)
+    if state._guild_needs_chunking(guild):
+        request = ChunkRequest(
+            guild.id, guild.shard_id, asyncio.get_running_loop(), state._get_guild,
+            cache=member_cache_flags.joined
+        )
+        state._chunk_requests[request.nonce] = request
+        chunk_count = (members + CHUNK_SIZE - 1) // CHUNK_SIZE
+        for chunk_index in range(chunk_count):
+            first = 10 + chunk_index * CHUNK_SIZE
+            last = min(10 + members, first + CHUNK_SIZE)
+            state.parse_guild_members_chunk({
+                "guild_id": str(GUILD_ID),
+                "members": [_member(user_id) for user_id in range(first, last)],
+                "chunk_index": chunk_index,
+                "chunk_count": chunk_count,
+                "nonce": request.nonce,
+            })
+
+    elapsed = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "mode": "lean" if lean else "default",
+        "intents": intents.value,
+        "cached_members": len(guild.members),
+        "startup_seconds": round(elapsed, 3),
+        "rss_growth_mib": round((rss_after - rss_before) / 1024, 1),
+    }
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--worker":
+        lean = sys.argv[2] == "lean"
+        members = int(sys.argv[3])
+        print(json.dumps(asyncio.run(_measure(lean, members))))
+        return
+
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else MEMBERS
+    print(f"Synthetic guild with {members} members")
+    print(f"{'mode':<10}{'intents':>10}{'cached members':>16}{'startup (s)':>13}{'RSS growth (MiB)':>18}")
+    for mode in ("default", "lean"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.lean_startup", "--worker", mode, str(members)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{result['mode']:<10}{result['intents']:>10}{result['cached_members']:>16}"
+            f"{result['startup_seconds']:>13}{result['rss_growth_mib']:>18}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Load benchmark: verification, menu navigation and ticket greeting
+
+Drives the real view callbacks and ticket greeter with fake Discord
+objects (see `benchmarks.fakes`) while the Roblox APIs are served by a
+local aiohttp stand-in (see `benchmarks.fake_roblox`). Each scenario runs
+at increasing concurrency levels and reports throughput and p50/p95/p99
+latency; `--output` writes the same numbers as JSON for regression
+tracking.
+
+Concurrency means simultaneous members clicking (verification, menus) or
+the size of each burst of new tickets (greeting).
+
+Run from the repository root:
+
+    python -m benchmarks.suite --levels 1,8,32 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import discord
+
+import bot
+from benchmarks.fake_roblox import FakeRoblox, FakeRobloxConfig
+from benchmarks.fakes import ClickRouter, FakeDiscordAPI, FakeChannel, FakeGuild, FakeInteraction, FakeMember, FakeRole
+
+SCENARIOS = ("verification", "menu", "greeting")
+
+# (view, button) pairs cycled through as a member browses the menus
+MENU_ROUTE = [
+    ("main_menu_view", "question_button"),
+    ("question_view", "q1_button"),
+    ("back_to_question_view", "back"),
+    ("question_view", "back"),
+    ("main_menu_view", "request_role_button"),
+    ("role_request_view", "back"),
+    ("main_menu_view", "register_button"),
+    ("back_to_main_view", "back"),
+]
+
+
+def _percentiles(samples):
+    if not samples:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "mean_ms": None}
+    return {
+        "p50_ms": round(bot._percentile(samples, 0.50) * 1000, 3),
+        "p95_ms": round(bot._percentile(samples, 0.95) * 1000, 3),
+        "p99_ms": round(bot._percentile(samples, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+    }
+
+
+def _reset_bot_state(args):
+    """Fresh caches, indexes, stores and HTTP client so levels don't share state"""
+    if args.roblox_rate:
+        bot.ROBLOX_RATE_LIMITS = {endpoint: (args.roblox_rate, int(args.roblox_rate)) for endpoint in bot.ROBLOX_RATE_LIMITS}
+    bot.roblox_http = bot.RobloxHTTPClient()
+    bot.username_batcher = bot.UsernameBatcher(bot.ROBLOX_USERNAME_BATCH_WINDOW, bot.ROBLOX_USERNAME_BATCH_SIZE)
+    bot.verification_queue = bot.VerificationQueue(args.verify_workers, args.verify_queue)
+    bot.roblox_check_flight = bot.SingleFlight()
+    bot.roblox_user_cache.clear()
+    bot.group_membership_cache.clear()
+    for cache in (bot.roblox_user_cache, bot.group_membership_cache):
+        cache.hits = cache.misses = cache.evictions = cache.expirations = 0
+    bot.member_identities = bot.MemberIdentityIndex()
+    bot.verification_retries = bot.VerificationRetryQueue()
+    # Never touch the real snapshots / database / guild config in DATA_DIR
+    bot.group_rosters = bot.GroupRosterRegistry(args.scratch_dir)
+    bot.guild_configs = bot.GuildConfigRegistry(os.path.join(args.scratch_dir, "guilds.json"))
+    database_path = os.path.join(args.scratch_dir, "sense.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(database_path + suffix):
+            os.remove(database_path + suffix)
+    bot.verification_store = bot.VerificationStore(database_path)
+
+
+def _make_guild(api):
+    roles = [
+        FakeRole(bot.DISCORD_VERIFIED_ROLE_ID, "Attuned Soul (verified)"),
+        FakeRole(bot.ATTUNED_SOUL_ROLE_ID, "Attuned Soul"),
+    ]
+    return FakeGuild(api, 1, roles)
+
+
+async def _closed_loop(concurrency, ops, operation):
+    """Run `ops` calls of `operation(index)` from `concurrency` workers; returns latencies"""
+    latencies = []
+    errors = 0
+    counter = iter(range(ops))
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                await operation(index)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run_verification(args, concurrency, fake_roblox):
+    api = FakeDiscordAPI(args.discord_latency)
+    guild = _make_guild(api)
+    channel = FakeChannel(guild, 500, "ticket-bench", bot.TICKET_CATEGORY_ID)
+    members = [
+        FakeMember(guild, 1_000 + index, f"@{fake_roblox.config.username_prefix}{index} | member")
+        for index in range(args.members)
+    ]
+    router = ClickRouter(bot.build_persistent_views())
+    custom_id = bot.role_request_view.verify_roblox_button.custom_id
+
+    if args.roster:
+        await bot.group_rosters.get(bot.ROBLOX_GROUP_ID, bot.REQUIRED_ROLE_NAME).sync(full=True)
+    await bot.verification_store.open()
+    bot.verification_queue.start()
+    fake_roblox.reset_counters()
+
+    async def operation(index):
+        member = members[index % len(members)]
+        await router.click(custom_id, FakeInteraction(api, member, channel, custom_id))
+
+    try:
+        latencies, errors, elapsed = await _closed_loop(concurrency, args.ops, operation)
+    finally:
+        await bot.verification_queue.stop()
+        await bot.verification_store.close()
+    verified_role = guild.get_role(bot.DISCORD_VERIFIED_ROLE_ID)
+    return latencies, errors, elapsed, {
+        "verified_members": sum(verified_role in member.roles for member in members),
+        "roblox_requests": fake_roblox.config.counters.get("requests", 0),
+        "roblox_429": fake_roblox.config.counters.get("429", 0),
+        "roblox_5xx": fake_roblox.config.counters.get("5xx", 0),
+        "unavailable_answers": len(bot.verification_retries),
+        "user_cache_hit_ratio": round(bot.roblox_user_cache.stats()["hit_ratio"], 3),
+        "group_cache_hit_ratio": round(bot.group_membership_cache.stats()["hit_ratio"], 3),
+        "username_batches": bot.username_batcher.stats()["batches_sent"],
+        "verification_store": bot.verification_store.stats(),
+        "verification_queue": bot.verification_queue.stats(),
+        "limiter": bot.roblox_http.limiter_stats(),
+        "pool": bot.roblox_http.pool_stats(),
+    }
+
+
+async def run_menu(args, concurrency, fake_roblox):
+    api = FakeDiscordAPI(args.discord_latency)
+    guild = _make_guild(api)
+    channel = FakeChannel(guild, 500, "ticket-bench", bot.TICKET_CATEGORY_ID)
+    members = [FakeMember(guild, 1_000 + index, f"@bench{index}") for index in range(concurrency)]
+    router = ClickRouter(bot.build_persistent_views())
+
+    async def operation(index):
+        view_name, button_name = MENU_ROUTE[index % len(MENU_ROUTE)]
+        custom_id = getattr(getattr(bot, view_name), button_name).custom_id
+        await router.click(custom_id, FakeInteraction(api, members[index % len(members)], channel, custom_id))
+
+    latencies, errors, elapsed = await _closed_loop(concurrency, args.ops, operation)
+    return latencies, errors, elapsed, {"discord_calls": dict(api.calls)}
+
+
+async def run_greeting(args, concurrency, fake_roblox):
+    api = FakeDiscordAPI(args.discord_latency)
+    guild = _make_guild(api)
+    opener = FakeMember(guild, 999, "opener")
+    greeter = bot.TicketGreeter()
+    greeter._limiter = bot.TokenBucket(args.greeting_rate, max(1, int(args.greeting_rate)))
+    greeter.start()
+
+    latencies = []
+    started = time.perf_counter()
+    try:
+        created = 0
+        while created < args.ops:
+            burst = []
+            for _ in range(min(concurrency, args.ops - created)):
+                channel_id = 100_000 + created
+                # A member overwrite marks the ticket as ready straight away
+                channel = FakeChannel(guild, channel_id, f"ticket-{channel_id}", bot.TICKET_CATEGORY_ID, {opener: None})
+                channel.created_at = time.perf_counter()
+                greeter.channel_created(channel)
+                burst.append(channel)
+                created += 1
+            await greeter.queue.join()
+            done = time.perf_counter()
+            latencies.extend(done - channel.created_at for channel in burst if channel.sent)
+    finally:
+        await greeter.stop()
+    elapsed = time.perf_counter() - started
+
+    stats = greeter.stats()
+    return latencies, stats["failed"] + stats["dropped"], elapsed, {
+        "greeting_rate": args.greeting_rate,
+        "greeted": stats["greeted"],
+    }
+
+
+RUNNERS = {
+    "verification": run_verification,
+    "menu": run_menu,
+    "greeting": run_greeting,
+}
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of %(default)s")
+    parser.add_argument("--levels", default="1,8,32,128", help="Comma-separated concurrency levels")
+    parser.add_argument("--ops", type=int, default=200, help="Operations per scenario and level")
+    parser.add_argument("--members", type=int, default=200, help="Distinct members clicking verify (fewer = more cache hits)")
+    parser.add_argument("--verify-workers", type=int, default=bot.VERIFICATION_WORKERS, help="Verification worker pool size")
+    parser.add_argument("--verify-queue", type=int, default=bot.VERIFICATION_QUEUE_SIZE, help="Verification queue capacity")
+    parser.add_argument("--roster", action="store_true", help="Sync the roster index first so verification skips the groups API")
+    parser.add_argument("--roblox-latency", type=float, default=0.05, help="Seconds added to every Roblox response")
+    parser.add_argument("--roblox-jitter", type=float, default=0.0, help="Extra random Roblox latency, in seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of Roblox requests answered with 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Fraction of Roblox requests answered with 503")
+    parser.add_argument("--groups-per-user", type=int, default=5, help="Groups listed in each groups/roles payload")
+    parser.add_argument("--roblox-rate", type=float, default=None,
+                        help="Override the client's per-endpoint request rate (default: production limits)")
+    parser.add_argument("--discord-latency", type=float, default=0.02, help="Seconds each fake Discord API call takes")
+    parser.add_argument("--greeting-rate", type=float, default=1000.0,
+                        help=f"Greetings per second (production: {bot.GREETING_RATE})")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = _parse_args(argv)
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+    levels = [int(level) for level in args.levels.split(",")]
+    scratch = tempfile.TemporaryDirectory(prefix="sense-bench-")
+    args.scratch_dir = scratch.name
+
+    fake_roblox = FakeRoblox(FakeRobloxConfig(
+        latency=args.roblox_latency,
+        jitter=args.roblox_jitter,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        groups_per_user=args.groups_per_user,
+        group_id=bot.ROBLOX_GROUP_ID,
+        role_name=bot.REQUIRED_ROLE_NAME,
+        roster_size=max(args.members, 1),
+    ))
+    base_url = await fake_roblox.start()
+    bot.ROBLOX_USERS_API = bot.ROBLOX_GROUPS_API = base_url
+    bot.embed_templates.build_all()
+
+    results = []
+    print(f"{'scenario':<14}{'conc':>6}{'ops':>7}{'errors':>8}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    try:
+        for scenario in scenarios:
+            for concurrency in levels:
+                _reset_bot_state(args)
+                try:
+                    latencies, errors, elapsed, extra = await RUNNERS[scenario](args, concurrency, fake_roblox)
+                finally:
+                    await bot.roblox_http.close()
+
+                result = {
+                    "scenario": scenario,
+                    "concurrency": concurrency,
+                    "ops": args.ops,
+                    "errors": errors,
+                    "elapsed_s": round(elapsed, 4),
+                    "throughput_ops_s": round(len(latencies) / elapsed, 2) if elapsed else None,
+                    **_percentiles(latencies),
+                    "details": extra,
+                }
+                results.append(result)
+                print(
+                    f"{scenario:<14}{concurrency:>6}{args.ops:>7}{errors:>8}{result['throughput_ops_s']:>10}"
+                    f"{result['p50_ms']!s:>10}{result['p95_ms']!s:>10}{result['p99_ms']!s:>10}"
+                )
+    finally:
+        await fake_roblox.close()
+        scratch.cleanup()
+
+    if args.output:
+        report = {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "discord_py": discord.__version__,
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "scratch_dir")},
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
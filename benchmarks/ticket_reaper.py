@@ -0,0 +1,125 @@
+"""Load check: closing and reaping a backlog of stale tickets
+
+Fills several fake guilds with inactive ticket channels and runs
+TicketLifecycle sweeps until every ticket is closed, archived and
+deleted. Right after the first sweep has closed tickets (which then wait
+out the delete delay), the store is closed and a fresh lifecycle is
+loaded from the database, the way a restart would; the run fails unless
+the restarted lifecycle resumes those tickets. Reports each sweep's
+counts and duration, and the deletion rate each guild actually got
+against TICKET_REAP_RATE.
+
+Run from the repository root:
+
+    python -m benchmarks.ticket_reaper --guilds 20 --tickets 120 --rate 20
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import tempfile
+import time
+
+import discord
+
+import bot
+from benchmarks.fakes import FakeCategory, FakeChannel, FakeDiscordAPI, FakeGuild
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--tickets", type=int, default=120, help="Stale tickets per guild")
+    parser.add_argument("--history", type=int, default=50, help="Messages per ticket (archived before deletion)")
+    parser.add_argument("--rate", type=float, default=20.0, help="Deletions per second per guild")
+    parser.add_argument("--burst", type=int, default=bot.TICKET_REAP_BURST)
+    parser.add_argument("--delete-delay", type=float, default=1.0, help="Seconds closed tickets wait before deletion")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between sweeps")
+    parser.add_argument("--discord-latency", type=float, default=0.01)
+    return parser.parse_args()
+
+
+def build_guilds(api, guild_count, ticket_count, history):
+    # Channel ids are snowflakes from four days ago, so every ticket is inactive
+    stale = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=4)
+    first_id = discord.utils.time_snowflake(stale)
+    guilds = []
+    for guild_index in range(guild_count):
+        guild = FakeGuild(api, 1_000 + guild_index, [])
+        guild.add_channel(FakeCategory(guild, bot.TICKET_CATEGORY_ID))
+        for ticket in range(ticket_count):
+            channel_id = first_id + guild_index * 100_000 + ticket
+            guild.add_channel(FakeChannel(
+                guild, channel_id, f"ticket-{ticket:04d}", bot.TICKET_CATEGORY_ID, history_size=history
+            ))
+        guilds.append(guild)
+    return guilds
+
+
+async def sweep_until_done(lifecycle, guilds, label, interval, stop_after=None):
+    sweeps = 0
+    while True:
+        if sweeps:
+            await asyncio.sleep(interval)
+        report = await lifecycle.sweep(guilds)
+        sweeps += 1
+        print(
+            f"{label:<8}{sweeps:>6}{report.open:>7}{report.closed_inactive:>8}{report.reaped:>8}"
+            f"{report.already_deleted:>8}{report.failed:>8}{report.waiting:>9}{report.seconds:>10.2f}s"
+        )
+        if not lifecycle.closed and not report.open:
+            return True
+        if stop_after is not None and sweeps >= stop_after:
+            return False
+
+
+async def main():
+    args = parse_args()
+    bot.TICKET_DELETE_DELAY = args.delete_delay
+    bot.TICKET_REAP_RATE = args.rate
+    bot.TICKET_REAP_BURST = args.burst
+    api = FakeDiscordAPI(args.discord_latency)
+    guilds = build_guilds(api, args.guilds, args.tickets, args.history)
+    total = args.guilds * args.tickets
+
+    with tempfile.TemporaryDirectory(prefix="sense-tickets-") as scratch:
+        bot.transcript_archiver = bot.TranscriptArchiver(os.path.join(scratch, "transcripts"))
+        database = os.path.join(scratch, "sense.db")
+
+        print(f"{total} stale tickets across {args.guilds} guilds, {args.rate}/s deletions per guild")
+        print(f"{'phase':<8}{'sweep':>6}{'open':>7}{'closed':>8}{'reaped':>8}{'gone':>8}{'failed':>8}{'waiting':>9}{'time':>11}")
+
+        started = time.perf_counter()
+        store = bot.TicketStore(database)
+        await store.open()
+        lifecycle = bot.TicketLifecycle(store)
+        await lifecycle.load()
+        # Stop after the first sweep: its closed tickets are still waiting out the delay
+        await sweep_until_done(lifecycle, guilds, "before", args.interval, stop_after=1)
+        stats_before = lifecycle.stats()
+        await store.close()
+
+        # Restart: only the database carries the closed tickets over
+        store = bot.TicketStore(database)
+        await store.open()
+        lifecycle = bot.TicketLifecycle(store)
+        await lifecycle.load()
+        resumed = len(lifecycle.closed)
+        assert resumed, "no closed tickets were waiting at the restart; nothing was resumed"
+        await sweep_until_done(lifecycle, guilds, "after", args.interval)
+        elapsed = time.perf_counter() - started
+        await store.close()
+        # Nothing can be deleted before the first closed tickets are due
+        reaping = elapsed - args.delete_delay
+
+        reaped = stats_before["reaped"] + lifecycle.stats()["reaped"]
+        remaining = sum(len(guild._channels) - 1 for guild in guilds)  # Less the category
+        print(f"\nresumed {resumed} closed tickets after the restart")
+        print(f"reaped {reaped}/{total} in {elapsed:.1f}s ({args.delete_delay:g}s delete delay), {remaining} channels left")
+        print(f"deletion rate {reaped / reaping:.1f}/s overall, {reaped / reaping / args.guilds:.2f}/s per guild (limit {args.rate}/s)")
+        print(f"transcripts: {bot.transcript_archiver.stats()['archived']} archived")
+        print(f"discord calls: {api.calls}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Throughput and memory check: ticket transcript archiving
+
+Archives synthetic ticket histories through TranscriptArchiver.write (the
+streaming, chunked path) and, for comparison, by collecting the whole
+history first and compressing it in one go. Each run is timed without
+tracing, then repeated under tracemalloc to find its peak memory, for a
+short and a long ticket, so it shows whether memory grows with length.
+
+Run from the repository root:
+
+    python -m benchmarks.transcript [messages] [page latency seconds]
+"""
+import asyncio
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import bot
+from benchmarks.fakes import FakeChannel, FakeDiscordAPI, FakeGuild
+
+MESSAGES = 50_000
+
+
+async def _collect_then_compress(channel, path):
+    """The naive approach: whole history in memory, one compress call"""
+    records = [bot.transcript_record(message) async for message in channel.history(limit=None, oldest_first=True)]
+    data = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records)
+    with open(path, "wb") as file:
+        file.write(gzip.compress(data.encode("utf-8"), compresslevel=bot.TRANSCRIPT_COMPRESS_LEVEL))
+    return len(records)
+
+
+async def _streamed(channel, archiver):
+    result = await archiver.write(channel, "benchmark")
+    return result.messages
+
+
+async def _measure(run):
+    started = time.perf_counter()
+    count = await run()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    await run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def _report(label, count, elapsed, peak):
+    print(f"{label:<32}{count:>9}{elapsed:>9.2f}s{count / elapsed:>12,.0f}/s{peak / 2**20:>11.1f} MiB")
+
+
+def _check(path, count):
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline())
+        ids = [json.loads(line)["id"] for line in file]
+    assert header["kind"] == "channel"
+    assert ids == list(range(1, count + 1)), "transcript is missing or reordering messages"
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else MESSAGES
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    api = FakeDiscordAPI(latency)
+    guild = FakeGuild(api, 1, [])
+
+    with tempfile.TemporaryDirectory(prefix="sense-transcripts-") as scratch:
+        archiver = bot.TranscriptArchiver(scratch)
+        print(f"{'ticket / method':<32}{'messages':>9}{'time':>10}{'throughput':>13}{'peak mem':>15}")
+        for size in sorted({max(1, count // 10), count}):
+            channel = FakeChannel(guild, 900 + size, f"ticket-{size}", history_size=size)
+
+            naive_path = os.path.join(scratch, f"naive-{size}.jsonl.gz")
+            measured = await _measure(lambda: _collect_then_compress(channel, naive_path))
+            _report(f"{size:,} msgs, collect+compress", *measured)
+
+            measured = await _measure(lambda: _streamed(channel, archiver))
+            _report(f"{size:,} msgs, streamed", *measured)
+
+            path = max(
+                (os.path.join(root, name) for root, _, names in os.walk(scratch) for name in names if name.startswith(channel.name)),
+                key=os.path.getmtime,
+            )
+            _check(path, size)
+
+        stats = archiver.stats()
+        print(
+            f"\nstreamed archives: {stats['raw_bytes'] / max(stats['bytes_written'], 1):.1f}x compression, "
+            f"{api.calls.get('channel.history', 0)} history pages requested"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""Throughput check: verification store writes and lookups
+
+Writes N records through VerificationStore (batched, one transaction per
+flush) and, for comparison, the same rows with one commit each - what a
+naive store would do per verification. Then measures indexed lookups one
+at a time and with many in flight, as concurrent button clicks would
+issue them.
+
+Run from the repository root:
+
+    python -m benchmarks.verification_store [records]
+"""
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import bot
+
+RECORDS = 100_000
+LOOKUPS = 20_000
+CONCURRENT_LOOKUPS = 100
+GROUP_ID = 1
+ROLE = "Member"
+
+
+def _user(index):
+    return {"id": 10_000_000 + index, "name": f"player_{index}", "displayName": f"Player {index}"}
+
+
+def _per_row_commits(path, count):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for script in bot.DATABASE_MIGRATIONS:
+        conn.executescript(script)
+    now = time.time()
+    started = time.perf_counter()
+    for index in range(count):
+        user = _user(index)
+        conn.execute("BEGIN")
+        conn.execute(
+            bot.VerificationStore.UPSERT,
+            (index, GROUP_ID, ROLE, user["id"], user["name"], user["displayName"], ROLE, now, now),
+        )
+        conn.execute("COMMIT")
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return elapsed
+
+
+def _report(label, count, elapsed):
+    print(f"{label:<36}{count:>9}{elapsed:>10.3f}s{count / elapsed:>14,.0f}/s")
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RECORDS
+    with tempfile.TemporaryDirectory(prefix="sense-store-") as scratch:
+        print(f"{'operation':<36}{'count':>9}{'time':>11}{'throughput':>15}")
+
+        baseline_count = min(count, 10_000)
+        elapsed = await asyncio.to_thread(_per_row_commits, os.path.join(scratch, "baseline.db"), baseline_count)
+        _report("write, one commit per row", baseline_count, elapsed)
+
+        store = bot.VerificationStore(os.path.join(scratch, "sense.db"))
+        await store.open()
+
+        started = time.perf_counter()
+        for index in range(count):
+            store.record(index, GROUP_ID, ROLE, _user(index), True, ROLE)
+            if index % bot.VERIFICATION_WRITE_BATCH == 0:
+                await asyncio.sleep(0)  # Let scheduled flushes run, as a live bot would
+        await store.flush()
+        _report("write, batched (record + flush)", count, time.perf_counter() - started)
+        print(f"  {store.flushes} flushes, last {store.stats()['last_flush_ms']} ms")
+
+        keys = [random.randrange(count) for _ in range(LOOKUPS)]
+        started = time.perf_counter()
+        for discord_id in keys:
+            assert await store.get(discord_id, GROUP_ID, ROLE) is not None
+        _report("lookup, sequential", LOOKUPS, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for offset in range(0, LOOKUPS, CONCURRENT_LOOKUPS):
+            chunk = keys[offset:offset + CONCURRENT_LOOKUPS]
+            await asyncio.gather(*(store.get(discord_id, GROUP_ID, ROLE) for discord_id in chunk))
+        _report(f"lookup, {CONCURRENT_LOOKUPS} in flight", LOOKUPS, time.perf_counter() - started)
+
+        await store.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
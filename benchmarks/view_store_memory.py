@@ -0,0 +1,147 @@
+"""Memory check: discord.py view store size across simulated menu navigations
+
+Dispatches real `discord.Interaction` objects through discord.py's view
+store (as gateway clicks would be) with the HTTP layer stubbed out, checks
+every click was answered, and reports how many entries the view store
+holds afterwards. Compares the shared persistent views against the
+old behaviour of creating a fresh view for every click.
+
+Run from the repository root:
+
+    python -m benchmarks.view_store_memory [navigations]
+"""
+import asyncio
+import gc
+import sys
+import tracemalloc
+
+import discord
+from discord.ui import View
+from discord.webhook.async_ import AsyncWebhookAdapter
+
+import bot
+from benchmarks.fakes import ClickRouter
+
+NAVIGATIONS = 100_000
+CLICKS_PER_TICKET = 10  # Navigations on each menu message before a new ticket
+CHECKPOINTS = 4  # Store size samples taken along the run
+GUILD_ID = 1
+
+# (view, button callback name) cycled through as a user browses the menus
+ROUTE = [
+    ("main_menu_view", "question_button"),
+    ("question_view", "q1_button"),
+    ("back_to_question_view", "back"),
+    ("question_view", "back"),
+    ("main_menu_view", "request_role_button"),
+    ("role_request_view", "back"),
+    ("main_menu_view", "register_button"),
+    ("back_to_main_view", "back"),
+]
+
+
+async def _fake_interaction_response(self, interaction_id, token, **kwargs):
+    return {"interaction": {"id": str(interaction_id), "type": 3}}
+
+
+def _interaction(state, sequence, custom_id):
+    message_id = 10_000 + sequence // CLICKS_PER_TICKET
+    data = {
+        "id": str(1_000_000 + sequence),
+        "application_id": "1",
+        "type": 3,
+        "token": "token",
+        "version": 1,
+        "attachment_size_limit": 8 * 1024 * 1024,
+        "channel_id": "5",
+        "guild_id": str(GUILD_ID),
+        "data": {"custom_id": custom_id, "component_type": 2},
+        "message": {
+            "id": str(message_id),
+            "channel_id": "5",
+            "author": {"id": "1", "username": "SENSE", "discriminator": "0", "avatar": None},
+            "content": "",
+            "timestamp": "2025-01-01T00:00:00+00:00",
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": [],
+            "pinned": False,
+            "type": 0,
+        },
+        # A member payload gives the interaction its guild, which the views check
+        "member": {
+            "user": {"id": "42", "username": "member", "discriminator": "0", "avatar": None},
+            "roles": [],
+            "joined_at": "2025-01-01T00:00:00+00:00",
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+        },
+    }
+    return discord.Interaction(data=data, state=state)
+
+
+def _fresh_view(view):
+    """Mimic the old behaviour: a new, per-message stored view for every click"""
+    legacy_class = type(f"Legacy{type(view).__name__}", (type(view),), {"is_dispatchable": View.is_dispatchable})
+    return legacy_class()
+
+
+async def run(legacy, navigations):
+    # The shared views stay registered in both modes, as they were before;
+    # legacy mode additionally stores a fresh view for every edited message
+    router = ClickRouter(bot.build_persistent_views())
+    state = router.client._connection
+    store = router.store
+    # As after login; guild interactions need the bot's own user
+    state.user = discord.ClientUser(state=state, data={"id": "1", "username": "SENSE", "discriminator": "0", "avatar": None})
+
+    original_edit = discord.InteractionResponse.edit_message
+
+    async def edit_message(response, **kwargs):
+        if legacy and kwargs.get("view") is not None:
+            kwargs["view"] = _fresh_view(kwargs["view"])
+        return await original_edit(response, **kwargs)
+
+    checkpoint_every = max(1, navigations // CHECKPOINTS)
+    samples = []
+
+    discord.InteractionResponse.edit_message = edit_message
+    try:
+        tracemalloc.start()
+        for sequence in range(navigations):
+            view_name, callback_name = ROUTE[sequence % len(ROUTE)]
+            view = getattr(bot, view_name)
+            item = getattr(view, callback_name)
+            interaction = _interaction(state, sequence, item.custom_id)
+            await router.click(item.custom_id, interaction)
+
+            if (sequence + 1) % checkpoint_every == 0:
+                gc.collect()
+                current, _ = tracemalloc.get_traced_memory()
+                samples.append((sequence + 1, len(store._views), current // 1024))
+        tracemalloc.stop()
+    finally:
+        discord.InteractionResponse.edit_message = original_edit
+
+    return samples
+
+
+async def main():
+    navigations = int(sys.argv[1]) if len(sys.argv) > 1 else NAVIGATIONS
+    AsyncWebhookAdapter.create_interaction_response = _fake_interaction_response
+    bot.embed_templates.build_all()
+
+    for label, legacy in (("fresh view per click (old)", True), ("persistent views", False)):
+        print(label)
+        print(f"  {'navigations':>12}{'stored messages':>17}{'traced KiB':>12}")
+        for done, stored, traced_kib in await run(legacy, navigations):
+            print(f"  {done:>12}{stored:>17}{traced_kib:>12}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,35 @@
 import discord
-from discord.ext import commands
+from discord import app_commands
+from discord.ext import commands, tasks
 from discord.ui import Button, View
 import aiohttp
+from aiohttp import web
 import asyncio
+import argparse
+import bisect
+import contextlib
+import concurrent.futures
+import contextvars
+import dataclasses
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import logging.handlers
+import math
 import re
 import os
+import queue
+import random
+import sqlite3
+import struct
+import sys
+import time
+from array import array
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -14,22 +39,268 @@ load_dotenv()
 # ============================================
 # BOT CONFIGURATION
 # ============================================
-intents = discord.Intents.default()
-intents.guilds = True
-intents.members = True
-intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+# Set by the --sync-commands CLI flag
+FORCE_COMMAND_SYNC = False
+
+# Lean mode trims gateway traffic and member caching for large guilds
+LEAN_MODE = os.getenv('SENSE_LEAN_MODE', '').lower() in ('1', 'true', 'yes')
+
+
+def build_gateway_options(lean):
+    """Return (intents, member_cache_flags, chunk_guilds_at_startup) for a mode"""
+    if lean:
+        # Only what the bot uses: guild/channel events, ticket message activity
+        # and member listing for role reconciliation. Transcripts archive other
+        # users' content, embeds and attachments, which Discord blanks without
+        # message_content (it adds no events, only fills in those fields).
+        intents = discord.Intents.none()
+        intents.guilds = True
+        intents.guild_messages = True
+        intents.members = True
+        intents.message_content = True
+        # Members are fetched on demand (see get_or_fetch_member) instead
+        return intents, discord.MemberCacheFlags.none(), False
+
+    intents = discord.Intents.default()
+    intents.guilds = True
+    intents.members = True
+    intents.message_content = True
+    return intents, discord.MemberCacheFlags.from_intents(intents), True
+
+
+intents, member_cache_flags, chunk_guilds_at_startup = build_gateway_options(LEAN_MODE)
+
+# Sharding: AUTO_SHARD=1 lets Discord pick the shard count; SHARD_COUNT and
+# SHARD_IDS (e.g. "0,1") split shards across several processes
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', '0')) or None
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv('SHARD_IDS', '').split(',') if shard_id.strip()] or None
+SHARDED = os.getenv('AUTO_SHARD', '').lower() in ('1', 'true', 'yes') or SHARD_COUNT is not None or SHARD_IDS is not None
+
+# The process that runs shard 0 (or the only process) owns the work that must
+# happen once globally: roster syncing and slash command uploads. Everything
+# else is per guild, and a guild always lives on exactly one shard, so the
+# in-process caches, single-flights and queues stay correct when shards are
+# spread over processes (caches are TTL-bounded hints, never shared truth).
+IS_PRIMARY_PROCESS = SHARD_IDS is None or 0 in SHARD_IDS
+
+if SHARD_IDS is not None and SHARD_COUNT is None:
+    raise ValueError("SHARD_IDS requires SHARD_COUNT to be set")
+
+
+def owns_guild(guild_id):
+    """Whether this process runs the shard a guild lives on (Discord's sharding formula)"""
+    return SHARD_IDS is None or (guild_id >> 22) % SHARD_COUNT in SHARD_IDS
+
+
+class SenseBot(commands.AutoShardedBot if SHARDED else commands.Bot):
+    """Bot that owns the long-lived resources shared by all interactions"""
+
+    async def setup_hook(self):
+        embed_templates.build_all()
+        for view in build_persistent_views():
+            self.add_view(view)
+        await roblox_http.start()
+        await verification_store.open()
+        await ticket_store.open()
+        await ticket_lifecycle.load()
+        await metrics_server.start(METRICS_HOST, METRICS_PORT)
+        if not await guild_configs.load():
+            raise RuntimeError(f"Refusing to start with a broken guild config: {GUILD_CONFIG_PATH}")
+        guild_config_reload_loop.start()
+        roster_refresh_loop.start()
+        reconcile_loop.start()
+        ticket_greeter.start()
+        ticket_sweep_loop.start()
+        verification_queue.start()
+        verification_retry_loop.start()
+        shard_report_loop.start()
+        if IS_PRIMARY_PROCESS:
+            await sync_command_tree(self, force=FORCE_COMMAND_SYNC)
+
+    async def close(self):
+        shard_report_loop.cancel()
+        verification_retry_loop.cancel()
+        await verification_queue.stop()
+        ticket_sweep_loop.cancel()
+        await transcript_archiver.stop()
+        await ticket_greeter.stop()
+        reconcile_loop.cancel()
+        roster_refresh_loop.cancel()
+        guild_config_reload_loop.cancel()
+        await metrics_server.stop()
+        await ticket_store.close()
+        await verification_store.close()
+        await roblox_http.close()
+        await super().close()
+
+
+bot = SenseBot(
+    command_prefix="!",
+    intents=intents,
+    member_cache_flags=member_cache_flags,
+    chunk_guilds_at_startup=chunk_guilds_at_startup,
+    **({"shard_count": SHARD_COUNT, "shard_ids": SHARD_IDS} if SHARDED else {}),
+)
 
 
 # ============================================
 # CONFIGURATION
 # ============================================
+# Defaults for every guild; GUILD_CONFIG_PATH can override them per guild
 ROBLOX_GROUP_ID = 35908807  # SENSE of our heart
 REQUIRED_ROLE_NAME = "💚・Our Lovely Sense Member"
 DISCORD_VERIFIED_ROLE_ID = 1431176844279021578  # Role to give after verification
 ATTUNED_SOUL_ROLE_ID = 1431246790954451156  # Staff notification role
 TICKET_CATEGORY_ID = 1430958759852769373
 TICKET_CHANNEL_PREFIX = "ticket-"
+DATA_DIR = os.getenv('SENSE_DATA_DIR', 'data')  # Where on-disk state is kept
+
+# Per-guild configuration
+GUILD_CONFIG_PATH = os.getenv('SENSE_GUILD_CONFIG', os.path.join(DATA_DIR, "guilds.json"))
+GUILD_CONFIG_RELOAD_INTERVAL = 30  # Seconds between checks for an edited config file
+
+
+# Slash command sync
+COMMAND_TREE_HASH_PATH = os.path.join(DATA_DIR, "command_tree.sha256")
+
+# On-demand member cache (used when the gateway member cache is off)
+MEMBER_LRU_SIZE = 2000  # Members kept after fetching
+MEMBER_LRU_TTL = 5 * 60  # Seconds before a fetched member is refreshed
+
+# Roblox API base URLs (overridable to point at a local stand-in)
+ROBLOX_USERS_API = os.getenv('ROBLOX_USERS_API', 'https://users.roblox.com')
+ROBLOX_GROUPS_API = os.getenv('ROBLOX_GROUPS_API', 'https://groups.roblox.com')
+
+# Roblox HTTP client (shared connection pool)
+ROBLOX_HTTP_POOL_LIMIT = 100  # Total open connections
+ROBLOX_HTTP_LIMIT_PER_HOST = 20  # Open connections per Roblox host
+ROBLOX_HTTP_DNS_CACHE_TTL = 300  # Seconds
+ROBLOX_HTTP_KEEPALIVE_TIMEOUT = 30  # Seconds an idle connection is kept
+ROBLOX_HTTP_CONNECT_TIMEOUT = 5  # Seconds
+ROBLOX_HTTP_READ_TIMEOUT = 10  # Seconds
+
+# Roblox rate limiting and retries
+ROBLOX_RATE_LIMITS = {
+    # endpoint: (requests per second, burst size)
+    "users": (5.0, 10),
+    "groups": (10.0, 20),
+}
+ROBLOX_MAX_RETRIES = 3  # Retries per request after the first attempt
+ROBLOX_BACKOFF_BASE = 0.5  # Seconds, doubled on every retry
+ROBLOX_BACKOFF_MAX = 8.0  # Seconds
+ROBLOX_RETRY_AFTER_MAX = 30.0  # Longest Retry-After we are willing to honour
+ROBLOX_RETRY_BUDGET_RATIO = 0.2  # Retries may add at most 20% extra requests
+ROBLOX_RETRY_BUDGET_MIN = 10  # Retries always available after a quiet period
+
+# Roblox circuit breakers (one per endpoint)
+ROBLOX_CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failed requests that open the circuit
+ROBLOX_CIRCUIT_RESET_TIMEOUT = 30  # Seconds open before a probe request is let through
+ROBLOX_CIRCUIT_HALF_OPEN_PROBES = 1  # Requests allowed at once while probing
+
+# Verification job queue
+VERIFICATION_WORKERS = 8  # Verifications processed at once
+VERIFICATION_QUEUE_SIZE = 200  # Waiting verifications before clicks get a "busy" answer
+VERIFICATION_NOTICE_DELAY = 1.0  # Seconds a job may take before the member is shown their queue position
+VERIFICATION_LATENCY_SAMPLES = 1000  # Recent wait/service samples kept for percentiles
+
+# Verifications deferred while Roblox is unavailable
+VERIFICATION_RETRY_INTERVAL = 10  # Seconds between retry attempts
+VERIFICATION_RETRY_MAX_AGE = 14 * 60  # Interaction tokens last 15 minutes; give up just before
+VERIFICATION_RETRY_MAX = 500  # Members waiting for a retry
+
+# Member identity index
+IDENTITY_WARM_CHUNK = 5000  # Members parsed per event loop slice when indexing a guild
+
+# Roblox username -> user cache
+ROBLOX_USER_CACHE_SIZE = 5000  # Max cached usernames
+ROBLOX_USER_CACHE_TTL = 6 * 60 * 60  # Seconds a resolved account is reused
+ROBLOX_USER_NEGATIVE_TTL = 5 * 60  # Seconds an "account not found" is reused
+
+# Username lookup batching (users.roblox.com accepts up to 100 per request)
+ROBLOX_USERNAME_BATCH_WINDOW = 0.005  # Seconds to collect lookups before sending
+ROBLOX_USERNAME_BATCH_SIZE = 100  # Send immediately once this many are queued
+
+# Group membership result cache
+GROUP_MEMBERSHIP_CACHE_SIZE = 10000  # Max cached Roblox users
+GROUP_MEMBERSHIP_POSITIVE_TTL = 30 * 60  # Seconds a passed check is reused
+GROUP_MEMBERSHIP_NEGATIVE_TTL = 2 * 60  # Seconds a failed check is reused
+
+# Local group roster index
+ROSTER_SNAPSHOT_DIR = DATA_DIR  # One snapshot per (group, role) any guild verifies against
+ROSTER_REFRESH_INTERVAL = 5 * 60  # Seconds between incremental refreshes
+ROSTER_FULL_SYNC_INTERVAL = 6 * 60 * 60  # Seconds between full roster walks
+ROSTER_STALE_AFTER = 30 * 60  # Seconds before the index stops answering verifications
+ROSTER_PAGE_SIZE = 100  # Role members per page (Roblox maximum)
+ROSTER_RELOAD_INTERVAL = 60  # Seconds between snapshot checks on non-primary shard processes
+
+# Durable verification store (SQLite)
+DATABASE_PATH = os.path.join(DATA_DIR, "sense.db")
+VERIFICATION_REUSE_TTL = 6 * 60 * 60  # Seconds a stored pass lets a member skip the Roblox checks
+VERIFICATION_WRITE_INTERVAL = 1.0  # Seconds writes are batched before a flush
+VERIFICATION_WRITE_BATCH = 500  # Flush immediately once this many writes are queued
+
+# Verified role reconciliation
+RECONCILE_INTERVAL = 12 * 60 * 60  # Seconds between scheduled passes
+RECONCILE_AUTO_APPLY = False  # Scheduled passes only report unless enabled
+RECONCILE_RATE = 2.0  # Role changes per second
+RECONCILE_BURST = 5
+RECONCILE_CHECKPOINT_EVERY = 25  # Role changes between plan checkpoints
+RECONCILE_PROGRESS_INTERVAL = 5  # Seconds between progress message edits
+RECONCILE_RESOLVE_CHUNK = 1000  # Usernames resolved concurrently per step
+
+# Sharding
+SHARD_REPORT_INTERVAL = 60  # Seconds between per-shard latency/event-rate logs
+
+# Ticket greeting pipeline
+GREETING_READY_TIMEOUT = 5  # Seconds to wait for a readiness signal before greeting anyway
+GREETING_SWEEP_INTERVAL = 0.5  # Seconds between checks for timed-out tickets
+GREETING_QUEUE_SIZE = 100  # Ready greetings waiting to be sent
+GREETING_MAX_PENDING = 1000  # Tickets waiting to become ready
+GREETING_WORKERS = 3
+GREETING_RATE = 5.0  # Greetings per second across all channels
+GREETING_BURST = 5
+GREETING_LATENCY_SAMPLES = 1000  # Recent time-to-greeting samples kept for percentiles
+
+# Staff notification digests
+STAFF_NOTIFICATION_CHANNEL_ID = None  # Staff channel for request digests (None = ping in the ticket)
+STAFF_DIGEST_WINDOW = 5 * 60  # Seconds a digest keeps collecting requests
+STAFF_DIGEST_EDIT_DELAY = 3  # Seconds to batch requests into one digest edit
+STAFF_DIGEST_MAX_LINES = 25  # Requests listed before the digest is truncated
+
+# Ticket transcripts
+TRANSCRIPT_DIR = os.path.join(DATA_DIR, "transcripts")
+TRANSCRIPT_CHANNEL_ID = None  # Staff channel transcripts are uploaded to (None = archive directory only)
+TRANSCRIPT_KEEP_LOCAL = True  # Keep the archive file after a successful upload
+TRANSCRIPT_ON_CLOSE = True  # Archive a ticket automatically when it is closed
+TRANSCRIPT_CHUNK_SIZE = 500  # Messages encoded and written per file write
+TRANSCRIPT_COMPRESS_LEVEL = 6  # gzip level (1 fastest - 9 smallest)
+TRANSCRIPT_CONCURRENCY = 2  # Channels archived at once (history reads share Discord's rate limits)
+TRANSCRIPT_SHUTDOWN_GRACE = 10  # Seconds running archives may finish during shutdown
+
+# Ticket lifecycle
+TICKET_INACTIVITY_TIMEOUT = 72 * 60 * 60  # Seconds without a message before a ticket is closed (0 = never)
+TICKET_DELETE_DELAY = 60 * 60  # Seconds a closed ticket stays readable before it is deleted
+TICKET_CLOSE_CONFIRM_TIMEOUT = 120  # Seconds the "close this ticket?" button stays clickable
+TICKET_SWEEP_INTERVAL = 60  # Seconds between inactivity / reaper sweeps
+TICKET_SWEEP_BATCH = 50  # Tickets closed or deleted per guild per sweep; the rest wait for the next one
+TICKET_REAP_RATE = 0.5  # Channel deletions per second per guild
+TICKET_REAP_BURST = 3
+TICKET_ARCHIVE_ATTEMPTS = 3  # Failed transcript attempts before a ticket is deleted without one
+TICKET_HISTORY_RETENTION = 30 * 24 * 60 * 60  # Seconds reaped tickets are kept in the database
+
+# Logging (JSON lines on stdout, written by a background thread)
+LOG_LEVEL = os.getenv('SENSE_LOG_LEVEL', 'INFO').upper()
+LOG_QUEUE_SIZE = 10000  # Records buffered for the writer thread; newer ones are dropped when full
+LOG_REPEAT_WINDOW = 60  # Seconds over which identical warnings/errors are counted
+LOG_REPEAT_BURST = 5  # Identical warnings/errors logged per window before the rest are suppressed
+
+# Prometheus metrics endpoint (bound locally; SENSE_METRICS_PORT=0 disables it).
+# With SHARD_IDS every process listens on the base port plus its first shard id
+METRICS_HOST = os.getenv('SENSE_METRICS_HOST', '127.0.0.1')
+METRICS_PORT_BASE = int(os.getenv('SENSE_METRICS_PORT', '9108'))
+METRICS_PORT = METRICS_PORT_BASE + min(SHARD_IDS) if METRICS_PORT_BASE and SHARD_IDS else METRICS_PORT_BASE
+INTERACTION_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Seconds
+ROBLOX_LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Seconds
 
 
 COLOR_PRIMARY = 0x5865F2
@@ -41,321 +312,4373 @@ COLOR_PINK = 0xFFC0CB
 
 
 # ============================================
-# ROBLOX API FUNCTIONS
+# LOGGING
 # ============================================
 
-def extract_roblox_username(display_name):
-    """Extract Roblox username from Discord display name (Bloxlink format)"""
-    # Try to find @username pattern
-    match = re.search(r'@(\w+)', display_name)
-    if match:
-        return match.group(1)
-    
-    # Try without @ symbol
-    username = re.sub(r'[^\w\s]', '', display_name).strip().split()[0]
-    return username if username else None
+log = logging.getLogger("sense")
 
+# Correlation ids, set per interaction callback and per ticket channel task;
+# asyncio tasks inherit them, so nested work is tagged too
+log_interaction_id = contextvars.ContextVar("log_interaction_id", default=None)
+log_channel_id = contextvars.ContextVar("log_channel_id", default=None)
 
-async def get_roblox_user_by_username(username):
-    """Get Roblox user data from username"""
-    url = "https://users.roblox.com/v1/usernames/users"
-    payload = {"usernames": [username], "excludeBannedUsers": False}
-    
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get('data'):
-                        return data['data'][0]
-    except Exception as e:
-        print(f"Error getting Roblox user: {e}")
-    return None
+_LOG_RECORD_FIELDS = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+    "message", "asctime", "interaction_id", "channel_id", "suppressed",
+}
 
 
-async def check_group_membership_and_role(user_id, group_id, required_role):
-    """Check if user is in group with specific role"""
-    url = f"https://groups.roblox.com/v2/users/{user_id}/groups/roles"
-    
+@contextlib.contextmanager
+def log_context(interaction_id=None, channel_id=None):
+    """Tag every log line emitted inside the block with these correlation ids"""
+    tokens = []
+    if interaction_id is not None:
+        tokens.append((log_interaction_id, log_interaction_id.set(interaction_id)))
+    if channel_id is not None:
+        tokens.append((log_channel_id, log_channel_id.set(channel_id)))
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    for group in data.get('data', []):
-                        if group['group']['id'] == group_id:
-                            role_name = group['role']['name']
-                            if role_name == required_role:
-                                return True, role_name
-                            else:
-                                return False, f"Wrong role: {role_name}"
-                    return False, "Not in group"
-    except Exception as e:
-        print(f"Error checking group: {e}")
-    
-    return False, "API Error"
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class LogContextFilter(logging.Filter):
+    """Copies the correlation ids onto the record in the emitting task"""
+
+    def filter(self, record):
+        record.interaction_id = log_interaction_id.get()
+        record.channel_id = log_channel_id.get()
+        return True
+
+
+class RepeatedLogFilter(logging.Filter):
+    """Lets a burst of identical warnings/errors through per window, then counts the rest
+
+    Records are identical when they share logger, level and message
+    template, so one Roblox outage logs a handful of lines rather than one
+    per interaction. The next line let through reports how many were held
+    back in its `suppressed` field.
+    """
+
+    def __init__(self, window, burst):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._windows = {}  # (logger, level, template) -> [window start, logged, suppressed]
+        self.suppressed = 0
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        state = self._windows.get(key)
+        if state is None or now - state[0] >= self.window:
+            held_back = state[2] if state else 0
+            if len(self._windows) > 1000:
+                self._windows.clear()
+            state = self._windows[key] = [now, 0, 0]
+            if held_back:
+                record.suppressed = held_back
+
+        if state[1] >= self.burst:
+            state[2] += 1
+            self.suppressed += 1
+            return False
+        state[1] += 1
+        return True
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread without ever blocking the event loop"""
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Resolve the message and traceback here, so the record crossing to
+        # the writer thread holds no references to live objects
+        record = logging.makeLogRecord(record.__dict__)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line; `extra=` fields are included as keys"""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in ("interaction_id", "channel_id", "suppressed"):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        for key, value in record.__dict__.items():
+            if key not in _LOG_RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+log_queue_handler = LogQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+repeated_log_filter = RepeatedLogFilter(LOG_REPEAT_WINDOW, LOG_REPEAT_BURST)
+log_queue_handler.addFilter(repeated_log_filter)
+log_queue_handler.addFilter(LogContextFilter())
+
+
+def setup_logging(stream=None):
+    """Route all logging (ours and discord.py's) through the queue; returns the started listener"""
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonLogFormatter())
+    listener = logging.handlers.QueueListener(log_queue_handler.queue, output)
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(log_queue_handler)
+    listener.start()
+    return listener
 
 
 # ============================================
-# UTILITY FUNCTION
+# METRICS
 # ============================================
 
-def get_main_menu_embed_and_view():
-    """Create main menu embed and view"""
-    embed = discord.Embed(
-        title="✦ SENSE Support Center ✦",
-        description=(
-            "**Welcome to SENSE Support!** 💫\n\n"
-            "Thank you for reaching out. Please select one of the options below:"
-        ),
-        color=COLOR_PRIMARY
-    )
-    
-    embed.add_field(
-        name="",
-        value=(
-            "```text\n"
-            "📝 Register Member\n"
-            "Join the SENSE community and get registration steps.\n"
-            "```\n"
-            "```text\n"
-            "❓ Question\n"
-            "Browse FAQs and get instant answers to common questions.\n"
-            "```\n"
-            "```text\n"
-            "✨ Request Role\n"
-            "Verify your membership and get the Attuned Soul role.\n"
-            "```\n"
-            "```text\n"
-            "💬 Live Chat\n"
-            "Connect with a staff member for personalized help.\n"
-            "```"
-        ),
-        inline=False
-    )
-    
-    embed.add_field(
-        name="",
-        value="**Click the button below that matches your need:** ⬇️",
-        inline=False
-    )
-    
-    embed.set_footer(text="SENSE Community • Support Team Available 24/7")
-    embed.timestamp = discord.utils.utcnow()
-    
-    return embed, MainMenuView()
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter keyed by label values"""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by label values
+
+    `observe` only bisects and bumps one bucket, so it is cheap enough for
+    every interaction; cumulative counts are computed at scrape time.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=INTERACTION_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self):
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == math.inf else f'le="{bound!r}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class MetricsRegistry:
+    """Metrics recorded in place plus collectors that read existing stats at scrape time"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=INTERACTION_LATENCY_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, func):
+        """Register `func() -> [(name, kind, documentation, [(labels dict, value), ...])]`
+
+        `kind` is "counter" for values that only grow (named `..._total`)
+        and "gauge" for current values.
+        """
+        self._collectors.append(func)
+        return func
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+
+        families = {}
+        for collect in self._collectors:
+            try:
+                for name, kind, documentation, samples in collect():
+                    families.setdefault(name, (kind, documentation, []))[2].extend(samples)
+            except Exception:
+                log.exception("Error collecting metrics from %s", collect.__name__)
+        for name, (kind, documentation, samples) in families.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+interaction_latency = metrics.histogram(
+    "sense_interaction_duration_seconds",
+    "Time spent in a button callback or slash command",
+    ("callback",),
+)
+interaction_outcomes = metrics.counter(
+    "sense_interactions_total",
+    "Handled interactions by callback and outcome",
+    ("callback", "outcome"),
+)
+roblox_request_latency = metrics.histogram(
+    "sense_roblox_request_duration_seconds",
+    "Outbound Roblox API request latency per attempt",
+    ("endpoint",),
+    ROBLOX_LATENCY_BUCKETS,
+)
+verification_wait = metrics.histogram(
+    "sense_verification_queue_wait_seconds",
+    "Time a verification job waited for a worker",
+)
+verification_service = metrics.histogram(
+    "sense_verification_service_seconds",
+    "Time a worker spent on one verification job",
+)
+verification_short_circuits = metrics.counter(
+    "sense_verification_store_reuses_total",
+    "Verifications answered from the verification store without Roblox calls",
+)
+circuit_transitions = metrics.counter(
+    "sense_roblox_circuit_transitions_total",
+    "Roblox circuit breaker state changes",
+    ("breaker", "from_state", "to_state"),
+)
+roblox_responses = metrics.counter(
+    "sense_roblox_responses_total",
+    "Outbound Roblox API attempts by HTTP status (\"error\" = no response)",
+    ("endpoint", "status"),
+)
+
+
+def instrument_interaction(name):
+    """Decorator recording latency and outcome of an interaction callback
+
+    Also tags the callback's log lines with the interaction and channel ids.
+    """
+    def decorator(callback):
+        @functools.wraps(callback)
+        async def wrapper(interaction, *args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                with log_context(interaction.id, interaction.channel_id):
+                    result = await callback(interaction, *args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                interaction_latency.observe(time.perf_counter() - started, name)
+                interaction_outcomes.inc(name, outcome)
+        return wrapper
+    return decorator
+
+
+def stats_metrics(prefix, documentation, rows, counters=()):
+    """Turn [(labels, stats dict)] into one metric family per numeric stat
+
+    Stats named in `counters` only ever grow and are exported as counters
+    (`sense_<prefix>_<key>_total`); every other stat is a gauge.
+    """
+    families = {}
+    for labels, stats in rows:
+        for key, value in stats.items():
+            if isinstance(value, bool):
+                value = int(value)
+            if not isinstance(value, (int, float)) or not math.isfinite(value):
+                continue
+            families.setdefault(key, []).append((labels, value))
+    return [
+        (f"sense_{prefix}_{key}_total", "counter", f"{documentation} ({key})", samples)
+        if key in counters else
+        (f"sense_{prefix}_{key}", "gauge", f"{documentation} ({key})", samples)
+        for key, samples in families.items()
+    ]
+
+
+@metrics.collector
+def collect_component_stats():
+    """Expose the stats() counters every component already keeps"""
+    limiter = roblox_http.limiter_stats()
+    return [
+        *stats_metrics("roblox_pool", "Roblox HTTP connection pool", [({}, roblox_http.pool_stats())],
+                       counters=("requests", "connections_created", "connections_reused")),
+        *stats_metrics("roblox_limiter", "Roblox per-endpoint token bucket", [
+            ({"endpoint": endpoint}, stats) for endpoint, stats in limiter["endpoints"].items()
+        ], counters=("acquired", "throttled")),
+        *stats_metrics("roblox_circuit", "Roblox circuit breaker (state: 0 closed, 1 half-open, 2 open)", [
+            ({"breaker": endpoint}, breaker.stats()) for endpoint, breaker in roblox_http.breakers.items()
+        ], counters=("rejected",)),
+        *stats_metrics("verification_queue", "Verification job queue", [({}, verification_queue.stats())],
+                       counters=("submitted", "joined", "shed", "completed", "failed")),
+        *stats_metrics("verification_retries", "Verifications deferred during a Roblox outage", [
+            ({}, verification_retries.stats())
+        ], counters=("queued", "completed", "expired", "rejected")),
+        *stats_metrics("roblox_retry", "Roblox throttling and retries", [
+            ({}, {key: value for key, value in limiter.items() if key != "endpoints"})
+        ], counters=("rate_limited", "retried", "dropped")),
+        *stats_metrics("cache", "Cache", [
+            ({"cache": "roblox_user"}, roblox_user_cache.stats()),
+            ({"cache": "group_membership"}, group_membership_cache.stats()),
+            ({"cache": "member"}, member_lru.stats()),
+        ], counters=("hits", "misses", "evictions", "expirations")),
+        *stats_metrics("identity_index", "Member identity index", [({}, member_identities.stats())],
+                       counters=("parsed", "hits", "misses")),
+        *stats_metrics("verification_store", "Verification store", [({}, verification_store.stats())],
+                       counters=("lookups", "found", "writes", "rows_flushed", "flushes", "flush_errors")),
+        *stats_metrics("single_flight", "Coalesced calls", [
+            ({"flight": "roblox_check"}, roblox_check_flight.stats()),
+        ], counters=("started", "shared")),
+        *stats_metrics("username_batcher", "Username lookup batching", [({}, username_batcher.stats())],
+                       counters=("lookups", "batches_sent", "usernames_sent")),
+        *stats_metrics("roster", "Group roster index", [
+            ({"group": str(roster.group_id), "role": roster.role_name}, roster.stats()) for roster in group_rosters
+        ], counters=("sync_errors",)),
+        *stats_metrics("guild_config", "Per-guild configuration", [({}, guild_configs.stats())],
+                       counters=("loads", "load_errors", "resolves", "invalidations")),
+        *stats_metrics("greeter", "Ticket greeting pipeline", [({}, ticket_greeter.stats())], counters=(
+            "greeted", "failed", "dropped", "ready_immediately", "ready_by_signal", "ready_by_timeout",
+        )),
+        *stats_metrics("staff_notifier", "Staff request digests", [({}, staff_notifier.stats())],
+                       counters=("requests", "duplicates_dropped", "digests_sent", "digest_edits", "errors")),
+        *stats_metrics("transcripts", "Ticket transcript archives", [({}, transcript_archiver.stats())], counters=(
+            "archived", "failed", "uploaded", "too_large", "messages", "raw_bytes", "bytes_written",
+        )),
+        *stats_metrics("tickets", "Ticket lifecycle", [({}, ticket_lifecycle.stats())], counters=(
+            "closed_by_member", "closed_inactive", "reaped", "already_deleted", "reap_failures", "sweeps",
+        )),
+        *stats_metrics("logging", "Log pipeline", [({}, {
+            "queued": log_queue_handler.queue.qsize(),
+            "dropped": log_queue_handler.dropped,
+            "suppressed": repeated_log_filter.suppressed,
+        })], counters=("dropped", "suppressed")),
+    ]
+
+
+@metrics.collector
+def collect_gateway_stats():
+    latencies = [
+        ({"shard": str(shard_id)}, latency)
+        for shard_id, latency in shard_monitor.latencies().items()
+        if math.isfinite(latency)
+    ]
+    events = [({"shard": str(shard_id)}, count) for shard_id, count in shard_monitor.events.items()]
+    return [
+        ("sense_gateway_latency_seconds", "gauge", "Gateway heartbeat latency", latencies),
+        ("sense_gateway_events_total", "counter", "Events handled per shard since start", events),
+    ]
+
+
+class MetricsServer:
+    """Serves `metrics` on a local HTTP port for Prometheus to scrape"""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.runner = None
+
+    async def start(self, host, port):
+        if self.runner is not None or not port:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except OSError as e:
+            # Running without metrics would go unnoticed; refuse to start instead
+            await runner.cleanup()
+            raise RuntimeError(f"Cannot bind the metrics endpoint to {host}:{port}: {e}") from e
+        self.runner = runner
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def _handle(self, request):
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8")
+
+
+metrics_server = MetricsServer(metrics)
 
 
 # ============================================
-# EVENT: DETECT NEW TICKET CHANNEL
+# RATE LIMITING
 # ============================================
 
-@bot.event
-async def on_guild_channel_create(channel):
-    """Auto-greet when ticket is created"""
-    if isinstance(channel, discord.TextChannel):
-        if channel.category_id == TICKET_CATEGORY_ID and TICKET_CHANNEL_PREFIX in channel.name.lower():
-            await asyncio.sleep(2)
-            embed, view = get_main_menu_embed_and_view()
-            await channel.send(embed=embed, view=view)
+class TokenBucket:
+    """FIFO-fair token bucket for one Roblox endpoint, pausable by Retry-After"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # asyncio.Lock wakes waiters in arrival order, so callers queue fairly
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.throttled = 0
+        self.waiting = 0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait for a token, queueing behind earlier callers"""
+        self.waiting += 1
+        try:
+            async with self._lock:
+                throttled = False
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+
+                    delay = self._paused_until - now
+                    if delay <= 0:
+                        if self.tokens >= 1:
+                            self.tokens -= 1
+                            break
+                        delay = (1 - self.tokens) / self.rate
+
+                    throttled = True
+                    await asyncio.sleep(delay)
+
+                self.acquired += 1
+                if throttled:
+                    self.throttled += 1
+        finally:
+            self.waiting -= 1
+
+    def pause(self, seconds):
+        """Hold every caller back for `seconds` (used for Retry-After)"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    def stats(self):
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "waiting": self.waiting,
+        }
+
+
+class RetryBudget:
+    """Caps retries to a fraction of recent traffic so outages don't multiply load"""
+
+    def __init__(self, ratio, minimum):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.balance = float(minimum)
+
+    def deposit(self):
+        # Keep the balance bounded so a long quiet period can't bank unlimited retries
+        self.balance = min(self.balance + self.ratio, self.minimum + 100 * self.ratio)
+
+    def withdraw(self):
+        if self.balance >= 1:
+            self.balance -= 1
+            return True
+        return False
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker that fails fast while a dependency is down
+
+    Closed: everything passes; `failure_threshold` consecutive failures
+    open it. Open: every request is refused until `reset_timeout` has
+    passed. Half-open: up to `half_open_probes` requests probe the
+    dependency; a success closes the circuit, a failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name, failure_threshold, reset_timeout, half_open_probes=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.rejected = 0
+
+    def _transition(self, state):
+        log.warning("Roblox %s circuit %s -> %s", self.name, self.state, state)
+        circuit_transitions.inc(self.name, self.state, state)
+        self.state = state
+
+    def is_open(self):
+        """Whether requests are being refused right now (no probe is due yet)"""
+        return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow(self):
+        """Admit a request; callers must report its outcome with record_success/record_failure"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self._transition(self.HALF_OPEN)
+            self.probes = 0
+
+        if self.state == self.HALF_OPEN:
+            if self.probes >= self.half_open_probes:
+                self.rejected += 1
+                return False
+            self.probes += 1
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        if self.state == self.HALF_OPEN:
+            self._transition(self.CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self.opened_at = time.monotonic()
+            self._transition(self.OPEN)
+
+    def release(self):
+        """The admitted request ended without telling us anything (e.g. a 4xx)"""
+        if self.state == self.HALF_OPEN:
+            self.probes = max(0, self.probes - 1)
+
+    def stats(self):
+        return {
+            "state": self.STATE_VALUES[self.state],
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+def _parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - discord.utils.utcnow()).total_seconds())
 
 
 # ============================================
-# MAIN MENU VIEW
+# ROBLOX HTTP CLIENT
 # ============================================
 
-class MainMenuView(View):
+class RobloxAPIError(Exception):
+    """Raised when a Roblox API call does not return a usable response"""
+
+
+class RobloxUnavailableError(RobloxAPIError):
+    """Raised without contacting Roblox while an endpoint's circuit is open"""
+
+
+class RobloxClientError(RobloxAPIError):
+    """Raised when Roblox rejects a request with a 4xx status (other than 429)
+
+    Roblox is up and answered, so repeating the request won't help.
+    """
+
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+
+class RobloxHTTPClient:
+    """Long-lived aiohttp session with a keep-alive connection pool for Roblox APIs"""
+
     def __init__(self):
-        super().__init__(timeout=None)
-    
-    @discord.ui.button(emoji="📝", style=discord.ButtonStyle.primary, row=0)
-    async def register_button(self, interaction: discord.Interaction, button: Button):
-        """Registration Guide Button"""
-        embed = discord.Embed(
-            title="📝 Member Registration Guide",
-            description="**𝜗𝜚⋆₊˚ HOW TO JOIN SENSE CLAN ⋆₊˚𝜗𝜚**\n",
-            color=COLOR_PINK
-        )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "📌 Step 1: Join Our Roblox Community\n"
-                "• Change your display name to: username+sense\n"
-                "• Example: dipsysense\n"
-                "```"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="",
-            value="🔗 [Click to Join Community](https://www.roblox.com/communities/35908807/SENSE-of-our-heart#!/about)",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "📸 Step 2: Submit Proof\n"
-                "• Screenshot of Roblox profile with new display name\n"
-                "• Screenshot of community join request\n"
-                "• Send both screenshots in this ticket\n"
-                "```"
-            ),
-            inline=False
+        self.session = None
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.limiters = {
+            endpoint: TokenBucket(rate, burst)
+            for endpoint, (rate, burst) in ROBLOX_RATE_LIMITS.items()
+        }
+        self.retry_budget = RetryBudget(ROBLOX_RETRY_BUDGET_RATIO, ROBLOX_RETRY_BUDGET_MIN)
+        self.breakers = {
+            endpoint: CircuitBreaker(
+                endpoint,
+                ROBLOX_CIRCUIT_FAILURE_THRESHOLD,
+                ROBLOX_CIRCUIT_RESET_TIMEOUT,
+                ROBLOX_CIRCUIT_HALF_OPEN_PROBES,
+            )
+            for endpoint in ROBLOX_RATE_LIMITS
+        }
+        self.rate_limited = 0
+        self.retried = 0
+        self.dropped = 0
+
+    async def start(self):
+        """Open the session (no-op if it is already open)"""
+        if self.session is not None and not self.session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=ROBLOX_HTTP_POOL_LIMIT,
+            limit_per_host=ROBLOX_HTTP_LIMIT_PER_HOST,
+            ttl_dns_cache=ROBLOX_HTTP_DNS_CACHE_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=ROBLOX_HTTP_KEEPALIVE_TIMEOUT,
         )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "✨ Step 3: Follow Our TikTok\n"
-                "• Follow SENSE on TikTok\n"
-                "• Send screenshot proof of following\n"
-                "```"
-            ),
-            inline=False
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=ROBLOX_HTTP_CONNECT_TIMEOUT,
+            sock_read=ROBLOX_HTTP_READ_TIMEOUT,
         )
-        
-        embed.add_field(
-            name="",
-            value="🔗 [Follow on TikTok](https://www.tiktok.com/@makeseense?_t=ZS-8vqQi2vaX9c&_r=1)",
-            inline=False
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[trace_config],
         )
-        
-        embed.set_footer(text="Registration: Weekends only (Sat-Sun)")
-        embed.timestamp = discord.utils.utcnow()
-        
-        await interaction.response.edit_message(embed=embed, view=BackToMainView())
-    
-    @discord.ui.button(emoji="❓", style=discord.ButtonStyle.primary, row=0)
-    async def question_button(self, interaction: discord.Interaction, button: Button):
-        """FAQ Menu Button"""
-        embed = discord.Embed(
-            title="❓ Frequently Asked Questions",
-            description="Select a question below to get help! 💡\n",
-            color=COLOR_PRIMARY
+
+    async def close(self):
+        """Close the session and every pooled connection"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def _on_connection_created(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        self.connections_reused += 1
+
+    @contextlib.asynccontextmanager
+    async def request(self, method, url, **kwargs):
+        """Send a request through the shared pool and yield the response"""
+        if self.session is None or self.session.closed:
+            await self.start()
+
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            async with self.session.request(method, url, **kwargs) as response:
+                yield response
+        finally:
+            self.in_flight -= 1
+
+    async def fetch_json(self, endpoint, method, url, **kwargs):
+        """Rate-limited request with retries; returns the decoded JSON body
+
+        429 and 5xx responses (and network errors) are retried with jittered
+        exponential backoff, honouring Retry-After, while the retry budget
+        allows. Raises RobloxAPIError once the request is given up, or
+        RobloxClientError straight away for any other 4xx.
+        """
+        limiter = self.limiters[endpoint]
+        breaker = self.breakers[endpoint]
+        self.retry_budget.deposit()
+        attempt = 0
+
+        while True:
+            # Fail fast instead of queueing for a token we can't use
+            if breaker.is_open():
+                breaker.rejected += 1
+                raise RobloxUnavailableError(f"{endpoint} API circuit is open")
+            await limiter.acquire()
+            if not breaker.allow():
+                raise RobloxUnavailableError(f"{endpoint} API circuit is open")
+
+            retry_after = None
+            started = time.perf_counter()
+            status = "error"
+            try:
+                async with self.request(method, url, **kwargs) as response:
+                    status = str(response.status)
+                    if response.status == 200:
+                        data = await response.json()
+                        breaker.record_success()
+                        return data
+
+                    error = RobloxAPIError(f"{endpoint} API returned HTTP {response.status}")
+                    if response.status == 429:
+                        # Throttling is the limiter's job; Roblox is still answering
+                        self.rate_limited += 1
+                        breaker.release()
+                    elif response.status < 500:
+                        breaker.record_success()
+                        raise RobloxClientError(f"{endpoint} API rejected the request: HTTP {response.status}", response.status)
+                    else:
+                        breaker.record_failure()
+                    retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+                breaker.record_failure()
+            except BaseException:
+                # 4xx, cancellation or a bug: don't leave a half-open probe slot taken
+                breaker.release()
+                raise
+            finally:
+                roblox_request_latency.observe(time.perf_counter() - started, endpoint)
+                roblox_responses.inc(endpoint, status)
+
+            if attempt >= ROBLOX_MAX_RETRIES or not self.retry_budget.withdraw():
+                self.dropped += 1
+                raise RobloxAPIError(f"{endpoint} API gave up after {attempt + 1} attempt(s): {error}")
+
+            if retry_after is not None:
+                delay = min(retry_after, ROBLOX_RETRY_AFTER_MAX)
+                limiter.pause(delay)
+            else:
+                delay = random.uniform(0, min(ROBLOX_BACKOFF_MAX, ROBLOX_BACKOFF_BASE * 2 ** attempt))
+
+            attempt += 1
+            self.retried += 1
+            await asyncio.sleep(delay)
+
+    def is_available(self, *endpoints):
+        """False while any of the endpoints' circuits is refusing requests"""
+        return not any(self.breakers[endpoint].is_open() for endpoint in endpoints)
+
+    def limiter_stats(self):
+        """Return throttling / retry counters for every endpoint"""
+        return {
+            "endpoints": {endpoint: limiter.stats() for endpoint, limiter in self.limiters.items()},
+            "rate_limited": self.rate_limited,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "retry_budget": round(self.retry_budget.balance, 2),
+        }
+
+    def pool_stats(self):
+        """Return connection pool utilisation counters"""
+        opened = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "pool_limit": ROBLOX_HTTP_POOL_LIMIT,
+            "pool_limit_per_host": ROBLOX_HTTP_LIMIT_PER_HOST,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": self.connections_reused / opened if opened else 0.0,
+        }
+
+
+roblox_http = RobloxHTTPClient()
+
+
+# ============================================
+# CACHES
+# ============================================
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a per-entry TTL"""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=_MISSING):
+        """Return the cached value, or `default` if absent or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entry when full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop one entry; returns True if it was cached"""
+        return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss/eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+roblox_user_cache = TTLCache(ROBLOX_USER_CACHE_SIZE, ROBLOX_USER_CACHE_TTL)
+group_membership_cache = TTLCache(GROUP_MEMBERSHIP_CACHE_SIZE, GROUP_MEMBERSHIP_POSITIVE_TTL)
+member_lru = TTLCache(MEMBER_LRU_SIZE, MEMBER_LRU_TTL)
+
+
+async def get_or_fetch_member(guild, user_id):
+    """Return a member from the gateway cache, the small LRU, or the API"""
+    member = guild.get_member(user_id)
+    if member is not None:
+        return member
+
+    cache_key = (guild.id, user_id)
+    member = member_lru.get(cache_key)
+    if member is _MISSING:
+        member = await guild.fetch_member(user_id)
+        member_lru.set(cache_key, member)
+    return member
+
+
+# ============================================
+# USERNAME LOOKUP BATCHER
+# ============================================
+
+class UsernameBatcher:
+    """Coalesces concurrent username lookups into batched usernames/users POSTs"""
+
+    def __init__(self, window, max_batch):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}  # lowercase username -> [Future, ...]
+        self._flush_handle = None
+        self._tasks = set()
+        # While a send waits for a token or a response, new lookups join the
+        # next batch instead of starting their own POST
+        self._sending = 0
+        self.lookups = 0
+        self.batches_sent = 0
+        self.usernames_sent = 0
+
+    async def resolve(self, username):
+        """Return the user dict for `username`, or None if it does not exist"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(username.lower(), []).append(future)
+        self.lookups += 1
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None and not self._sending:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch):
+        payload = {"usernames": list(batch), "excludeBannedUsers": False}
+        self.batches_sent += 1
+        self.usernames_sent += len(batch)
+
+        self._sending += 1
+        try:
+            url = f"{ROBLOX_USERS_API}/v1/usernames/users"
+            data = await roblox_http.fetch_json("users", "POST", url, json=payload)
+        except Exception as e:
+            for waiters in batch.values():
+                for future in waiters:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        finally:
+            self._sending -= 1
+            # Lookups that queued up meanwhile have already waited their window
+            if not self._sending and self._pending:
+                self._flush()
+
+        found = {
+            user['requestedUsername'].lower(): user
+            for user in data.get('data', [])
+        }
+        for key, waiters in batch.items():
+            user_data = found.get(key)
+            for future in waiters:
+                if not future.done():
+                    future.set_result(user_data)
+
+    def stats(self):
+        """Return lookup vs. outbound request counters"""
+        return {
+            "lookups": self.lookups,
+            "batches_sent": self.batches_sent,
+            "usernames_sent": self.usernames_sent,
+            "avg_batch_size": self.usernames_sent / self.batches_sent if self.batches_sent else 0.0,
+        }
+
+
+username_batcher = UsernameBatcher(ROBLOX_USERNAME_BATCH_WINDOW, ROBLOX_USERNAME_BATCH_SIZE)
+
+
+# ============================================
+# ROBLOX API FUNCTIONS
+# ============================================
+
+ROBLOX_AT_USERNAME_RE = re.compile(r'@(\w+)')
+NON_WORD_RE = re.compile(r'[^\w\s]')
+
+
+def extract_roblox_username(display_name):
+    """Extract Roblox username from Discord display name (Bloxlink format)"""
+    # Try to find @username pattern
+    if '@' in display_name:
+        match = ROBLOX_AT_USERNAME_RE.search(display_name)
+        if match:
+            return match.group(1)
+    
+    # Try without @ symbol
+    words = NON_WORD_RE.sub('', display_name).split(None, 1)
+    return words[0] if words else None
+
+
+def extract_roblox_usernames(display_names):
+    """Batch form of extract_roblox_username; returns a list in the same order"""
+    search = ROBLOX_AT_USERNAME_RE.search
+    strip = NON_WORD_RE.sub
+    usernames = []
+    append = usernames.append
+    for display_name in display_names:
+        if '@' in display_name:
+            match = search(display_name)
+            if match:
+                append(match.group(1))
+                continue
+        words = strip('', display_name).split(None, 1)
+        append(words[0] if words else None)
+    return usernames
+
+
+async def get_roblox_user_by_username(username):
+    """Get Roblox user data from username (cached, including misses)
+
+    Raises RobloxAPIError if Roblox could not be asked (RobloxUnavailableError
+    while the users API circuit is open).
+    """
+    # Roblox usernames are case-insensitive
+    cache_key = username.lower()
+    cached = roblox_user_cache.get(cache_key)
+    if cached is not _MISSING:
+        return cached
+
+    try:
+        user_data = await username_batcher.resolve(username)
+    except RobloxUnavailableError:
+        raise
+    except RobloxAPIError as e:
+        # Not the same as "no such account" - let the caller decide
+        log.warning("Error getting Roblox user: %s", e)
+        raise
+    except Exception as e:
+        log.warning("Error getting Roblox user: %s", e)
+        return None
+
+    if user_data is None:
+        # Account not found - remember it for a shorter time
+        roblox_user_cache.set(cache_key, None, ttl=ROBLOX_USER_NEGATIVE_TTL)
+    else:
+        roblox_user_cache.set(cache_key, user_data)
+    return user_data
+
+
+async def check_group_membership_and_role(user_id, group_id, required_role):
+    """Check if user is in group with specific role (verdicts are cached)
+
+    Raises RobloxAPIError if Roblox could not be asked (RobloxUnavailableError
+    while the groups API circuit is open).
+    """
+    # The verdict depends on the required role, which differs between guilds
+    cache_key = (group_id, required_role, user_id)
+    cached = group_membership_cache.get(cache_key)
+    if cached is not _MISSING:
+        return cached
+
+    url = f"{ROBLOX_GROUPS_API}/v2/users/{user_id}/groups/roles"
+    
+    try:
+        data = await roblox_http.fetch_json("groups", "GET", url)
+        result = False, "Not in group"
+        for group in data.get('data', []):
+            if group['group']['id'] == group_id:
+                role_name = group['role']['name']
+                if role_name == required_role:
+                    result = True, role_name
+                else:
+                    result = False, f"Wrong role: {role_name}"
+                break
+
+        # Only the verdict is kept, never the full roles payload
+        ttl = GROUP_MEMBERSHIP_POSITIVE_TTL if result[0] else GROUP_MEMBERSHIP_NEGATIVE_TTL
+        group_membership_cache.set(cache_key, result, ttl=ttl)
+        return result
+    except RobloxUnavailableError:
+        raise
+    except RobloxAPIError as e:
+        log.warning("Error checking group: %s", e)
+        raise
+    except Exception as e:
+        log.warning("Error checking group: %s", e)
+    
+    return False, "API Error"
+
+
+async def resolve_roblox_users(usernames):
+    """Resolve many usernames at once; returns {lowercase username: user or None}"""
+    unique = list(dict.fromkeys(username.lower() for username in usernames))
+    resolved = {}
+    # Concurrent lookups are coalesced by the batcher into 100-name requests
+    for start in range(0, len(unique), RECONCILE_RESOLVE_CHUNK):
+        chunk = unique[start:start + RECONCILE_RESOLVE_CHUNK]
+        results = await asyncio.gather(*(get_roblox_user_by_username(name) for name in chunk))
+        resolved.update(zip(chunk, results))
+    return resolved
+
+
+def invalidate_group_membership(user_id, group_id, required_role):
+    """Forget the cached group verdict for one Roblox user"""
+    return group_membership_cache.invalidate((group_id, required_role, user_id))
+
+
+# ============================================
+# MEMBER IDENTITY INDEX
+# ============================================
+
+class MemberIdentity:
+    """Parsed Bloxlink username (and resolved Roblox account) for one member"""
+
+    __slots__ = ("display_name", "username", "explicit", "roblox_user", "resolved_at")
+
+    def __init__(self, display_name, username):
+        self.display_name = display_name
+        self.username = username
+        # True for "@username"; False for the loose first-word fallback
+        self.explicit = username is not None and f"@{username}" in display_name
+        self.roblox_user = None  # users.roblox.com user dict once resolved
+        self.resolved_at = None
+
+
+class MemberIdentityIndex:
+    """Per-guild member -> Roblox identity map, kept current from member events
+
+    Display names are parsed once when a member joins or renames, not on
+    every click. The resolved Roblox account is remembered alongside the
+    username and dropped as soon as the display name changes.
+    """
+
+    def __init__(self):
+        self._entries = {}  # (guild id, member id) -> MemberIdentity
+        self.parsed = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def update(self, member):
+        """(Re)parse a member's display name if it changed; returns their identity"""
+        key = (member.guild.id, member.id)
+        display_name = member.display_name
+        identity = self._entries.get(key)
+        if identity is None or identity.display_name != display_name:
+            identity = self._entries[key] = MemberIdentity(display_name, extract_roblox_username(display_name))
+            self.parsed += 1
+        return identity
+
+    def update_many(self, members):
+        """Index many members at once with one batched extraction pass"""
+        entries = self._entries
+        stale = []
+        for member in members:
+            identity = entries.get((member.guild.id, member.id))
+            if identity is None or identity.display_name != member.display_name:
+                stale.append(member)
+
+        display_names = [member.display_name for member in stale]
+        for member, display_name, username in zip(stale, display_names, extract_roblox_usernames(display_names)):
+            entries[(member.guild.id, member.id)] = MemberIdentity(display_name, username)
+        self.parsed += len(stale)
+        return len(stale)
+
+    def lookup(self, member):
+        """Identity for a member, parsing only if the index hasn't seen this name yet"""
+        identity = self._entries.get((member.guild.id, member.id))
+        if identity is not None and identity.display_name == member.display_name:
+            self.hits += 1
+            return identity
+        self.misses += 1
+        return self.update(member)
+
+    def remove(self, guild_id, member_id):
+        self._entries.pop((guild_id, member_id), None)
+
+    def remove_guild(self, guild_id):
+        for key in [key for key in self._entries if key[0] == guild_id]:
+            del self._entries[key]
+
+    async def resolve(self, identity):
+        """Roblox account for an identity, reusing the one stored on it while fresh"""
+        if identity.roblox_user is not None and time.monotonic() - identity.resolved_at < ROBLOX_USER_CACHE_TTL:
+            return identity.roblox_user
+        user_data = await get_roblox_user_by_username(identity.username)
+        if user_data is not None:
+            identity.roblox_user = user_data
+            identity.resolved_at = time.monotonic()
+        return user_data
+
+    async def resolve_many(self, identities):
+        """Resolve every identity still missing an account in one batched pass"""
+        now = time.monotonic()
+        pending = [
+            identity for identity in identities
+            if identity.username and (identity.roblox_user is None or now - identity.resolved_at >= ROBLOX_USER_CACHE_TTL)
+        ]
+        resolved = await resolve_roblox_users(identity.username for identity in pending)
+        now = time.monotonic()
+        for identity in pending:
+            user_data = resolved.get(identity.username.lower())
+            if user_data is not None:
+                identity.roblox_user = user_data
+                identity.resolved_at = now
+
+    async def warm(self, members):
+        """Index a guild's cached members in slices so the event loop keeps running"""
+        members = list(members)
+        for start in range(0, len(members), IDENTITY_WARM_CHUNK):
+            self.update_many(members[start:start + IDENTITY_WARM_CHUNK])
+            await asyncio.sleep(0)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "members": len(self._entries),
+            "parsed": self.parsed,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+member_identities = MemberIdentityIndex()
+
+
+@bot.listen('on_member_join')
+async def identity_member_join(member):
+    member_identities.update(member)
+
+
+@bot.listen('on_member_update')
+async def identity_member_update(before, after):
+    if before.display_name != after.display_name:
+        member_identities.update(after)
+
+
+@bot.listen('on_user_update')
+async def identity_user_update(before, after):
+    # A global name change renames the user in every guild without a nickname
+    if before.display_name != after.display_name:
+        for guild in after.mutual_guilds:
+            member = guild.get_member(after.id)
+            if member is not None:
+                member_identities.update(member)
+
+
+@bot.listen('on_member_remove')
+async def identity_member_remove(member):
+    member_identities.remove(member.guild.id, member.id)
+
+
+@bot.listen('on_guild_remove')
+async def identity_guild_remove(guild):
+    member_identities.remove_guild(guild.id)
+
+
+@bot.listen('on_guild_available')
+async def identity_guild_available(guild):
+    # In lean mode nothing is cached here; the index fills from interactions
+    await member_identities.warm(guild.members)
+
+
+# ============================================
+# GROUP ROSTER INDEX
+# ============================================
+
+class GroupRosterIndex:
+    """Local mirror of the Roblox user ids holding one role in one group
+
+    Kept fresh by `roster_refresh_loop`. Incremental refreshes walk the
+    newest-first role member pages until they reach ids already known; a
+    periodic full sync also picks up members who left. The index is
+    persisted as a compact binary snapshot so it survives restarts.
+    """
+
+    SNAPSHOT_MAGIC = b"SRI1"
+    # magic, group id, role id, synced_at, last_full_sync, member count
+    SNAPSHOT_HEADER = struct.Struct("<4sQQddI")
+
+    def __init__(self, group_id, role_name, snapshot_path):
+        self.group_id = group_id
+        self.role_name = role_name
+        self.snapshot_path = snapshot_path
+        self.role_id = None
+        self.member_count = None  # As reported by Roblox for the role
+        self.member_ids = set()
+        self.synced_at = None  # Wall-clock time of the last successful sync
+        self.last_full_sync = None
+        self.last_sync_kind = None
+        self.last_sync_duration = None
+        self.last_sync_pages = 0
+        self.sync_errors = 0
+        self._snapshot_mtime = None
+        self._lock = asyncio.Lock()
+
+    def __contains__(self, user_id):
+        return user_id in self.member_ids
+
+    def __len__(self):
+        return len(self.member_ids)
+
+    def is_fresh(self):
+        """Whether the index is recent enough to answer verifications"""
+        return self.synced_at is not None and time.time() - self.synced_at < ROSTER_STALE_AFTER
+
+    async def _fetch_role(self):
+        url = f"{ROBLOX_GROUPS_API}/v1/groups/{self.group_id}/roles"
+        data = await roblox_http.fetch_json("groups", "GET", url)
+        for role in data.get('roles', []):
+            if role['name'] == self.role_name:
+                return role
+        raise RobloxAPIError(f"Role {self.role_name!r} not found in group {self.group_id}")
+
+    async def _iter_pages(self, role_id):
+        url = f"{ROBLOX_GROUPS_API}/v1/groups/{self.group_id}/roles/{role_id}/users"
+        cursor = None
+        while True:
+            params = {"limit": ROSTER_PAGE_SIZE, "sortOrder": "Desc"}
+            if cursor:
+                params["cursor"] = cursor
+            data = await roblox_http.fetch_json("groups", "GET", url, params=params)
+            yield [member['userId'] for member in data.get('data', [])]
+
+            cursor = data.get('nextPageCursor')
+            if not cursor:
+                return
+
+    async def _walk(self, role_id, known=None):
+        """Collect role member ids; with `known`, stop at the first fully known page"""
+        member_ids = set(known) if known is not None else set()
+        pages = 0
+        async for page in self._iter_pages(role_id):
+            pages += 1
+            new_ids = [user_id for user_id in page if user_id not in member_ids]
+            member_ids.update(new_ids)
+            # Newest members come first, so a fully known page means we're caught up
+            if known is not None and not new_ids:
+                break
+        return member_ids, pages
+
+    async def sync(self, full=False):
+        """Refresh the index; falls back to a full sync when counts drift"""
+        async with self._lock:
+            started = time.perf_counter()
+            role = await self._fetch_role()
+
+            if role['id'] != self.role_id:
+                full = True
+            if self.last_full_sync is None or time.time() - self.last_full_sync >= ROSTER_FULL_SYNC_INTERVAL:
+                full = True
+
+            pages = 0
+            if not full:
+                member_ids, pages = await self._walk(role['id'], known=self.member_ids)
+                # Someone left or was demoted - only a full walk can find out who
+                if len(member_ids) != role.get('memberCount', len(member_ids)):
+                    full = True
+
+            if full:
+                member_ids, full_pages = await self._walk(role['id'])
+                pages += full_pages
+
+            self.role_id = role['id']
+            self.member_count = role.get('memberCount')
+            self.member_ids = member_ids
+            self.synced_at = time.time()
+            if full:
+                self.last_full_sync = self.synced_at
+            self.last_sync_kind = "full" if full else "incremental"
+            self.last_sync_duration = time.perf_counter() - started
+            self.last_sync_pages = pages
+
+        await self.save_snapshot()
+
+    def _write_snapshot(self, header, payload):
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(payload)
+        os.replace(tmp_path, self.snapshot_path)
+
+    async def save_snapshot(self):
+        """Write the index to disk without blocking the event loop"""
+        ids = array("Q", sorted(self.member_ids))
+        header = self.SNAPSHOT_HEADER.pack(
+            self.SNAPSHOT_MAGIC,
+            self.group_id,
+            self.role_id or 0,
+            self.synced_at or 0.0,
+            self.last_full_sync or 0.0,
+            len(ids),
+        )
+        await asyncio.to_thread(self._write_snapshot, header, ids.tobytes())
+
+    def _read_snapshot(self):
+        with open(self.snapshot_path, "rb") as f:
+            mtime = os.fstat(f.fileno()).st_mtime_ns
+            header = f.read(self.SNAPSHOT_HEADER.size)
+            magic, group_id, role_id, synced_at, last_full_sync, count = self.SNAPSHOT_HEADER.unpack(header)
+            ids = array("Q")
+            ids.frombytes(f.read(count * ids.itemsize))
+        return mtime, magic, group_id, role_id, synced_at, last_full_sync, ids
+
+    async def load_snapshot(self):
+        """Restore the index from disk; returns False if there is no usable snapshot"""
+        try:
+            mtime, magic, group_id, role_id, synced_at, last_full_sync, ids = await asyncio.to_thread(self._read_snapshot)
+        except (OSError, struct.error) as e:
+            if not isinstance(e, FileNotFoundError):
+                log.warning("Error loading roster snapshot: %s", e)
+            return False
+
+        if magic != self.SNAPSHOT_MAGIC or group_id != self.group_id:
+            return False
+
+        self._snapshot_mtime = mtime
+        self.role_id = role_id or None
+        self.member_ids = set(ids)
+        self.synced_at = synced_at or None
+        self.last_full_sync = last_full_sync or None
+        self.last_sync_kind = "snapshot"
+        return True
+
+    async def reload_if_changed(self):
+        """Pick up a snapshot written by another process (see IS_PRIMARY_PROCESS)"""
+        try:
+            mtime = (await asyncio.to_thread(os.stat, self.snapshot_path)).st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._snapshot_mtime:
+            return False
+        return await self.load_snapshot()
+
+    def stats(self):
+        """Return size, freshness and last sync timings"""
+        return {
+            "members": len(self.member_ids),
+            "fresh": self.is_fresh(),
+            "age_seconds": round(time.time() - self.synced_at, 1) if self.synced_at else None,
+            "last_sync_kind": self.last_sync_kind,
+            "last_sync_seconds": round(self.last_sync_duration, 3) if self.last_sync_duration is not None else None,
+            "last_sync_pages": self.last_sync_pages,
+            "sync_errors": self.sync_errors,
+        }
+
+
+class GroupRosterRegistry:
+    """One GroupRosterIndex per (group, role) that some guild verifies against"""
+
+    def __init__(self, snapshot_dir):
+        self.snapshot_dir = snapshot_dir
+        self._indexes = {}  # (group id, role name) -> GroupRosterIndex
+
+    def __iter__(self):
+        return iter(list(self._indexes.values()))
+
+    def _snapshot_path(self, group_id, role_name):
+        role_hash = hashlib.sha1(role_name.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.snapshot_dir, f"roster_{group_id}_{role_hash}.bin")
+
+    def get(self, group_id, role_name):
+        index = self._indexes.get((group_id, role_name))
+        if index is None:
+            index = self._indexes[(group_id, role_name)] = GroupRosterIndex(
+                group_id, role_name, self._snapshot_path(group_id, role_name)
+            )
+        return index
+
+    def retain(self, keys):
+        """Keep exactly the indexes for `keys`; returns the ones just created"""
+        keys = set(keys)
+        for key in list(self._indexes):
+            if key not in keys:
+                del self._indexes[key]
+        added = [key for key in keys if key not in self._indexes]
+        return [self.get(*key) for key in added]
+
+
+group_rosters = GroupRosterRegistry(ROSTER_SNAPSHOT_DIR)
+
+
+@tasks.loop(seconds=ROSTER_REFRESH_INTERVAL if IS_PRIMARY_PROCESS else ROSTER_RELOAD_INTERVAL)
+async def roster_refresh_loop():
+    """Keep every group roster index in sync with Roblox"""
+    for roster in group_rosters:
+        try:
+            if IS_PRIMARY_PROCESS:
+                await roster.sync()
+            else:
+                # Other shard processes share the primary's snapshot instead of
+                # walking the roster themselves
+                await roster.reload_if_changed()
+        except Exception as e:
+            roster.sync_errors += 1
+            log.warning("Error syncing roster of group %s: %s", roster.group_id, e)
+
+
+# ============================================
+# GUILD CONFIGURATION
+# ============================================
+
+@dataclass(frozen=True)
+class GuildConfig:
+    """Settings for one guild, as written in GUILD_CONFIG_PATH"""
+    roblox_group_id: int
+    required_role_name: str
+    verified_role_id: int
+    staff_role_id: int
+    ticket_category_id: int
+    ticket_channel_prefix: str
+    staff_channel_id: int = None  # Staff request digests (None = ping in the ticket)
+    transcript_channel_id: int = None  # Transcript uploads (None = archive directory only)
+
+    @classmethod
+    def from_dict(cls, data, base):
+        """`base` with the keys in `data` replaced; raises ValueError on bad input"""
+        if not isinstance(data, dict):
+            raise ValueError("expected an object of settings")
+        values = dataclasses.asdict(base)
+        for field in dataclasses.fields(cls):
+            if field.name not in data:
+                continue
+            value = data[field.name]
+            optional = field.default is None
+            if not (value is None and optional) and (type(value) is not field.type):
+                raise ValueError(f"{field.name} must be {'null or ' if optional else ''}{field.type.__name__}")
+            values[field.name] = value
+        unknown = set(data) - set(values)
+        if unknown:
+            raise ValueError(f"unknown setting(s): {', '.join(sorted(unknown))}")
+        return cls(**values)
+
+
+DEFAULT_GUILD_CONFIG = GuildConfig(
+    roblox_group_id=ROBLOX_GROUP_ID,
+    required_role_name=REQUIRED_ROLE_NAME,
+    verified_role_id=DISCORD_VERIFIED_ROLE_ID,
+    staff_role_id=ATTUNED_SOUL_ROLE_ID,
+    ticket_category_id=TICKET_CATEGORY_ID,
+    ticket_channel_prefix=TICKET_CHANNEL_PREFIX,
+    staff_channel_id=STAFF_NOTIFICATION_CHANNEL_ID,
+    transcript_channel_id=TRANSCRIPT_CHANNEL_ID,
+)
+
+
+class GuildSettings:
+    """A guild's config with its roles, channels and roster already looked up"""
+
+    __slots__ = (
+        "guild_id", "config", "ticket_prefix", "verified_role", "staff_role",
+        "ticket_category", "staff_channel", "transcript_channel", "roster", "embed_values",
+    )
+
+    def __init__(self, guild, config, roster):
+        self.guild_id = guild.id
+        self.config = config
+        self.ticket_prefix = config.ticket_channel_prefix.lower()
+        self.verified_role = guild.get_role(config.verified_role_id)
+        self.staff_role = guild.get_role(config.staff_role_id)
+        self.ticket_category = guild.get_channel(config.ticket_category_id)
+        self.staff_channel = guild.get_channel(config.staff_channel_id) if config.staff_channel_id else None
+        self.transcript_channel = guild.get_channel(config.transcript_channel_id) if config.transcript_channel_id else None
+        self.roster = roster
+        # Placeholder values for the menu embeds that describe the guild's group
+        self.embed_values = {
+            "group_url": f"https://www.roblox.com/communities/{config.roblox_group_id}/about",
+            "required_role": config.required_role_name,
+        }
+
+    @property
+    def staff_mention(self):
+        return self.staff_role.mention if self.staff_role else '@Attuned Soul'
+
+    def is_ticket_channel(self, channel):
+        return channel.category_id == self.config.ticket_category_id and self.ticket_prefix in channel.name.lower()
+
+    def references(self, object_id):
+        """Whether a role or channel id is one this guild's settings point at"""
+        config = self.config
+        return object_id in (
+            config.verified_role_id, config.staff_role_id, config.ticket_category_id,
+            config.staff_channel_id, config.transcript_channel_id,
+        )
+
+
+class GuildConfigRegistry:
+    """Per-guild settings loaded from a JSON file, resolved once per guild
+
+    The file looks like:
+
+        {"defaults": {...}, "guilds": {"<guild id>": {...}, ...}}
+
+    Every entry overrides DEFAULT_GUILD_CONFIG key by key; "defaults" also
+    applies to guilds without an entry, and setting it to null leaves
+    those guilds unserved. Without a file every guild gets the defaults.
+
+    `get()` is one dict lookup once a guild has been resolved. Resolved
+    settings are dropped when the file changes or when one of the roles or
+    channels they point at is created, updated or deleted, and rebuilt on
+    next use (so a role created after the first lookup is picked up).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.defaults = DEFAULT_GUILD_CONFIG  # None: guilds without an entry are not served
+        self.configs = {}  # guild id -> GuildConfig
+        self._settings = {}  # guild id -> GuildSettings
+        self._mtime = None
+        self.loads = 0
+        self.load_errors = 0
+        self.resolves = 0
+        self.invalidations = 0
+
+    def get(self, guild):
+        """Settings for a guild, or None if it isn't configured"""
+        settings = self._settings.get(guild.id)
+        if settings is None:
+            config = self.configs.get(guild.id, self.defaults)
+            if config is None:
+                return None
+            roster = group_rosters.get(config.roblox_group_id, config.required_role_name)
+            settings = self._settings[guild.id] = GuildSettings(guild, config, roster)
+            self.resolves += 1
+        return settings
+
+    def invalidate(self, guild_id, object_id=None):
+        """Drop a guild's resolved settings (only if they use `object_id`, when given)"""
+        settings = self._settings.get(guild_id)
+        if settings is not None and (object_id is None or settings.references(object_id)):
+            del self._settings[guild_id]
+            self.invalidations += 1
+
+    def _read(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None, None
+        with open(self.path, encoding="utf-8") as f:
+            return mtime, f.read()
+
+    @staticmethod
+    def _parse(text):
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise ValueError("expected an object with \"defaults\" and \"guilds\"")
+        defaults = data.get("defaults", {})
+        if defaults is not None:
+            defaults = GuildConfig.from_dict(defaults, DEFAULT_GUILD_CONFIG)
+        configs = {}
+        guilds = data.get("guilds", {})
+        if not isinstance(guilds, dict):
+            raise ValueError("\"guilds\" must map guild ids to settings")
+        for guild_id, entry in guilds.items():
+            try:
+                configs[int(guild_id)] = GuildConfig.from_dict(entry, defaults or DEFAULT_GUILD_CONFIG)
+            except ValueError as e:
+                raise ValueError(f"guild {guild_id}: {e}") from None
+        return defaults, configs
+
+    async def load(self):
+        """(Re)read the file; a broken file keeps the current settings"""
+        try:
+            mtime, text = await asyncio.to_thread(self._read)
+        except OSError as e:
+            self.load_errors += 1
+            log.error("Error reading guild config %s: %s", self.path, e)
+            return False
+        try:
+            defaults, configs = self._parse(text) if text is not None else (DEFAULT_GUILD_CONFIG, {})
+        except ValueError as e:
+            # Not retried until the file is edited again
+            self._mtime = mtime
+            self.load_errors += 1
+            log.error("Error loading guild config %s: %s", self.path, e)
+            return False
+
+        self._mtime = mtime
+        self.defaults = defaults
+        self.configs = configs
+        self._settings.clear()
+        self.loads += 1
+
+        added = group_rosters.retain(self.roster_keys())
+        for roster in added:
+            await roster.load_snapshot()
+        log.info("Loaded guild config", extra={
+            "path": self.path,
+            "guilds": len(configs),
+            "serves_unlisted": defaults is not None,
+            "rosters": len(added),
+        })
+        return True
+
+    async def reload_if_changed(self):
+        try:
+            mtime = (await asyncio.to_thread(os.stat, self.path)).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return False
+        return await self.load()
+
+    def roster_keys(self):
+        """Every (group id, role name) a configured guild verifies against"""
+        configs = list(self.configs.values())
+        if self.defaults is not None:
+            configs.append(self.defaults)
+        return {(config.roblox_group_id, config.required_role_name) for config in configs}
+
+    def stats(self):
+        return {
+            "guilds": len(self.configs),
+            "serves_unlisted": self.defaults is not None,
+            "resolved": len(self._settings),
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "resolves": self.resolves,
+            "invalidations": self.invalidations,
+        }
+
+
+guild_configs = GuildConfigRegistry(GUILD_CONFIG_PATH)
+
+
+@tasks.loop(seconds=GUILD_CONFIG_RELOAD_INTERVAL)
+async def guild_config_reload_loop():
+    """Apply edits to the guild config file without a restart"""
+    await guild_configs.reload_if_changed()
+
+
+@bot.listen('on_guild_available')
+async def guild_config_guild_available(guild):
+    # After a fresh identify the guild's roles and channels are new objects
+    guild_configs.invalidate(guild.id)
+
+
+# A role or channel created after a guild was resolved (or changed since)
+# must not stay cached as missing or stale
+@bot.listen('on_guild_role_create')
+async def guild_config_role_create(role):
+    guild_configs.invalidate(role.guild.id, role.id)
+
+
+@bot.listen('on_guild_role_update')
+async def guild_config_role_update(before, after):
+    guild_configs.invalidate(after.guild.id, after.id)
+
+
+@bot.listen('on_guild_role_delete')
+async def guild_config_role_delete(role):
+    guild_configs.invalidate(role.guild.id, role.id)
+
+
+@bot.listen('on_guild_channel_create')
+async def guild_config_channel_create(channel):
+    guild_configs.invalidate(channel.guild.id, channel.id)
+
+
+@bot.listen('on_guild_channel_update')
+async def guild_config_channel_update(before, after):
+    guild_configs.invalidate(after.guild.id, after.id)
+
+
+@bot.listen('on_guild_channel_delete')
+async def guild_config_channel_delete(channel):
+    guild_configs.invalidate(channel.guild.id, channel.id)
+
+
+@bot.listen('on_guild_remove')
+async def guild_config_guild_remove(guild):
+    guild_configs.invalidate(guild.id)
+
+
+# ============================================
+# VERIFICATION STORE
+# ============================================
+
+# Schema migrations, applied in order; PRAGMA user_version records how many ran
+DATABASE_MIGRATIONS = [
+    """
+    CREATE TABLE verifications (
+        discord_id INTEGER NOT NULL,
+        group_id INTEGER NOT NULL,
+        roblox_id INTEGER NOT NULL,
+        roblox_name TEXT NOT NULL,
+        roblox_display_name TEXT NOT NULL,
+        group_role TEXT,
+        verified_at REAL,
+        last_checked REAL NOT NULL,
+        PRIMARY KEY (discord_id, group_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX verifications_roblox_id ON verifications (roblox_id);
+    """,
+    """
+    CREATE TABLE tickets (
+        channel_id INTEGER PRIMARY KEY,
+        guild_id INTEGER NOT NULL,
+        closed_at REAL NOT NULL,
+        closed_by INTEGER,
+        reason TEXT NOT NULL,
+        delete_after REAL NOT NULL,
+        archived_at REAL,
+        reaped_at REAL
+    );
+    CREATE INDEX tickets_unreaped ON tickets (delete_after) WHERE reaped_at IS NULL;
+    """,
+    # A pass only holds for the role a guild requires, so it is part of the
+    # key. Failed checks can't be attributed to a required role; they are
+    # dropped and re-recorded by the member's next check.
+    """
+    CREATE TABLE verifications_by_role (
+        discord_id INTEGER NOT NULL,
+        group_id INTEGER NOT NULL,
+        required_role TEXT NOT NULL,
+        roblox_id INTEGER NOT NULL,
+        roblox_name TEXT NOT NULL,
+        roblox_display_name TEXT NOT NULL,
+        group_role TEXT,
+        verified_at REAL,
+        last_checked REAL NOT NULL,
+        PRIMARY KEY (discord_id, group_id, required_role)
+    ) WITHOUT ROWID;
+    INSERT INTO verifications_by_role
+        SELECT discord_id, group_id, group_role, roblox_id, roblox_name, roblox_display_name,
+            group_role, verified_at, last_checked
+        FROM verifications
+        WHERE verified_at IS NOT NULL AND group_role IS NOT NULL;
+    DROP TABLE verifications;
+    ALTER TABLE verifications_by_role RENAME TO verifications;
+    CREATE INDEX verifications_roblox_id ON verifications (roblox_id);
+    """,
+]
+
+
+@dataclass
+class StoredVerification:
+    """Last known verification outcome for one member, group and required role"""
+    discord_id: int
+    group_id: int
+    required_role: str
+    roblox_id: int
+    roblox_name: str
+    roblox_display_name: str
+    group_role: str
+    verified_at: float  # First passed check (None if the last check failed)
+    last_checked: float
+
+    def row(self):
+        return (
+            self.discord_id, self.group_id, self.required_role, self.roblox_id, self.roblox_name,
+            self.roblox_display_name, self.group_role, self.verified_at, self.last_checked,
+        )
+
+    def user_data(self):
+        """The users.roblox.com fields the verification embed needs"""
+        return {"id": self.roblox_id, "name": self.roblox_name, "displayName": self.roblox_display_name}
+
+    def reusable_for(self, roblox_username, now=None):
+        """Whether a recent pass for this same Roblox account can skip the checks"""
+        now = time.time() if now is None else now
+        return (
+            self.verified_at is not None
+            and now - self.last_checked < VERIFICATION_REUSE_TTL
+            and self.roblox_name.lower() == roblox_username.lower()
+        )
+
+
+class SQLiteStore:
+    """Connection to the shared SQLite (WAL) database on a dedicated thread
+
+    Every store opens its own connection, used only from its own thread.
+    Opening applies any DATABASE_MIGRATIONS the file hasn't seen yet.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._executor = None
+        self._conn = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL stays consistent on a crash; at worst the last flush is lost
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+
+        # BEGIN IMMEDIATE serialises stores migrating the same file at once
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, migration in enumerate(DATABASE_MIGRATIONS[version:], start=version + 1):
+                for statement in migration.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {number}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._conn = conn
+
+    async def open(self):
+        """Open (creating or migrating) the database on the store's own thread"""
+        if self._executor is not None:
+            return
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="sense-db")
+        await self._run(self._open)
+
+    async def close(self):
+        if self._executor is None:
+            return
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self._conn = None
+
+    def _transaction(self, statements):
+        """Run [(sql, rows)] with executemany in one transaction"""
+        self._conn.execute("BEGIN")
+        try:
+            for sql, rows in statements:
+                if rows:
+                    self._conn.executemany(sql, rows)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+
+class VerificationStore(SQLiteStore):
+    """SQLite record of verification results that survives restarts
+
+    Writes are queued in memory (coalesced per member), then flushed as one
+    transaction every VERIFICATION_WRITE_INTERVAL seconds or once
+    VERIFICATION_WRITE_BATCH are queued; lookups see queued writes before
+    they reach the database.
+    """
+
+    UPSERT = """
+        INSERT INTO verifications
+            (discord_id, group_id, required_role, roblox_id, roblox_name, roblox_display_name,
+             group_role, verified_at, last_checked)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (discord_id, group_id, required_role) DO UPDATE SET
+            roblox_id = excluded.roblox_id,
+            roblox_name = excluded.roblox_name,
+            roblox_display_name = excluded.roblox_display_name,
+            group_role = excluded.group_role,
+            verified_at = CASE
+                WHEN excluded.verified_at IS NULL THEN NULL
+                WHEN verifications.roblox_id = excluded.roblox_id THEN COALESCE(verifications.verified_at, excluded.verified_at)
+                ELSE excluded.verified_at
+            END,
+            last_checked = excluded.last_checked
+    """
+    DELETE = "DELETE FROM verifications WHERE discord_id = ? AND group_id = ? AND required_role = ?"
+    SELECT = "SELECT * FROM verifications WHERE discord_id = ? AND group_id = ? AND required_role = ?"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._pending = {}  # (discord id, group id, required role) -> StoredVerification, or None to delete
+        self._flushing = {}  # Batch currently being written
+        self._flush_handle = None
+        self._flush_task = None
+        self.lookups = 0
+        self.found = 0
+        self.writes = 0
+        self.rows_flushed = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.last_flush_seconds = None
+
+    async def close(self):
+        """Flush queued writes and close the database"""
+        if self._executor is None:
+            return
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None:
+            await self._flush_task
+        await self.flush()
+        await super().close()
+
+    def _select(self, key):
+        row = self._conn.execute(self.SELECT, key).fetchone()
+        return StoredVerification(*row) if row else None
+
+    async def get(self, discord_id, group_id, required_role):
+        """Stored result for a member checked against `required_role`, or None"""
+        self.lookups += 1
+        key = (discord_id, group_id, required_role)
+        if key in self._pending:
+            record = self._pending[key]
+        elif key in self._flushing:
+            record = self._flushing[key]
+        elif self._executor is None:
+            return None
+        else:
+            record = await self._run(self._select, key)
+        if record is not None:
+            self.found += 1
+        return record
+
+    def record(self, discord_id, group_id, required_role, user_data, verified, group_role):
+        """Queue the outcome of a full verification check"""
+        now = time.time()
+        key = (discord_id, group_id, required_role)
+        self._queue(key, StoredVerification(
+            discord_id,
+            group_id,
+            required_role,
+            user_data['id'],
+            user_data['name'],
+            user_data.get('displayName') or user_data['name'],
+            group_role,
+            now if verified else None,
+            now,
+        ))
+
+    def forget(self, discord_id, group_id, required_role):
+        """Queue removal of a member's stored result"""
+        self._queue((discord_id, group_id, required_role), None)
+
+    def _queue(self, key, record):
+        self._pending[key] = record
+        self.writes += 1
+        if self._executor is None:
+            return
+        if len(self._pending) >= VERIFICATION_WRITE_BATCH:
+            self._schedule_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(VERIFICATION_WRITE_INTERVAL, self._schedule_flush)
+
+    def _schedule_flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self):
+        """Write every queued change in one transaction"""
+        while self._pending and self._executor is not None:
+            batch, self._pending = self._pending, {}
+            self._flushing = batch
+            upserts = [record.row() for record in batch.values() if record is not None]
+            deletes = [key for key, record in batch.items() if record is None]
+            started = time.perf_counter()
+            try:
+                await self._run(self._transaction, [(self.UPSERT, upserts), (self.DELETE, deletes)])
+            except sqlite3.Error:
+                self.flush_errors += 1
+                log.exception("Error writing %d verification record(s)", len(batch))
+                # Keep them for the next flush unless newer writes replaced them
+                for key, record in batch.items():
+                    self._pending.setdefault(key, record)
+                return
+            finally:
+                self._flushing = {}
+            self.flushes += 1
+            self.rows_flushed += len(batch)
+            self.last_flush_seconds = time.perf_counter() - started
+
+    def stats(self):
+        return {
+            "pending": len(self._pending),
+            "lookups": self.lookups,
+            "found": self.found,
+            "writes": self.writes,
+            "rows_flushed": self.rows_flushed,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "last_flush_ms": round(self.last_flush_seconds * 1000, 2) if self.last_flush_seconds is not None else None,
+        }
+
+
+verification_store = VerificationStore(DATABASE_PATH)
+
+
+# ============================================
+# VERIFICATION PIPELINE
+# ============================================
+
+class SingleFlight:
+    """Lets concurrent callers with the same key share one in-flight call"""
+
+    def __init__(self):
+        self._calls = {}
+        self.started = 0
+        self.shared = 0
+
+    async def run(self, key, func, *args):
+        """Await `func(*args)`, joining an identical call that is already running"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(func(*args))
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.started += 1
+        else:
+            self.shared += 1
+
+        # Shield so one caller being cancelled doesn't cancel the others
+        return await asyncio.shield(task)
+
+    def stats(self):
+        return {"in_flight": len(self._calls), "started": self.started, "shared": self.shared}
+
+
+roblox_check_flight = SingleFlight()  # keyed by (Roblox user id, group id, role name)
+
+
+@dataclass
+class VerificationResult:
+    """Outcome of one verification run, shared by every waiting interaction"""
+    status: str  # no_username | not_found | verified | failed | role_error | config_error | unavailable | error
+    roblox_username: str = None
+    user_data: dict = None
+    role_info: str = None
+    role: discord.Role = None
+    error: str = None
+    group_id: int = None  # Group and role the member was checked against
+    required_role: str = None
+
+
+async def verify_member(member):
+    """Run the full verification chain for one member and grant the role"""
+    settings = guild_configs.get(member.guild)
+    if settings is None:
+        return VerificationResult("config_error")
+    group_id = settings.config.roblox_group_id
+    required_role = settings.config.required_role_name
+
+    identity = member_identities.lookup(member)
+    roblox_username = identity.username
+    if not roblox_username:
+        return VerificationResult("no_username")
+
+    stored = await verification_store.get(member.id, group_id, required_role)
+    if stored is not None and stored.reusable_for(roblox_username):
+        # Recently passed with this same account - skip every Roblox call
+        verification_short_circuits.inc()
+        user_data, is_verified, role_info = stored.user_data(), True, stored.group_role
+    else:
+        user_data = None
+        try:
+            user_data = await member_identities.resolve(identity)
+            if not user_data:
+                return VerificationResult("not_found", roblox_username=roblox_username)
+
+            user_id = user_data['id']
+            if settings.roster.is_fresh() and user_id in settings.roster:
+                # Answered from the local roster - no group API call needed
+                is_verified, role_info = True, required_role
+            else:
+                is_verified, role_info = await roblox_check_flight.run(
+                    (user_id, group_id, required_role),
+                    check_group_membership_and_role,
+                    user_id,
+                    group_id,
+                    required_role
+                )
+        except RobloxClientError as e:
+            # Roblox answered and refused: a plain failure that a retry won't fix
+            if user_data is None:
+                return VerificationResult("not_found", roblox_username=roblox_username)
+            return VerificationResult(
+                "failed", roblox_username, user_data, f"Roblox rejected the check (HTTP {e.status})",
+                group_id=group_id, required_role=required_role
+            )
+        except RobloxAPIError:
+            # Roblox is down (or its circuit is open): answer now, retry later
+            return VerificationResult("unavailable", roblox_username=roblox_username)
+
+        if role_info != "API Error":
+            verification_store.record(member.id, group_id, required_role, user_data, is_verified, role_info)
+
+    if not is_verified:
+        return VerificationResult(
+            "failed", roblox_username, user_data, role_info, group_id=group_id, required_role=required_role
+        )
+
+    role = settings.verified_role
+    if not role:
+        return VerificationResult("config_error", roblox_username, user_data, role_info)
+
+    try:
+        if role not in member.roles:
+            await member.add_roles(role)
+    except Exception as e:
+        return VerificationResult("role_error", roblox_username, user_data, role_info, role, str(e))
+
+    return VerificationResult("verified", roblox_username, user_data, role_info, role)
+
+
+def build_verification_embed(result, will_retry=False):
+    """Build the ephemeral followup embed for a verification result"""
+    if result.status == "unavailable":
+        if will_retry:
+            next_step = (
+                "You don't need to do anything - I'll retry automatically and "
+                "post your result here as soon as Roblox is reachable again."
+            )
+        else:
+            next_step = "Please click **Request Attuned Soul** again in a few minutes."
+        return discord.Embed(
+            title="⏳ Verification Temporarily Unavailable",
+            description=(
+                "Roblox isn't responding right now, so I couldn't check your group membership.\n\n"
+                + next_step
+            ),
+            color=COLOR_WARNING
+        )
+
+    if result.status == "no_username":
+        return discord.Embed(
+            title="❌ Cannot Find Roblox Username",
+            description=(
+                "I couldn't find your Roblox username in your Discord name.\n\n"
+                "**Please make sure:**\n"
+                "• You've linked your Roblox account with Bloxlink\n"
+                "• Your Discord nickname shows your Roblox username\n"
+                "• Example: `@uppucs` or `uppucs`\n\n"
+                "💡 Use `/verify` command with Bloxlink to link your account."
+            ),
+            color=COLOR_DANGER
+        )
+
+    if result.status == "not_found":
+        return discord.Embed(
+            title="❌ Roblox Account Not Found",
+            description=(
+                f"Couldn't find Roblox account: `{result.roblox_username}`\n\n"
+                "**Please check:**\n"
+                "• Your Discord name matches your Roblox username\n"
+                "• You've linked with Bloxlink correctly\n"
+                "• The username is spelled correctly"
+            ),
+            color=COLOR_DANGER
+        )
+
+    if result.status == "config_error":
+        return discord.Embed(
+            title="⚠️ Configuration Error",
+            description="Attuned Soul role not found. Please contact staff.",
+            color=COLOR_DANGER
+        )
+
+    if result.status == "role_error":
+        return discord.Embed(
+            title="⚠️ Role Error",
+            description=f"Verification passed but couldn't give role: {result.error}",
+            color=COLOR_DANGER
+        )
+
+    if result.status == "error":
+        return discord.Embed(
+            title="⚠️ Verification Error",
+            description="Something went wrong while checking your verification. Please try again or contact staff.",
+            color=COLOR_DANGER
+        )
+
+    user_data = result.user_data
+    thumbnail_url = f"https://www.roblox.com/headshot-thumbnail/image?userId={user_data['id']}&width=150&height=150&format=png"
+
+    if result.status == "verified":
+        embed = discord.Embed(
+            title="✅ Verification Successful!",
+            description=(
+                f"**Welcome to SENSE, {user_data['displayName']}!** 💚\n\n"
+                f"You've been verified and given the Attuned Soul role!"
+            ),
+            color=COLOR_SUCCESS
+        )
+        
+        embed.add_field(
+            name="✅ Verified Information:",
+            value=(
+                f"**Roblox Username:** {user_data['name']}\n"
+                f"**Roblox Display Name:** {user_data['displayName']}\n"
+                f"**Group Role:** {result.role_info}\n"
+                f"**Discord Role:** {result.role.mention}"
+            ),
+            inline=False
+        )
+        
+        embed.set_thumbnail(url=thumbnail_url)
+        embed.set_footer(text="Verification completed successfully!")
+        embed.timestamp = discord.utils.utcnow()
+        return embed
+
+    # FAILED - Show reason
+    embed = discord.Embed(
+        title="❌ Verification Failed",
+        description=(
+            f"**Roblox Account:** {user_data['displayName']} (@{user_data['name']})\n"
+            f"**Reason:** {result.role_info}\n\n"
+            "**Requirements:**\n"
+            "✅ Must join the community's Roblox group\n"
+            f"✅ Must have role: **{result.required_role}**\n\n"
+            f"🔗 [Join Group Here](https://www.roblox.com/communities/{result.group_id}/about)"
+        ),
+        color=COLOR_DANGER
+    )
+    
+    embed.set_thumbnail(url=thumbnail_url)
+    embed.set_footer(text="Join the group with correct role and try again!")
+    embed.timestamp = discord.utils.utcnow()
+    return embed
+
+
+
+@dataclass
+class VerificationJob:
+    """One queued verification; every click by the same member awaits the same job"""
+    key: tuple  # (guild id, Discord user id)
+    member: discord.Member
+    seq: int
+    submitted_at: float
+    future: asyncio.Future
+    interaction_id: int = None
+    channel_id: int = None
+
+
+class VerificationQueue:
+    """Bounded FIFO of verification jobs served by a fixed pool of workers
+
+    Caps how many verifications (and so Roblox calls and role edits) run at
+    once regardless of how many members click. A member's repeated clicks
+    join their job that is already queued or running. When the queue is
+    full, `submit` returns None so the click can be answered with "busy".
+    """
+
+    def __init__(self, workers=VERIFICATION_WORKERS, maxsize=VERIFICATION_QUEUE_SIZE):
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize)
+        self._jobs = {}  # key -> VerificationJob (queued or running)
+        self._tasks = []
+        self._next_seq = 0
+        self._started_seq = 0  # seq of the newest job a worker has picked up
+        self.in_progress = 0
+        self.wait_times = deque(maxlen=VERIFICATION_LATENCY_SAMPLES)
+        self.service_times = deque(maxlen=VERIFICATION_LATENCY_SAMPLES)
+        self.submitted = 0
+        self.joined = 0
+        self.shed = 0
+        self.completed = 0
+        self.failed = 0
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self._jobs.values():
+            if not job.future.done():
+                job.future.cancel()
+        self._jobs.clear()
+
+    def submit(self, interaction):
+        """Queue a verification for the interaction's member; returns the job, or None if full"""
+        key = (interaction.guild.id, interaction.user.id)
+        job = self._jobs.get(key)
+        if job is not None:
+            self.joined += 1
+            return job
+
+        self._next_seq += 1
+        job = VerificationJob(
+            key,
+            interaction.user,
+            self._next_seq,
+            time.monotonic(),
+            asyncio.get_running_loop().create_future(),
+            interaction.id,
+            interaction.channel_id,
+        )
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.shed += 1
+            return None
+        self._jobs[key] = job
+        self.submitted += 1
+        return job
+
+    def position(self, job):
+        """1-based place in line (0 once a worker has started on it)"""
+        return max(0, job.seq - self._started_seq)
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            self._started_seq = max(self._started_seq, job.seq)
+            started = time.monotonic()
+            wait = started - job.submitted_at
+            self.wait_times.append(wait)
+            verification_wait.observe(wait)
+            self.in_progress += 1
+            try:
+                with log_context(job.interaction_id, job.channel_id):
+                    result = await verify_member(job.member)
+                if not job.future.done():
+                    job.future.set_result(result)
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+            finally:
+                service = time.monotonic() - started
+                self.service_times.append(service)
+                verification_service.observe(service)
+                self.in_progress -= 1
+                self._jobs.pop(job.key, None)
+                self.queue.task_done()
+
+    def stats(self):
+        """Return queue depth, load shedding and wait/service percentiles"""
+        stats = {
+            "queued": self.queue.qsize(),
+            "in_progress": self.in_progress,
+            "workers": self.workers,
+            "capacity": self.queue.maxsize,
+            "submitted": self.submitted,
+            "joined": self.joined,
+            "shed": self.shed,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+        for name, samples in (("wait", self.wait_times), ("service", self.service_times)):
+            for label, fraction in (("p50", 0.50), ("p99", 0.99)):
+                value = _percentile(samples, fraction)
+                stats[f"{name}_{label}"] = round(value, 3) if value is not None else None
+        return stats
+
+
+verification_queue = VerificationQueue()
+
+
+def build_verification_queued_embed(position):
+    return discord.Embed(
+        title="⏳ Verification Queued",
+        description=(
+            f"You're **#{max(position, 1)}** in line.\n\n"
+            "This message will update with your result in a moment."
+        ),
+        color=COLOR_WARNING
+    )
+
+
+def build_verification_busy_embed():
+    return discord.Embed(
+        title="🚦 Verification Busy",
+        description=(
+            "Lots of members are verifying right now, so I can't take another request yet.\n\n"
+            "Please click **Request Attuned Soul** again in a minute."
+        ),
+        color=COLOR_WARNING
+    )
+
+
+class VerificationRetryQueue:
+    """Members whose verification hit an open Roblox circuit, retried once it recovers
+
+    Results are posted as a followup on the original interaction, so an
+    entry is only useful while that interaction's token is still valid.
+    The oldest waiting member is retried first and doubles as the probe:
+    if Roblox is still down, everyone keeps waiting for the next round.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()  # (guild id, member id) -> (interaction, queued_at)
+        self.queued = 0
+        self.completed = 0
+        self.expired = 0
+        self.rejected = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, interaction):
+        """Queue a retry; returns False if the queue is full"""
+        key = (interaction.guild.id, interaction.user.id)
+        if key not in self._entries and len(self._entries) >= VERIFICATION_RETRY_MAX:
+            self.rejected += 1
+            return False
+        # A newer click replaces the older interaction (its token lives longer)
+        self._entries.pop(key, None)
+        self._entries[key] = (interaction, time.monotonic())
+        self.queued += 1
+        return True
+
+    async def _retry(self, key, interaction):
+        job = verification_queue.submit(interaction)
+        if job is None:
+            return False
+        result = await job.future
+        if result.status == "unavailable":
+            return False
+        try:
+            await interaction.followup.send(embed=build_verification_embed(result), ephemeral=True)
+        except discord.HTTPException as e:
+            log.warning("Error sending retried verification result: %s", e)
+        self.completed += 1
+        return True
+
+    async def run_once(self):
+        now = time.monotonic()
+        for key, (_, queued_at) in list(self._entries.items()):
+            if now - queued_at >= VERIFICATION_RETRY_MAX_AGE:
+                del self._entries[key]
+                self.expired += 1
+
+        if not self._entries or not roblox_http.is_available("users", "groups"):
+            return
+
+        key, probe = next(iter(self._entries.items()))
+        del self._entries[key]
+        with log_context(probe[0].id, probe[0].channel_id):
+            recovered = await self._retry(key, probe[0])
+        entries, self._entries = list(self._entries.items()), OrderedDict()
+        if not recovered:
+            # Try this member again last; only stop if Roblox itself is still down
+            entries.append((key, probe))
+            if not roblox_http.is_available("users", "groups"):
+                self._entries.update(entries)
+                return
+            entries.pop()
+            self._entries[key] = probe
+
+        results = await asyncio.gather(
+            *(self._retry(key, interaction) for key, (interaction, _) in entries),
+            return_exceptions=True
+        )
+        for (key, entry), recovered in zip(entries, results):
+            if recovered is not True:
+                self._entries.setdefault(key, entry)
+
+    def stats(self):
+        return {
+            "waiting": len(self._entries),
+            "queued": self.queued,
+            "completed": self.completed,
+            "expired": self.expired,
+            "rejected": self.rejected,
+        }
+
+
+verification_retries = VerificationRetryQueue()
+
+
+@tasks.loop(seconds=VERIFICATION_RETRY_INTERVAL)
+async def verification_retry_loop():
+    """Retry verifications deferred while Roblox was unavailable"""
+    try:
+        await verification_retries.run_once()
+    except Exception:
+        log.exception("Error retrying deferred verifications")
+
+# ============================================
+# ROLE RECONCILIATION
+# ============================================
+
+@dataclass
+class ReconcileReport:
+    """Summary of one reconciliation pass"""
+    guild_id: int
+    dry_run: bool
+    resumed: bool = False
+    members_scanned: int = 0
+    unresolved: int = 0
+    to_add: int = 0
+    to_remove: int = 0
+    applied: int = 0
+    failed: int = 0
+    skipped: int = 0
+    duration: float = 0.0
+
+
+class RoleReconciler:
+    """Brings the Discord verified role in line with the Roblox group roster
+
+    A pass computes the minimal set of role additions/removals, saves it as
+    a plan file, then applies it through a token bucket. The plan records
+    how far it got, so an interrupted pass can be resumed.
+    """
+
+    def __init__(self, state_dir):
+        self.state_dir = state_dir
+        self._locks = {}
+
+    def _plan_path(self, guild_id):
+        # One file per guild so processes serving different shards never clash
+        return os.path.join(self.state_dir, f"reconcile_{guild_id}.json")
+
+    def _save_plan(self, guild_id, plan):
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = self._plan_path(guild_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(plan, f)
+        os.replace(tmp_path, path)
+
+    def _load_plan(self, guild_id):
+        try:
+            with open(self._plan_path(guild_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _delete_plan(self, guild_id):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._plan_path(guild_id))
+
+    def is_running(self, guild_id):
+        lock = self._locks.get(guild_id)
+        return lock is not None and lock.locked()
+
+    async def _collect_members(self, guild):
+        if guild.chunked:
+            return [member for member in guild.members if not member.bot]
+        return [member async for member in guild.fetch_members(limit=None) if not member.bot]
+
+    async def build_plan(self, guild, role, roster, report):
+        """Diff role holders against the roster; returns [[member_id, "add"|"remove"], ...]"""
+        # Never revoke anything based on an outdated roster
+        if not roster.is_fresh():
+            if IS_PRIMARY_PROCESS:
+                await roster.sync()
+            else:
+                # Only the primary walks the roster; use the snapshot it wrote
+                await roster.reload_if_changed()
+            if not roster.is_fresh():
+                raise RuntimeError("The group roster is out of date; try again once it has synced")
+
+        members = await self._collect_members(guild)
+        report.members_scanned = len(members)
+
+        # Names the identity index already parsed and resolved are reused;
+        # the rest are parsed in one batch and resolved in one batched pass
+        await member_identities.warm(members)
+        identities = [member_identities.lookup(member) for member in members]
+        await member_identities.resolve_many(identities)
+
+        changes = []
+        for member, identity in zip(members, identities):
+            user_data = identity.roblox_user
+            has_role = role in member.roles
+            roblox_id = user_data['id'] if user_data is not None else None
+
+            if has_role and (roblox_id is None or (roblox_id not in roster and not identity.explicit)):
+                # Only an explicit @username or the account the member verified
+                # with may take the role away, never a loose display-name match
+                stored = await verification_store.get(member.id, roster.group_id, roster.role_name)
+                roblox_id = stored.roblox_id if stored is not None else None
+
+            if roblox_id is None:
+                # Unknown identity: leave the member exactly as they are
+                report.unresolved += 1
+                continue
+
+            should_have_role = roblox_id in roster
+            if should_have_role and not has_role:
+                changes.append([member.id, "add"])
+            elif has_role and not should_have_role:
+                changes.append([member.id, "remove"])
+
+        return changes
+
+    async def run(self, guild, dry_run=True, resume=False, progress=None):
+        """Run (or resume) a reconciliation pass for one guild"""
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        if lock.locked():
+            raise RuntimeError("A reconciliation pass is already running for this guild")
+
+        async with lock:
+            started = time.perf_counter()
+            report = ReconcileReport(guild.id, dry_run)
+
+            settings = guild_configs.get(guild)
+            role = settings.verified_role if settings else None
+            if role is None:
+                raise RuntimeError("Verified role not found in this guild")
+
+            # A dry run always diffs afresh; only an applying pass picks up a
+            # saved plan, and only one made for this guild's current role
+            plan = await asyncio.to_thread(self._load_plan, guild.id) if resume and not dry_run else None
+            if plan is not None and (plan.get('guild_id') != guild.id or plan.get('role_id') != role.id):
+                log.warning("Discarding saved reconciliation plan for %s: the verified role has changed", guild.name)
+                plan = None
+
+            if plan is not None:
+                report.resumed = True
+            else:
+                changes = await self.build_plan(guild, role, settings.roster, report)
+                plan = {
+                    "guild_id": guild.id,
+                    "role_id": role.id,
+                    "created_at": time.time(),
+                    "dry_run": dry_run,
+                    "changes": changes,
+                    "next_index": 0,
+                }
+
+            report.to_add = sum(1 for _, action in plan['changes'] if action == "add")
+            report.to_remove = len(plan['changes']) - report.to_add
+
+            if dry_run:
+                report.duration = time.perf_counter() - started
+                return report
+
+            await asyncio.to_thread(self._save_plan, guild.id, plan)
+            await self._apply(guild, role, plan, report, progress)
+            await asyncio.to_thread(self._delete_plan, guild.id)
+
+            report.duration = time.perf_counter() - started
+            return report
+
+    async def _apply(self, guild, role, plan, report, progress):
+        limiter = TokenBucket(RECONCILE_RATE, RECONCILE_BURST)
+        changes = plan['changes']
+        total = len(changes)
+
+        for index in range(plan['next_index'], total):
+            member_id, action = changes[index]
+            await limiter.acquire()
+
+            try:
+                member = await get_or_fetch_member(guild, member_id)
+
+                if action == "add" and role not in member.roles:
+                    await member.add_roles(role, reason="Roblox group reconciliation")
+                    report.applied += 1
+                elif action == "remove" and role in member.roles:
+                    await member.remove_roles(role, reason="Roblox group reconciliation")
+                    report.applied += 1
+                else:
+                    report.skipped += 1
+            except discord.NotFound:
+                # Member left the guild since the plan was built
+                report.skipped += 1
+            except discord.HTTPException as e:
+                report.failed += 1
+                log.warning("Error reconciling member %s: %s", member_id, e)
+
+            plan['next_index'] = index + 1
+            if plan['next_index'] % RECONCILE_CHECKPOINT_EVERY == 0:
+                await asyncio.to_thread(self._save_plan, guild.id, plan)
+                if progress is not None:
+                    await progress(plan['next_index'], total, report)
+
+        if progress is not None:
+            await progress(total, total, report)
+
+
+role_reconciler = RoleReconciler(DATA_DIR)
+
+
+def build_reconcile_embed(report, done=None, total=None):
+    """Build the staff-facing progress/summary embed for a reconciliation pass"""
+    finished = done is None or done >= total
+    if report.dry_run:
+        title = "🔍 Role Reconciliation (Dry Run)"
+    elif finished:
+        title = "✅ Role Reconciliation Complete"
+    else:
+        title = "⏳ Role Reconciliation Running"
+
+    lines = [
+        f"**Members Scanned:** {report.members_scanned}" + (" (resumed plan)" if report.resumed else ""),
+        f"**Unresolved Names:** {report.unresolved}",
+        f"**Roles To Add:** {report.to_add}",
+        f"**Roles To Remove:** {report.to_remove}",
+    ]
+    if not report.dry_run:
+        if done is not None:
+            lines.append(f"**Progress:** {done}/{total}")
+        lines.append(f"**Applied:** {report.applied} • **Skipped:** {report.skipped} • **Failed:** {report.failed}")
+    if report.duration:
+        lines.append(f"**Duration:** {report.duration:.1f}s")
+
+    embed = discord.Embed(
+        title=title,
+        description="\n".join(lines),
+        color=COLOR_SUCCESS if finished else COLOR_WARNING
+    )
+    embed.timestamp = discord.utils.utcnow()
+    return embed
+
+
+@tasks.loop(seconds=RECONCILE_INTERVAL)
+async def reconcile_loop():
+    """Scheduled reconciliation pass over every guild the bot serves"""
+    for guild in bot.guilds:
+        settings = guild_configs.get(guild)
+        if settings is None or settings.verified_role is None or role_reconciler.is_running(guild.id):
+            continue
+        try:
+            report = await role_reconciler.run(guild, dry_run=not RECONCILE_AUTO_APPLY, resume=True)
+            log.info("Reconciled %s", guild.name, extra={"guild_id": guild.id, "report": dataclasses.asdict(report)})
+        except Exception:
+            log.exception("Error reconciling %s", guild.name)
+
+
+@reconcile_loop.before_loop
+async def before_reconcile_loop():
+    await bot.wait_until_ready()
+
+
+# ============================================
+# EMBED TEMPLATES
+# ============================================
+
+class EmbedTemplateRegistry:
+    """Builds each static embed once and hands out cheap per-use copies
+
+    Templates are built by `build_all()` at startup. `render()` copies the
+    template's attributes onto a new Embed, fills in any `{placeholder}`
+    field values and stamps the current time. Copies share nested data
+    with the template, so callers may add fields but must not edit
+    existing ones in place (e.g. `set_field_at`).
+
+    Embeds registered with `cached=False` are mostly placeholders, so
+    copying and filling a template costs more than building them; their
+    builder is called with the values on every `render()` instead.
+    """
+
+    _PLACEHOLDER = re.compile(r"\{\w+\}")
+
+    def __init__(self):
+        self._builders = {}
+        self._direct = set()  # Names built on every render
+        self._attributes = {}
+        self._dynamic_fields = {}
+
+    def register(self, name, cached=True):
+        """Decorator registering a function that builds the template embed"""
+        def decorator(builder):
+            self._builders[name] = builder
+            if not cached:
+                self._direct.add(name)
+            return builder
+        return decorator
+
+    def _build(self, name):
+        payload = self._builders[name]().to_dict()
+        template = discord.Embed.from_dict(payload)
+        attributes = {
+            attr: getattr(template, attr)
+            for attr in discord.Embed.__slots__
+            if hasattr(template, attr)
+        }
+        attributes.setdefault('_fields', [])
+
+        self._attributes[name] = attributes
+        self._dynamic_fields[name] = [
+            index for index, field in enumerate(attributes['_fields'])
+            if self._PLACEHOLDER.search(field['value'])
+        ]
+        return attributes
+
+    def build_all(self):
+        for name in self._builders:
+            if name not in self._direct:
+                self._build(name)
+
+    def render(self, name, **values):
+        """Return a copy of a template with placeholders and timestamp filled in"""
+        if name in self._direct:
+            embed = self._builders[name](**values)
+            embed.timestamp = discord.utils.utcnow()
+            return embed
+
+        attributes = self._attributes.get(name) or self._build(name)
+
+        embed = discord.Embed.__new__(discord.Embed)
+        for attr, value in attributes.items():
+            setattr(embed, attr, value)
+
+        # Own list so add_field()/remove_field() never touch the template
+        fields = embed._fields = list(attributes['_fields'])
+        if values:
+            for index in self._dynamic_fields[name]:
+                field = fields[index]
+                fields[index] = {**field, 'value': field['value'].format(**values)}
+
+        embed.timestamp = discord.utils.utcnow()
+        return embed
+
+
+embed_templates = EmbedTemplateRegistry()
+
+
+@embed_templates.register("main_menu")
+def _main_menu_embed():
+    embed = discord.Embed(
+        title="✦ SENSE Support Center ✦",
+        description=(
+            "**Welcome to SENSE Support!** 💫\n\n"
+            "Thank you for reaching out. Please select one of the options below:"
+        ),
+        color=COLOR_PRIMARY
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "📝 Register Member\n"
+            "Join the SENSE community and get registration steps.\n"
+            "```\n"
+            "```text\n"
+            "❓ Question\n"
+            "Browse FAQs and get instant answers to common questions.\n"
+            "```\n"
+            "```text\n"
+            "✨ Request Role\n"
+            "Verify your membership and get the Attuned Soul role.\n"
+            "```\n"
+            "```text\n"
+            "💬 Live Chat\n"
+            "Connect with a staff member for personalized help.\n"
+            "```\n"
+            "```text\n"
+            "🔒 Close Ticket\n"
+            "All done? Close this ticket.\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value="**Click the button below that matches your need:** ⬇️",
+        inline=False
+    )
+    
+    embed.set_footer(text="SENSE Community • Support Team Available 24/7")
+    return embed
+
+
+@embed_templates.register("registration_guide")
+def _registration_guide_embed():
+    embed = discord.Embed(
+        title="📝 Member Registration Guide",
+        description="**𝜗𝜚⋆₊˚ HOW TO JOIN SENSE CLAN ⋆₊˚𝜗𝜚**\n",
+        color=COLOR_PINK
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "📌 Step 1: Join Our Roblox Community\n"
+            "• Change your display name to: username+sense\n"
+            "• Example: dipsysense\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value="🔗 [Click to Join Community]({group_url})",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "📸 Step 2: Submit Proof\n"
+            "• Screenshot of Roblox profile with new display name\n"
+            "• Screenshot of community join request\n"
+            "• Send both screenshots in this ticket\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "✨ Step 3: Follow Our TikTok\n"
+            "• Follow SENSE on TikTok\n"
+            "• Send screenshot proof of following\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value="🔗 [Follow on TikTok](https://www.tiktok.com/@makeseense?_t=ZS-8vqQi2vaX9c&_r=1)",
+        inline=False
+    )
+    
+    embed.set_footer(text="Registration: Weekends only (Sat-Sun)")
+    return embed
+
+
+@embed_templates.register("faq")
+def _faq_embed():
+    embed = discord.Embed(
+        title="❓ Frequently Asked Questions",
+        description="Select a question below to get help! 💡\n",
+        color=COLOR_PRIMARY
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "1️⃣ How do I join SENSE?\n"
+            "Registration schedule and how to become a member\n"
+            "```\n"
+            "```text\n"
+            "2️⃣ Server Rules\n"
+            "Community guidelines and policies you must follow\n"
+            "```\n"
+            "```text\n"
+            "3️⃣ Game Tutorial\n"
+            "Get help from staff for game tutorials and guidance\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(text="SENSE Community • Support Available 24/7")
+    return embed
+
+
+@embed_templates.register("role_request")
+def _role_request_embed():
+    embed = discord.Embed(
+        title="✨ Request Attuned Soul Role",
+        description="**Choose your verification method:**\n",
+        color=COLOR_WARNING
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "🎮 Automatic Verification\n"
+            "Click 'Request Attuned Soul' to verify automatically.\n"
+            "Bot will check your Roblox group membership.\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "✅ Requirements:\n"
+            "• Must be in our Roblox group\n"
+            "• Must have role: {required_role}\n"
+            "• Discord name must show Roblox username (via Bloxlink)\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "❓ Need Help?\n"
+            "Click 'Help!' if you need manual assistance from staff.\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(text="Choose your verification method below")
+    return embed
+
+
+@embed_templates.register("livechat_request", cached=False)
+def _livechat_request_embed(staff, user):
+    embed = discord.Embed(
+        title="💬 Live Chat Support Requested",
+        description="**Support staff has been notified!**\n",
+        color=COLOR_DANGER
+    )
+    
+    embed.add_field(
+        name="Staff Notification:",
+        value=staff,
+        inline=False
+    )
+    
+    embed.add_field(
+        name="Request Information:",
+        value=(
+            f"**Request from:** {user}\n"
+            "**Status:** 🟢 Staff Notified\n"
+            "**Average Response:** 5-10 minutes"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(text="Thank you for waiting • SENSE Support")
+    return embed
+
+
+@embed_templates.register("faq_schedule")
+def _faq_schedule_embed():
+    embed = discord.Embed(
+        title="📅 Registration Schedule",
+        description="**When can I join SENSE?**\n",
+        color=COLOR_SUCCESS
+    )
+    
+    embed.add_field(
+        name="Registration Schedule:",
+        value=(
+            "• **Open:** Saturdays & Sundays only\n"
+            "• **Closed:** Monday through Friday"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💡 Pro Tips:",
+        value=(
+            "• Follow our social media for notifications\n"
+            "• Watch announcements in this server\n"
+            "• Registration fills up quickly on weekends!"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(text="Registration • Weekend Only")
+    return embed
+
+
+@embed_templates.register("faq_rules")
+def _faq_rules_embed():
+    embed = discord.Embed(
+        title="‿̩͙⊱༻ ♱ GUIDELINES & POLICIES ♱ ༺⊰‿̩͙",
+        description="Please follow these rules to maintain a positive community:\n",
+        color=COLOR_INFO
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "📜 Terms and Conditions\n"
+            "Follow Discord TOS. Must be 15+ years old.\n"
+            "Limited cursing allowed - please be mindful of others.\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "🔞 No NSFW Content\n"
+            "Refrain from posting or discussing explicit content of any kind.\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "🚫 No Controversial Topics\n"
+            "Political or religious discussions are not allowed in this community.\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "⚠️ No Drama\n"
+            "Do not involve SENSE in your personal conflicts.\n"
+            "Drama will result in immediate removal.\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "🤝 Respect Each Other\n"
+            "Show respect to all members, staff, and content creators.\n"
+            "No harassment, doxxing, racism, sexism, or bullying.\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(text="Breaking rules may result in warnings, kicks, or bans")
+    return embed
+
+
+@embed_templates.register("tutorial_request", cached=False)
+def _tutorial_request_embed(staff, user):
+    embed = discord.Embed(
+        title="🎮 Game Tutorial Request",
+        description="**Tutorial assistance requested!**\n",
+        color=COLOR_PRIMARY
+    )
+    
+    embed.add_field(
+        name="Staff Notification:",
+        value=staff,
+        inline=False
+    )
+    
+    embed.add_field(
+        name="Request Details:",
+        value=(
+            f"**Request from:** {user}\n"
+            "**Type:** Game Tutorial Help\n"
+            "**Status:** 🟢 Staff Notified"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(text="Staff will help you master the game!")
+    return embed
+
+
+@embed_templates.register("manual_role_request", cached=False)
+def _manual_role_request_embed(staff, display_name):
+    embed = discord.Embed(
+        title="❓ Manual Role Request",
+        description="**Staff assistance requested!**\n",
+        color=COLOR_INFO
+    )
+    
+    embed.add_field(
+        name="",
+        value=(
+            "```text\n"
+            "📋 Request Details:\n"
+            f"• Requested by: {display_name}\n"
+            "• Type: Manual Role Verification\n"
+            "• Status: 🟡 Pending Staff Review\n"
+            "```"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="",
+        value=f"👥 **Staff Notification:**\n{staff} will assist you shortly.",
+        inline=False
+    )
+    
+    embed.set_footer(text="Thank you for your patience!")
+    return embed
+
+
+@embed_templates.register("staff_already_notified")
+def _staff_already_notified_embed():
+    embed = discord.Embed(
+        title="🟢 Staff Already Notified",
+        description=(
+            "Your request from this ticket is already on the staff list.\n"
+            "Please wait - a staff member will be with you shortly!"
+        ),
+        color=COLOR_INFO
+    )
+    
+    embed.set_footer(text="Thank you for your patience!")
+    return embed
+
+
+@embed_templates.register("close_confirm")
+def _close_confirm_embed():
+    embed = discord.Embed(
+        title="🔒 Close This Ticket?",
+        description=(
+            "Only close the ticket once you have everything you need.\n"
+            f"It will stay readable for {TICKET_DELETE_DELAY // 60} minutes, then it is deleted."
+        ),
+        color=COLOR_WARNING
+    )
+    
+    embed.set_footer(text="Dismiss this message to keep the ticket open")
+    return embed
+
+
+@embed_templates.register("ticket_closed")
+def _ticket_closed_embed():
+    embed = discord.Embed(
+        title="🔒 Ticket Closed",
+        description="Thank you for contacting SENSE Support! 💚",
+        color=COLOR_INFO
+    )
+    
+    embed.add_field(name="Closed By", value="{closed_by}", inline=True)
+    embed.add_field(name="Deleted", value="{delete_at}", inline=True)
+    embed.set_footer(text="SENSE Support")
+    return embed
+
+
+@embed_templates.register("ticket_already_closed")
+def _ticket_already_closed_embed():
+    embed = discord.Embed(
+        title="🔒 Already Closed",
+        description="This ticket is already closed and will be deleted soon.",
+        color=COLOR_INFO
+    )
+    return embed
+
+
+# ============================================
+# UTILITY FUNCTION
+# ============================================
+
+def get_main_menu_embed_and_view():
+    """Create main menu embed and view"""
+    return embed_templates.render("main_menu"), main_menu_view
+
+
+# ============================================
+# TICKET GREETING PIPELINE
+# ============================================
+
+def _percentile(samples, fraction):
+    """Nearest-rank percentile of a sequence of numbers"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class TicketGreeter:
+    """Greets new ticket channels once they are ready, through a paced sender
+
+    New channels wait in `pending` until a readiness signal arrives (the
+    opener's permission overwrite appears, or they post a message), or until
+    GREETING_READY_TIMEOUT passes. Ready channels go onto a bounded queue
+    drained by a few workers that share a token bucket, so a burst of
+    tickets never turns into a burst of sends.
+    """
+
+    def __init__(self):
+        self.queue = asyncio.Queue(GREETING_QUEUE_SIZE)
+        self.pending = {}  # channel id -> (channel, created_at)
+        self._queued = set()
+        self._limiter = TokenBucket(GREETING_RATE, GREETING_BURST)
+        self._tasks = []
+        self.latencies = deque(maxlen=GREETING_LATENCY_SAMPLES)
+        self.greeted = 0
+        self.failed = 0
+        self.dropped = 0
+        self.ready_immediately = 0
+        self.ready_by_signal = 0
+        self.ready_by_timeout = 0
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(GREETING_WORKERS)]
+        self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    def is_ready(channel):
+        """Ticket tools add the opener's member overwrite once permissions are set up"""
+        me = channel.guild.me
+        return any(
+            not isinstance(target, discord.Role) and (me is None or target.id != me.id)
+            for target in channel.overwrites
         )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "1️⃣ How do I join SENSE?\n"
-                "Registration schedule and how to become a member\n"
-                "```\n"
-                "```text\n"
-                "2️⃣ Server Rules\n"
-                "Community guidelines and policies you must follow\n"
-                "```\n"
-                "```text\n"
-                "3️⃣ Game Tutorial\n"
-                "Get help from staff for game tutorials and guidance\n"
-                "```"
-            ),
-            inline=False
+
+    def channel_created(self, channel):
+        """Start tracking a new ticket channel"""
+        if channel.id in self.pending or channel.id in self._queued:
+            return
+        if len(self.pending) >= GREETING_MAX_PENDING:
+            self.dropped += 1
+            log.warning("Greeting dropped for #%s: too many pending tickets", channel.name)
+            return
+
+        self.pending[channel.id] = (channel, time.monotonic())
+        if self.is_ready(channel):
+            self.ready_immediately += 1
+            self._mark_ready(channel.id)
+
+    def channel_updated(self, channel):
+        """Overwrites changed - greet if the ticket is now ready"""
+        if channel.id in self.pending and self.is_ready(channel):
+            self.ready_by_signal += 1
+            self._mark_ready(channel.id, channel)
+
+    def channel_activity(self, channel_id):
+        """Someone posted in the ticket, so it is clearly usable"""
+        if channel_id in self.pending:
+            self.ready_by_signal += 1
+            self._mark_ready(channel_id)
+
+    def channel_deleted(self, channel_id):
+        self.pending.pop(channel_id, None)
+
+    def _mark_ready(self, channel_id, channel=None):
+        entry = self.pending[channel_id]
+        try:
+            self.queue.put_nowait((channel or entry[0], entry[1]))
+        except asyncio.QueueFull:
+            # Stays pending; the sweep retries once the queue drains
+            return
+        del self.pending[channel_id]
+        self._queued.add(channel_id)
+
+    async def _sweep(self):
+        """Release tickets that never sent a readiness signal"""
+        while True:
+            await asyncio.sleep(GREETING_SWEEP_INTERVAL)
+            now = time.monotonic()
+            for channel_id, (_, created_at) in list(self.pending.items()):
+                if now - created_at >= GREETING_READY_TIMEOUT:
+                    self.ready_by_timeout += 1
+                    self._mark_ready(channel_id)
+
+    async def _worker(self):
+        while True:
+            channel, created_at = await self.queue.get()
+            token = log_channel_id.set(channel.id)
+            try:
+                # _queued keeps a channel in the queue at most once, so no two
+                # workers ever greet the same channel
+                await self._limiter.acquire()
+                embed, view = get_main_menu_embed_and_view()
+                await channel.send(embed=embed, view=view)
+                self.greeted += 1
+                self.latencies.append(time.monotonic() - created_at)
+            except discord.HTTPException as e:
+                self.failed += 1
+                log.warning("Error greeting #%s: %s", channel.name, e)
+            except Exception:
+                # Anything else would kill this worker and shrink the pool for good
+                self.failed += 1
+                log.exception("Unexpected error greeting #%s", channel.name)
+            finally:
+                log_channel_id.reset(token)
+                self._queued.discard(channel.id)
+                self.queue.task_done()
+
+    def stats(self):
+        """Return queue depth, readiness breakdown and time-to-greeting percentiles"""
+        p50 = _percentile(self.latencies, 0.50)
+        p99 = _percentile(self.latencies, 0.99)
+        return {
+            "pending": len(self.pending),
+            "queued": self.queue.qsize(),
+            "greeted": self.greeted,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "ready_immediately": self.ready_immediately,
+            "ready_by_signal": self.ready_by_signal,
+            "ready_by_timeout": self.ready_by_timeout,
+            "time_to_greeting_p50": round(p50, 3) if p50 is not None else None,
+            "time_to_greeting_p99": round(p99, 3) if p99 is not None else None,
+        }
+
+
+ticket_greeter = TicketGreeter()
+
+
+def is_ticket_channel(channel):
+    if not isinstance(channel, discord.TextChannel):
+        return False
+    settings = guild_configs.get(channel.guild)
+    return settings is not None and settings.is_ticket_channel(channel)
+
+
+# ============================================
+# EVENT: DETECT NEW TICKET CHANNEL
+# ============================================
+
+@bot.event
+async def on_guild_channel_create(channel):
+    """Auto-greet when ticket is created"""
+    if is_ticket_channel(channel):
+        with log_context(channel_id=channel.id):
+            ticket_greeter.channel_created(channel)
+
+
+@bot.listen('on_guild_channel_update')
+async def ticket_channel_updated(before, after):
+    if before.overwrites != after.overwrites:
+        ticket_greeter.channel_updated(after)
+    # Ticket tools close a ticket by renaming it or moving it out of the category
+    if TRANSCRIPT_ON_CLOSE and is_ticket_channel(before) and not is_ticket_channel(after):
+        transcript_archiver.archive(after, reason="closed")
+
+
+@bot.listen('on_guild_channel_delete')
+async def ticket_channel_deleted(channel):
+    ticket_greeter.channel_deleted(channel.id)
+    await ticket_lifecycle.channel_deleted(channel.id)
+
+
+@bot.listen('on_message')
+async def ticket_channel_message(message):
+    if not message.author.bot:
+        ticket_greeter.channel_activity(message.channel.id)
+
+
+# ============================================
+# STAFF NOTIFICATIONS
+# ============================================
+
+STAFF_REQUEST_LABELS = {
+    "livechat": "💬 Live Chat",
+    "tutorial": "🎮 Game Tutorial",
+    "manual_role": "❓ Manual Role Request",
+}
+
+
+class StaffDigest:
+    """One staff-channel message collecting requests for a time window"""
+
+    def __init__(self):
+        self.opened_at = time.monotonic()
+        self.requests = {}  # (ticket channel id, kind) -> (user mention, ticket mention, kind, unix time)
+        self.message = None
+        self.dirty = False
+        self.flush_task = None
+
+    def is_open(self):
+        return time.monotonic() - self.opened_at < STAFF_DIGEST_WINDOW
+
+
+class StaffNotifier:
+    """Merges staff requests into one digest message per window, edited in place
+
+    Only the message that opens a digest pings the staff role; later
+    requests in the window are added by (debounced) edits. A second request
+    of the same kind from the same ticket within the window is dropped.
+    """
+
+    def __init__(self):
+        self._digests = {}  # guild id -> StaffDigest
+        self.requests = 0
+        self.duplicates = 0
+        self.digests_sent = 0
+        self.digest_edits = 0
+        self.errors = 0
+
+    def notify(self, interaction, kind):
+        """Record a request; returns "queued", "duplicate" or "disabled" (no staff channel)"""
+        settings = guild_configs.get(interaction.guild)
+        channel = settings.staff_channel if settings else None
+        if channel is None:
+            return "disabled"
+
+        digest = self._digests.get(interaction.guild.id)
+        if digest is None or not digest.is_open():
+            digest = self._digests[interaction.guild.id] = StaffDigest()
+
+        key = (interaction.channel.id, kind)
+        if key in digest.requests:
+            self.duplicates += 1
+            return "duplicate"
+
+        digest.requests[key] = (
+            interaction.user.mention,
+            interaction.channel.mention,
+            kind,
+            int(time.time()),
         )
-        
-        embed.set_footer(text="SENSE Community • Support Available 24/7")
-        embed.timestamp = discord.utils.utcnow()
-        
-        await interaction.response.edit_message(embed=embed, view=QuestionView())
-    
-    @discord.ui.button(emoji="✨", style=discord.ButtonStyle.primary, row=0)
-    async def request_role_button(self, interaction: discord.Interaction, button: Button):
-        """Request Attuned Soul Role with Auto-Verification"""
+        self.requests += 1
+        digest.dirty = True
+        if digest.flush_task is None:
+            digest.flush_task = asyncio.create_task(self._flush(digest, channel, settings.staff_role))
+        return "queued"
+
+    @staticmethod
+    def build_digest_embed(digest):
+        lines = [
+            f"**{STAFF_REQUEST_LABELS[kind]}** • {user} in {ticket} • <t:{requested_at}:R>"
+            for user, ticket, kind, requested_at in digest.requests.values()
+        ]
+        if len(lines) > STAFF_DIGEST_MAX_LINES:
+            hidden = len(lines) - STAFF_DIGEST_MAX_LINES
+            lines = lines[:STAFF_DIGEST_MAX_LINES] + [f"*...and {hidden} more*"]
+
         embed = discord.Embed(
-            title="✨ Request Attuned Soul Role",
-            description="**Choose your verification method:**\n",
-            color=COLOR_WARNING
+            title=f"📣 Staff Requests ({len(digest.requests)})",
+            description="\n".join(lines),
+            color=COLOR_DANGER
         )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "🎮 Automatic Verification\n"
-                "Click 'Request Attuned Soul' to verify automatically.\n"
-                "Bot will check your SENSE Roblox group membership.\n"
-                "```"
-            ),
-            inline=False
+        embed.set_footer(text="Updated as new requests arrive • SENSE Support")
+        embed.timestamp = discord.utils.utcnow()
+        return embed
+
+    async def _flush(self, digest, channel, staff_role):
+        try:
+            while digest.dirty:
+                if digest.message is not None:
+                    # Let a few more requests land before editing
+                    await asyncio.sleep(STAFF_DIGEST_EDIT_DELAY)
+                digest.dirty = False
+                embed = self.build_digest_embed(digest)
+
+                if digest.message is None:
+                    digest.message = await channel.send(
+                        content=staff_role.mention if staff_role else None,
+                        embed=embed
+                    )
+                    self.digests_sent += 1
+                else:
+                    await digest.message.edit(embed=embed)
+                    self.digest_edits += 1
+        except discord.HTTPException as e:
+            self.errors += 1
+            log.warning("Error sending staff digest: %s", e)
+        finally:
+            digest.flush_task = None
+
+    def stats(self):
+        """Return request counts and the pings / staff messages the digests avoided"""
+        return {
+            "requests": self.requests,
+            "duplicates_dropped": self.duplicates,
+            "digests_sent": self.digests_sent,
+            "digest_edits": self.digest_edits,
+            "errors": self.errors,
+            # Each request used to ping the role and post its own message
+            "pings_avoided": self.requests + self.duplicates - self.digests_sent,
+            "api_calls_saved": self.requests + self.duplicates - self.digests_sent - self.digest_edits,
+        }
+
+
+staff_notifier = StaffNotifier()
+
+
+# ============================================
+# TICKET TRANSCRIPTS
+# ============================================
+
+def transcript_record(message):
+    """One JSONL line: a message with its embeds and attachment metadata"""
+    author = message.author
+    record = {
+        "kind": "message",
+        "id": message.id,
+        "created_at": message.created_at.isoformat(),
+        "edited_at": message.edited_at.isoformat() if message.edited_at else None,
+        "message_type": message.type.name,
+        "author": {"id": author.id, "name": author.name, "display_name": author.display_name, "bot": author.bot},
+        "content": message.content,
+    }
+    if message.embeds:
+        record["embeds"] = [embed.to_dict() for embed in message.embeds]
+    if message.attachments:
+        record["attachments"] = [
+            {
+                "id": attachment.id,
+                "filename": attachment.filename,
+                "size": attachment.size,
+                "content_type": attachment.content_type,
+                "url": attachment.url,
+            }
+            for attachment in message.attachments
+        ]
+    if message.reference is not None and message.reference.message_id:
+        record["reply_to"] = message.reference.message_id
+    if message.pinned:
+        record["pinned"] = True
+    return record
+
+
+@dataclass
+class TranscriptResult:
+    """One finished archive"""
+    channel_id: int
+    channel_name: str
+    reason: str
+    path: str
+    messages: int
+    attachments: int
+    raw_bytes: int  # JSONL before compression
+    size: int  # Bytes on disk
+    seconds: float
+    upload_url: str = None
+
+
+class TranscriptArchiver:
+    """Streams ticket history into gzip-compressed JSONL archives
+
+    History is read page by page through channel.history(). Every
+    TRANSCRIPT_CHUNK_SIZE messages are handed to a worker thread that
+    encodes and compresses them while the next pages are fetched, so at
+    most two chunks are held in memory however long the ticket is. Files
+    are written as .part and renamed once complete.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._semaphore = asyncio.Semaphore(TRANSCRIPT_CONCURRENCY)
+        self._running = {}  # channel id -> Task
+        self.archived = 0
+        self.failed = 0
+        self.uploaded = 0
+        self.too_large = 0
+        self.messages = 0
+        self.raw_bytes = 0
+        self.bytes_written = 0
+        self.last_seconds = None
+        self.last_rate = None
+
+    def archive(self, channel, reason="manual"):
+        """Start (or join) archiving `channel`; the task resolves to a TranscriptResult or None"""
+        task = self._running.get(channel.id)
+        if task is None:
+            task = asyncio.create_task(self._archive(channel, reason))
+            self._running[channel.id] = task
+            task.add_done_callback(lambda _: self._running.pop(channel.id, None))
+        return task
+
+    async def stop(self):
+        """Give running archives a short grace period, then abandon them"""
+        tasks = list(self._running.values())
+        if not tasks:
+            return
+        _, unfinished = await asyncio.wait(tasks, timeout=TRANSCRIPT_SHUTDOWN_GRACE)
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*unfinished, return_exceptions=True)
+
+    async def _archive(self, channel, reason):
+        async with self._semaphore:
+            token = log_channel_id.set(channel.id)
+            try:
+                result = await self.write(channel, reason)
+                result.upload_url = await self.upload(result, channel.guild)
+            except (discord.HTTPException, OSError) as e:
+                self.failed += 1
+                log.warning("Error archiving #%s: %s", channel.name, e)
+                return None
+            finally:
+                log_channel_id.reset(token)
+
+        log.info("Archived #%s: %d messages in %.1fs", channel.name, result.messages, result.seconds, extra={
+            "reason": reason,
+            "path": result.path,
+            "bytes": result.size,
+            "uploaded": result.upload_url is not None,
+        })
+        return result
+
+    def _path(self, channel):
+        filename = f"{channel.name}-{channel.id}-{int(time.time())}.jsonl.gz"
+        return os.path.join(self.directory, str(channel.guild.id), filename)
+
+    @staticmethod
+    def _open_file(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return gzip.open(path, "wb", compresslevel=TRANSCRIPT_COMPRESS_LEVEL)
+
+    @staticmethod
+    def _write_chunk(file, records):
+        data = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records)
+        data = data.encode("utf-8")
+        file.write(data)
+        return len(data)
+
+    @staticmethod
+    def _finish(file, part_path, path):
+        file.close()
+        os.replace(part_path, path)
+        return os.path.getsize(path)
+
+    @staticmethod
+    def _discard(file, part_path):
+        file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(part_path)
+
+    async def write(self, channel, reason):
+        """Stream the channel's full history to the archive directory"""
+        started = time.perf_counter()
+        path = self._path(channel)
+        part_path = path + ".part"
+        file = await asyncio.to_thread(self._open_file, part_path)
+        chunk = [{
+            "kind": "channel",
+            "id": channel.id,
+            "name": channel.name,
+            "guild_id": channel.guild.id,
+            "category_id": channel.category_id,
+            "reason": reason,
+            "archived_at": discord.utils.utcnow().isoformat(),
+        }]
+        in_flight = None
+        messages = attachments = raw_bytes = 0
+        try:
+            async for message in channel.history(limit=None, oldest_first=True):
+                chunk.append(transcript_record(message))
+                messages += 1
+                attachments += len(message.attachments)
+                if len(chunk) >= TRANSCRIPT_CHUNK_SIZE:
+                    if in_flight is not None:
+                        # Shielded so a cancelled archive never closes the file mid-write
+                        raw_bytes += await asyncio.shield(in_flight)
+                    in_flight = asyncio.create_task(asyncio.to_thread(self._write_chunk, file, chunk))
+                    chunk = []
+            if in_flight is not None:
+                raw_bytes += await asyncio.shield(in_flight)
+                in_flight = None
+            if chunk:
+                raw_bytes += await asyncio.to_thread(self._write_chunk, file, chunk)
+            size = await asyncio.to_thread(self._finish, file, part_path, path)
+        except BaseException:
+            if in_flight is not None:
+                await asyncio.gather(in_flight, return_exceptions=True)
+            await asyncio.to_thread(self._discard, file, part_path)
+            raise
+
+        seconds = time.perf_counter() - started
+        self.archived += 1
+        self.messages += messages
+        self.raw_bytes += raw_bytes
+        self.bytes_written += size
+        self.last_seconds = seconds
+        self.last_rate = messages / seconds if seconds > 0 else None
+        return TranscriptResult(channel.id, channel.name, reason, path, messages, attachments, raw_bytes, size, seconds)
+
+    async def upload(self, result, guild):
+        """Post the archive to the staff transcript channel; returns the message URL"""
+        settings = guild_configs.get(guild)
+        channel = settings.transcript_channel if settings else None
+        if channel is None:
+            return None
+        if result.size > guild.filesize_limit:
+            self.too_large += 1
+            log.warning("Transcript of #%s is too large to upload (%d bytes)", result.channel_name, result.size)
+            return None
+
+        message = await channel.send(
+            embed=build_transcript_embed(result),
+            file=discord.File(result.path, filename=os.path.basename(result.path))
         )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "✅ Requirements:\n"
-                "• Must be in SENSE Roblox group\n"
-                "• Must have role: 💚・Our Lovely Sense Member\n"
-                "• Discord name must show Roblox username (via Bloxlink)\n"
-                "```"
-            ),
-            inline=False
+        self.uploaded += 1
+        if not TRANSCRIPT_KEEP_LOCAL:
+            await asyncio.to_thread(os.remove, result.path)
+        return message.jump_url
+
+    def stats(self):
+        return {
+            "in_progress": len(self._running),
+            "archived": self.archived,
+            "failed": self.failed,
+            "uploaded": self.uploaded,
+            "too_large": self.too_large,
+            "messages": self.messages,
+            "raw_bytes": self.raw_bytes,
+            "bytes_written": self.bytes_written,
+            "last_seconds": round(self.last_seconds, 3) if self.last_seconds is not None else None,
+            "last_messages_per_second": round(self.last_rate) if self.last_rate is not None else None,
+        }
+
+
+transcript_archiver = TranscriptArchiver(TRANSCRIPT_DIR)
+
+
+def build_transcript_embed(result):
+    lines = [
+        f"**Ticket:** #{result.channel_name} (<#{result.channel_id}>)",
+        f"**Messages:** {result.messages:,}",
+        f"**Attachments:** {result.attachments:,}",
+        f"**Size:** {result.size / 1024:,.1f} KiB (from {result.raw_bytes / 1024:,.1f} KiB)",
+        f"**Reason:** {result.reason}",
+    ]
+    if result.upload_url:
+        lines.append(f"**Uploaded:** {result.upload_url}")
+    embed = discord.Embed(
+        title="📜 Ticket Transcript",
+        description="\n".join(lines),
+        color=COLOR_INFO
+    )
+    embed.set_footer(text=f"Archived in {result.seconds:.1f}s • SENSE Support")
+    return embed
+
+
+# ============================================
+# TICKET LIFECYCLE
+# ============================================
+
+@dataclass
+class TicketRecord:
+    """A closed ticket waiting for (or past) deletion"""
+    channel_id: int
+    guild_id: int
+    closed_at: float
+    closed_by: int  # Member id (None when closed for inactivity)
+    reason: str
+    delete_after: float
+    archived_at: float = None
+    reaped_at: float = None
+
+    def row(self):
+        return (
+            self.channel_id, self.guild_id, self.closed_at, self.closed_by,
+            self.reason, self.delete_after, self.archived_at, self.reaped_at,
         )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "❓ Need Help?\n"
-                "Click 'Help!' if you need manual assistance from staff.\n"
-                "```"
-            ),
-            inline=False
+
+
+class TicketStore(SQLiteStore):
+    """Closed tickets, persisted so pending deletions resume after a restart"""
+
+    UPSERT = "INSERT OR REPLACE INTO tickets VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    SELECT_UNREAPED = "SELECT * FROM tickets WHERE reaped_at IS NULL"
+    MARK_ARCHIVED = "UPDATE tickets SET archived_at = ? WHERE channel_id = ?"
+    MARK_REAPED = "UPDATE tickets SET reaped_at = ? WHERE channel_id = ?"
+    PRUNE = "DELETE FROM tickets WHERE reaped_at < ?"
+
+    def _select_unreaped(self):
+        return [TicketRecord(*row) for row in self._conn.execute(self.SELECT_UNREAPED)]
+
+    async def load(self):
+        """Every ticket closed but not yet deleted"""
+        return await self._run(self._select_unreaped)
+
+    async def save(self, record):
+        await self._run(self._transaction, [(self.UPSERT, [record.row()])])
+
+    async def mark_archived(self, channel_id, archived_at):
+        await self._run(self._transaction, [(self.MARK_ARCHIVED, [(archived_at, channel_id)])])
+
+    async def mark_reaped(self, channel_ids, reaped_at):
+        await self._run(self._transaction, [(self.MARK_REAPED, [(reaped_at, channel_id) for channel_id in channel_ids])])
+
+    async def prune(self, before):
+        """Forget tickets deleted before `before`"""
+        await self._run(self._transaction, [(self.PRUNE, [(before,)])])
+
+
+@dataclass
+class TicketSweepReport:
+    open: int = 0
+    closed_inactive: int = 0
+    reaped: int = 0
+    already_deleted: int = 0
+    failed: int = 0
+    waiting: int = 0  # Closed tickets not yet due, or beyond this sweep's batch
+    seconds: float = 0.0
+
+
+class TicketLifecycle:
+    """Closes tickets (close button or inactivity) and deletes them later
+
+    A closed ticket stays readable for TICKET_DELETE_DELAY, then a sweep
+    deletes it, saving a transcript first when TRANSCRIPT_ON_CLOSE is set.
+    Closed tickets are recorded in `store` so pending deletions survive a
+    restart. Each sweep works on every guild concurrently, but within a
+    guild closes and deletions go through that guild's token bucket and
+    stop after TICKET_SWEEP_BATCH, so a backlog of hundreds drains over a
+    few sweeps instead of tripping Discord's rate limits.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.closed = {}  # channel id -> TicketRecord
+        self._reaping = set()  # Channel ids being deleted by a sweep
+        self._limiters = {}  # guild id -> TokenBucket
+        self._archive_failures = {}  # channel id -> failed transcript attempts
+        self._sweep_lock = asyncio.Lock()
+        self.open_tickets = 0
+        self.closed_by_member = 0
+        self.closed_inactive = 0
+        self.reaped = 0
+        self.already_deleted = 0
+        self.reap_failures = 0
+        self.sweeps = 0
+        self.last_sweep_seconds = None
+
+    async def load(self):
+        """Pick up tickets closed before a restart, in the guilds this process serves"""
+        self.closed = {record.channel_id: record for record in await self.store.load() if owns_guild(record.guild_id)}
+        if self.closed:
+            log.info("Resuming %d closed ticket(s) awaiting deletion", len(self.closed))
+
+    def is_closed(self, channel_id):
+        return channel_id in self.closed
+
+    @staticmethod
+    def last_activity(channel):
+        """Unix time of the channel's last message (or its creation), from the gateway cache"""
+        return discord.utils.snowflake_time(channel.last_message_id or channel.id).timestamp()
+
+    def _limiter(self, guild_id):
+        limiter = self._limiters.get(guild_id)
+        if limiter is None:
+            limiter = self._limiters[guild_id] = TokenBucket(TICKET_REAP_RATE, TICKET_REAP_BURST)
+        return limiter
+
+    async def close(self, channel, closed_by=None, reason="inactive"):
+        """Mark a ticket closed and schedule its deletion; False if it already was"""
+        if channel.id in self.closed:
+            return False
+
+        now = time.time()
+        record = TicketRecord(
+            channel.id, channel.guild.id, now, closed_by.id if closed_by else None, reason, now + TICKET_DELETE_DELAY
         )
-        
-        embed.set_footer(text="Choose your verification method below")
-        embed.timestamp = discord.utils.utcnow()
-        
-        await interaction.response.edit_message(embed=embed, view=RoleRequestView())
+        self.closed[channel.id] = record
+        try:
+            await self.store.save(record)
+        except (sqlite3.Error, OSError):
+            del self.closed[channel.id]
+            raise
+        if closed_by is None:
+            self.closed_inactive += 1
+        else:
+            self.closed_by_member += 1
+
+        embed = embed_templates.render(
+            "ticket_closed",
+            closed_by=closed_by.mention if closed_by else "Inactivity",
+            delete_at=f"<t:{int(record.delete_after)}:R>"
+        )
+        with contextlib.suppress(discord.HTTPException):
+            await channel.send(embed=embed)
+        return True
+
+    async def channel_deleted(self, channel_id):
+        """A closed ticket was deleted by someone else"""
+        if channel_id in self._reaping or channel_id not in self.closed:
+            return
+        del self.closed[channel_id]
+        self._archive_failures.pop(channel_id, None)
+        self.already_deleted += 1
+        try:
+            await self.store.mark_reaped([channel_id], time.time())
+        except Exception:
+            # The row stays unreaped; after a restart the sweep finds the channel gone
+            log.exception("Error recording deleted ticket %s", channel_id)
+
+    async def _archive(self, channel, record):
+        """Save a transcript before deletion; False to retry on a later sweep"""
+        result = await transcript_archiver.archive(channel, reason=record.reason)
+        if result is None:
+            failures = self._archive_failures[channel.id] = self._archive_failures.get(channel.id, 0) + 1
+            if failures < TICKET_ARCHIVE_ATTEMPTS:
+                return False
+            log.warning("Deleting #%s without a transcript after %d failed attempts", channel.name, failures)
+            return True
+        record.archived_at = time.time()
+        await self.store.mark_archived(channel.id, record.archived_at)
+        return True
+
+    async def _sweep_guild(self, guild, inactive, due, report):
+        limiter = self._limiter(guild.id)
+        for channel in inactive[:TICKET_SWEEP_BATCH]:
+            await limiter.acquire()
+            if await self.close(channel):
+                report.closed_inactive += 1
+
+        gone = []
+        for record in due[:TICKET_SWEEP_BATCH]:
+            channel = guild.get_channel(record.channel_id)
+            if channel is None:
+                report.already_deleted += 1
+                gone.append(record.channel_id)
+                continue
+            if TRANSCRIPT_ON_CLOSE and record.archived_at is None and not await self._archive(channel, record):
+                report.failed += 1
+                continue
+
+            await limiter.acquire()
+            self._reaping.add(channel.id)
+            try:
+                await channel.delete(reason=f"Ticket {record.reason}")
+            except discord.NotFound:
+                report.already_deleted += 1
+            except discord.HTTPException as e:
+                report.failed += 1
+                log.warning("Error deleting closed ticket #%s: %s", channel.name, e)
+                continue
+            else:
+                report.reaped += 1
+            finally:
+                self._reaping.discard(channel.id)
+            gone.append(record.channel_id)
+
+        if gone:
+            await self.store.mark_reaped(gone, time.time())
+            for channel_id in gone:
+                self.closed.pop(channel_id, None)
+                self._archive_failures.pop(channel_id, None)
+
+    async def sweep(self, guilds):
+        """Close inactive tickets and delete the closed ones that are due"""
+        async with self._sweep_lock:
+            started = time.perf_counter()
+            now = time.time()
+            report = TicketSweepReport()
+
+            due = {}
+            for record in self.closed.values():
+                if record.delete_after <= now:
+                    due.setdefault(record.guild_id, []).append(record)
+                else:
+                    report.waiting += 1
+
+            work = []
+            for guild in guilds:
+                inactive = []
+                settings = guild_configs.get(guild)
+                category = settings.ticket_category if settings else None
+                for channel in getattr(category, "text_channels", ()):
+                    if not settings.is_ticket_channel(channel) or channel.id in self.closed:
+                        continue
+                    report.open += 1
+                    if TICKET_INACTIVITY_TIMEOUT and now - self.last_activity(channel) >= TICKET_INACTIVITY_TIMEOUT:
+                        inactive.append(channel)
+
+                guild_due = sorted(due.get(guild.id, ()), key=lambda record: record.delete_after)
+                report.waiting += max(0, len(guild_due) - TICKET_SWEEP_BATCH)
+                if inactive or guild_due:
+                    work.append(self._sweep_guild(guild, inactive, guild_due, report))
+
+            await asyncio.gather(*work)
+            await self.store.prune(now - TICKET_HISTORY_RETENTION)
+
+            report.open -= report.closed_inactive
+            report.seconds = time.perf_counter() - started
+            self.open_tickets = report.open
+            self.reaped += report.reaped
+            self.already_deleted += report.already_deleted
+            self.reap_failures += report.failed
+            self.sweeps += 1
+            self.last_sweep_seconds = report.seconds
+            return report
+
+    def stats(self):
+        """Return open / closed / reaped ticket counts and the last sweep's duration"""
+        return {
+            "open": self.open_tickets,
+            "closed": len(self.closed),
+            "closed_by_member": self.closed_by_member,
+            "closed_inactive": self.closed_inactive,
+            "reaped": self.reaped,
+            "already_deleted": self.already_deleted,
+            "reap_failures": self.reap_failures,
+            "sweeps": self.sweeps,
+            "last_sweep_ms": round(self.last_sweep_seconds * 1000, 2) if self.last_sweep_seconds is not None else None,
+        }
+
+
+ticket_store = TicketStore(DATABASE_PATH)
+ticket_lifecycle = TicketLifecycle(ticket_store)
+
+
+@tasks.loop(seconds=TICKET_SWEEP_INTERVAL)
+async def ticket_sweep_loop():
+    """Close inactive tickets and reap closed ones"""
+    try:
+        report = await ticket_lifecycle.sweep(bot.guilds)
+    except Exception:
+        log.exception("Error sweeping tickets")
+        return
+    busy = report.closed_inactive or report.reaped or report.already_deleted or report.failed
+    log.log(logging.INFO if busy else logging.DEBUG, "Ticket sweep took %.2fs", report.seconds, extra={
+        "report": dataclasses.asdict(report),
+    })
+
+
+@ticket_sweep_loop.before_loop
+async def before_ticket_sweep_loop():
+    await bot.wait_until_ready()
+
+
+# ============================================
+# PERSISTENT VIEW BASE
+# ============================================
+
+class PersistentView(View):
+    """Menu view with fixed custom_ids, shared by every message that shows it
+
+    One instance per class is registered with `bot.add_view` at startup and
+    handles clicks on any message (including ones sent before a restart).
+    Callbacks only use the interaction, never per-message view state.
+    """
+
+    def __init__(self):
+        super().__init__(timeout=None)
+        for item in self.children:
+            item.callback = instrument_interaction(item.custom_id)(item.callback)
+
+    async def interaction_check(self, interaction):
+        # Callbacks assume the guild has settings; clicks in unconfigured guilds are ignored
+        return interaction.guild is not None and guild_configs.get(interaction.guild) is not None
+
+    def is_dispatchable(self):
+        # The globally registered instance already routes every click, so
+        # sending or editing a message must not store a per-message copy
+        # in discord.py's view store (which would grow forever)
+        return False
+
+
+# ============================================
+# MAIN MENU VIEW
+# ============================================
+
+class MainMenuView(PersistentView):
+    @discord.ui.button(emoji="📝", style=discord.ButtonStyle.primary, row=0, custom_id="sense:main:register")
+    async def register_button(self, interaction: discord.Interaction, button: Button):
+        """Registration Guide Button"""
+        embed = embed_templates.render("registration_guide", **guild_configs.get(interaction.guild).embed_values)
+        await interaction.response.edit_message(embed=embed, view=back_to_main_view)
+    
+    @discord.ui.button(emoji="❓", style=discord.ButtonStyle.primary, row=0, custom_id="sense:main:faq")
+    async def question_button(self, interaction: discord.Interaction, button: Button):
+        """FAQ Menu Button"""
+        embed = embed_templates.render("faq")
+        await interaction.response.edit_message(embed=embed, view=question_view)
+    
+    @discord.ui.button(emoji="✨", style=discord.ButtonStyle.primary, row=0, custom_id="sense:main:role")
+    async def request_role_button(self, interaction: discord.Interaction, button: Button):
+        """Request Attuned Soul Role with Auto-Verification"""
+        embed = embed_templates.render("role_request", **guild_configs.get(interaction.guild).embed_values)
+        await interaction.response.edit_message(embed=embed, view=role_request_view)
     
-    @discord.ui.button(emoji="💬", style=discord.ButtonStyle.primary, row=0)
+    @discord.ui.button(emoji="💬", style=discord.ButtonStyle.primary, row=0, custom_id="sense:main:livechat")
     async def livechat_button(self, interaction: discord.Interaction, button: Button):
         """Live Chat Request Button"""
-        role = interaction.guild.get_role(ATTUNED_SOUL_ROLE_ID)
+        if staff_notifier.notify(interaction, "livechat") == "duplicate":
+            await interaction.response.send_message(embed=embed_templates.render("staff_already_notified"), ephemeral=True)
+            return
         
-        embed = discord.Embed(
-            title="💬 Live Chat Support Requested",
-            description="**Support staff has been notified!**\n",
-            color=COLOR_DANGER
+        embed = embed_templates.render(
+            "livechat_request",
+            staff=guild_configs.get(interaction.guild).staff_mention,
+            user=interaction.user.mention
         )
         
-        embed.add_field(
-            name="Staff Notification:",
-            value=f"{role.mention if role else '@Attuned Soul'}",
-            inline=False
-        )
+        await interaction.response.send_message(embed=embed, ephemeral=False)
+    
+    @discord.ui.button(label="🔒 Close Ticket", style=discord.ButtonStyle.secondary, row=1, custom_id="sense:main:close")
+    async def close_ticket_button(self, interaction: discord.Interaction, button: Button):
+        """Ask before closing the ticket"""
+        if ticket_lifecycle.is_closed(interaction.channel.id):
+            await interaction.response.send_message(embed=embed_templates.render("ticket_already_closed"), ephemeral=True)
+            return
         
-        embed.add_field(
-            name="Request Information:",
-            value=(
-                f"**Request from:** {interaction.user.mention}\n"
-                f"**Status:** 🟢 Staff Notified\n"
-                f"**Average Response:** 5-10 minutes"
-            ),
-            inline=False
+        # A fresh view per click: discord.py stores it for this one ephemeral
+        # message and drops it on timeout, so the shared views stay untouched
+        await interaction.response.send_message(
+            embed=embed_templates.render("close_confirm"),
+            view=CloseTicketView(),
+            ephemeral=True
         )
+
+
+# ============================================
+# CLOSE TICKET CONFIRMATION VIEW
+# ============================================
+
+class CloseTicketView(View):
+    """Short-lived confirmation sent with one ephemeral message, never shared"""
+
+    def __init__(self):
+        super().__init__(timeout=TICKET_CLOSE_CONFIRM_TIMEOUT)
+        self.confirm.callback = instrument_interaction("sense:close:confirm")(self.confirm.callback)
+
+    @discord.ui.button(label="🔒 Close Ticket", style=discord.ButtonStyle.danger)
+    async def confirm(self, interaction: discord.Interaction, button: Button):
+        self.stop()
+        if not is_ticket_channel(interaction.channel) or ticket_lifecycle.is_closed(interaction.channel.id):
+            await interaction.response.edit_message(embed=embed_templates.render("ticket_already_closed"), view=None)
+            return
         
-        embed.set_footer(text="Thank you for waiting • SENSE Support")
-        embed.timestamp = discord.utils.utcnow()
-        
-        await interaction.response.send_message(embed=embed, ephemeral=False)
+        await interaction.response.edit_message(
+            embed=discord.Embed(title="🔒 Closing ticket...", color=COLOR_INFO),
+            view=None
+        )
+        try:
+            await ticket_lifecycle.close(interaction.channel, interaction.user, f"closed by {interaction.user}")
+        except (sqlite3.Error, OSError):
+            log.exception("Error closing ticket #%s", interaction.channel.name)
+            embed = discord.Embed(
+                title="❌ Close Failed",
+                description="Couldn't save this ticket's closure. Try again in a moment.",
+                color=COLOR_DANGER
+            )
+            await interaction.edit_original_response(embed=embed)
 
 
 # ============================================
 # BACK TO MAIN VIEW
 # ============================================
 
-class BackToMainView(View):
-    def __init__(self):
-        super().__init__(timeout=None)
-    
-    @discord.ui.button(label="⬅️ Back", style=discord.ButtonStyle.secondary)
+class BackToMainView(PersistentView):
+    @discord.ui.button(label="⬅️ Back", style=discord.ButtonStyle.secondary, custom_id="sense:back_to_main")
     async def back(self, interaction: discord.Interaction, button: Button):
         embed, view = get_main_menu_embed_and_view()
         await interaction.response.edit_message(embed=embed, view=view)
@@ -365,148 +4688,35 @@ class BackToMainView(View):
 # QUESTION SUBMENU VIEW
 # ============================================
 
-class QuestionView(View):
-    def __init__(self):
-        super().__init__(timeout=None)
-    
-    @discord.ui.button(emoji="1️⃣", style=discord.ButtonStyle.primary, row=0)
+class QuestionView(PersistentView):
+    @discord.ui.button(emoji="1️⃣", style=discord.ButtonStyle.primary, row=0, custom_id="sense:faq:schedule")
     async def q1_button(self, interaction: discord.Interaction, button: Button):
         """Question 1: How to Join"""
-        embed = discord.Embed(
-            title="📅 Registration Schedule",
-            description="**When can I join SENSE?**\n",
-            color=COLOR_SUCCESS
-        )
-        
-        embed.add_field(
-            name="Registration Schedule:",
-            value=(
-                "• **Open:** Saturdays & Sundays only\n"
-                "• **Closed:** Monday through Friday"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="💡 Pro Tips:",
-            value=(
-                "• Follow our social media for notifications\n"
-                "• Watch announcements in this server\n"
-                "• Registration fills up quickly on weekends!"
-            ),
-            inline=False
-        )
-        
-        embed.set_footer(text="Registration • Weekend Only")
-        embed.timestamp = discord.utils.utcnow()
-        
-        await interaction.response.edit_message(embed=embed, view=BackToQuestionView())
+        embed = embed_templates.render("faq_schedule")
+        await interaction.response.edit_message(embed=embed, view=back_to_question_view)
     
-    @discord.ui.button(emoji="2️⃣", style=discord.ButtonStyle.primary, row=0)
+    @discord.ui.button(emoji="2️⃣", style=discord.ButtonStyle.primary, row=0, custom_id="sense:faq:rules")
     async def q2_button(self, interaction: discord.Interaction, button: Button):
         """Question 2: Server Rules"""
-        embed = discord.Embed(
-            title="‿̩͙⊱༻ ♱ GUIDELINES & POLICIES ♱ ༺⊰‿̩͙",
-            description="Please follow these rules to maintain a positive community:\n",
-            color=COLOR_INFO
-        )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "📜 Terms and Conditions\n"
-                "Follow Discord TOS. Must be 15+ years old.\n"
-                "Limited cursing allowed - please be mindful of others.\n"
-                "```"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "🔞 No NSFW Content\n"
-                "Refrain from posting or discussing explicit content of any kind.\n"
-                "```"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "🚫 No Controversial Topics\n"
-                "Political or religious discussions are not allowed in this community.\n"
-                "```"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "⚠️ No Drama\n"
-                "Do not involve SENSE in your personal conflicts.\n"
-                "Drama will result in immediate removal.\n"
-                "```"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "🤝 Respect Each Other\n"
-                "Show respect to all members, staff, and content creators.\n"
-                "No harassment, doxxing, racism, sexism, or bullying.\n"
-                "```"
-            ),
-            inline=False
-        )
-        
-        embed.set_footer(text="Breaking rules may result in warnings, kicks, or bans")
-        embed.timestamp = discord.utils.utcnow()
-        
-        await interaction.response.edit_message(embed=embed, view=BackToQuestionView())
+        embed = embed_templates.render("faq_rules")
+        await interaction.response.edit_message(embed=embed, view=back_to_question_view)
     
-    @discord.ui.button(emoji="3️⃣", style=discord.ButtonStyle.primary, row=0)
+    @discord.ui.button(emoji="3️⃣", style=discord.ButtonStyle.primary, row=0, custom_id="sense:faq:tutorial")
     async def q3_button(self, interaction: discord.Interaction, button: Button):
         """Question 3: Game Tutorial"""
-        role = interaction.guild.get_role(ATTUNED_SOUL_ROLE_ID)
-        
-        embed = discord.Embed(
-            title="🎮 Game Tutorial Request",
-            description="**Tutorial assistance requested!**\n",
-            color=COLOR_PRIMARY
-        )
-        
-        embed.add_field(
-            name="Staff Notification:",
-            value=f"{role.mention if role else '@Attuned Soul'}",
-            inline=False
-        )
+        if staff_notifier.notify(interaction, "tutorial") == "duplicate":
+            await interaction.response.send_message(embed=embed_templates.render("staff_already_notified"), ephemeral=True)
+            return
         
-        embed.add_field(
-            name="Request Details:",
-            value=(
-                f"**Request from:** {interaction.user.mention}\n"
-                f"**Type:** Game Tutorial Help\n"
-                f"**Status:** 🟢 Staff Notified"
-            ),
-            inline=False
+        embed = embed_templates.render(
+            "tutorial_request",
+            staff=guild_configs.get(interaction.guild).staff_mention,
+            user=interaction.user.mention
         )
         
-        embed.set_footer(text="Staff will help you master the game!")
-        embed.timestamp = discord.utils.utcnow()
-        
         await interaction.response.send_message(embed=embed, ephemeral=False)
     
-    @discord.ui.button(label="⬅️ Back", style=discord.ButtonStyle.secondary, row=0)
+    @discord.ui.button(label="⬅️ Back", style=discord.ButtonStyle.secondary, row=0, custom_id="sense:faq:back")
     async def back(self, interaction: discord.Interaction, button: Button):
         embed, view = get_main_menu_embed_and_view()
         await interaction.response.edit_message(embed=embed, view=view)
@@ -516,231 +4726,131 @@ class QuestionView(View):
 # BACK TO QUESTION VIEW
 # ============================================
 
-class BackToQuestionView(View):
-    def __init__(self):
-        super().__init__(timeout=None)
-    
-    @discord.ui.button(label="⬅️ Back to FAQ", style=discord.ButtonStyle.secondary)
+class BackToQuestionView(PersistentView):
+    @discord.ui.button(label="⬅️ Back to FAQ", style=discord.ButtonStyle.secondary, custom_id="sense:back_to_faq")
     async def back(self, interaction: discord.Interaction, button: Button):
-        embed = discord.Embed(
-            title="❓ Frequently Asked Questions",
-            description="Select a question below to get help! 💡\n",
-            color=COLOR_PRIMARY
-        )
-        
-        embed.add_field(
-            name="",
-            value=(
-                "```text\n"
-                "1️⃣ How do I join SENSE?\n"
-                "Registration schedule and how to become a member\n"
-                "```\n"
-                "```text\n"
-                "2️⃣ Server Rules\n"
-                "Community guidelines and policies you must follow\n"
-                "```\n"
-                "```text\n"
-                "3️⃣ Game Tutorial\n"
-                "Get help from staff for game tutorials and guidance\n"
-                "```"
-            ),
-            inline=False
-        )
-        
-        embed.set_footer(text="SENSE Community • Support Available 24/7")
-        embed.timestamp = discord.utils.utcnow()
-        
-        await interaction.response.edit_message(embed=embed, view=QuestionView())
+        embed = embed_templates.render("faq")
+        await interaction.response.edit_message(embed=embed, view=question_view)
 
 
 # ============================================
 # ROLE REQUEST VIEW (AUTO VERIFICATION)
 # ============================================
 
-class RoleRequestView(View):
-    def __init__(self):
-        super().__init__(timeout=None)
-    
-    @discord.ui.button(label="👑 Request Attuned Soul", style=discord.ButtonStyle.success, row=0)
+class RoleRequestView(PersistentView):
+    @discord.ui.button(label="👑 Request Attuned Soul", style=discord.ButtonStyle.success, row=0, custom_id="sense:role:verify")
     async def verify_roblox_button(self, interaction: discord.Interaction, button: Button):
         """Verify Roblox Group Membership and Give Role"""
         
         # Defer response
         await interaction.response.defer(ephemeral=True)
         
-        # Extract Roblox username from Discord name
-        display_name = interaction.user.display_name
-        roblox_username = extract_roblox_username(display_name)
-        
-        if not roblox_username:
-            embed = discord.Embed(
-                title="❌ Cannot Find Roblox Username",
-                description=(
-                    "I couldn't find your Roblox username in your Discord name.\n\n"
-                    "**Please make sure:**\n"
-                    "• You've linked your Roblox account with Bloxlink\n"
-                    "• Your Discord nickname shows your Roblox username\n"
-                    "• Example: `@uppucs` or `uppucs`\n\n"
-                    "💡 Use `/verify` command with Bloxlink to link your account."
-                ),
-                color=COLOR_DANGER
-            )
-            await interaction.followup.send(embed=embed, ephemeral=True)
+        # Repeated clicks join the verification already queued for this member
+        job = verification_queue.submit(interaction)
+        if job is None:
+            await interaction.followup.send(embed=build_verification_busy_embed(), ephemeral=True)
             return
         
-        # Get Roblox user data
-        user_data = await get_roblox_user_by_username(roblox_username)
-        
-        if not user_data:
-            embed = discord.Embed(
-                title="❌ Roblox Account Not Found",
-                description=(
-                    f"Couldn't find Roblox account: `{roblox_username}`\n\n"
-                    "**Please check:**\n"
-                    "• Your Discord name matches your Roblox username\n"
-                    "• You've linked with Bloxlink correctly\n"
-                    "• The username is spelled correctly"
-                ),
-                color=COLOR_DANGER
+        # Fast verifications answer directly; slow ones show a queue position first
+        message = None
+        done, _ = await asyncio.wait((job.future,), timeout=VERIFICATION_NOTICE_DELAY)
+        if not done:
+            message = await interaction.followup.send(
+                embed=build_verification_queued_embed(verification_queue.position(job)),
+                ephemeral=True,
+                wait=True
             )
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            return
-        
-        user_id = user_data['id']
-        
-        # Check group membership and role
-        is_verified, role_info = await check_group_membership_and_role(
-            user_id, 
-            ROBLOX_GROUP_ID, 
-            REQUIRED_ROLE_NAME
-        )
-        
-        if is_verified:
-            # SUCCESS - Give Discord role
-            role = interaction.guild.get_role(DISCORD_VERIFIED_ROLE_ID)
-            
-            if role:
-                try:
-                    await interaction.user.add_roles(role)
-                    
-                    embed = discord.Embed(
-                        title="✅ Verification Successful!",
-                        description=(
-                            f"**Welcome to SENSE, {user_data['displayName']}!** 💚\n\n"
-                            f"You've been verified and given the Attuned Soul role!"
-                        ),
-                        color=COLOR_SUCCESS
-                    )
-                    
-                    embed.add_field(
-                        name="✅ Verified Information:",
-                        value=(
-                            f"**Roblox Username:** {user_data['name']}\n"
-                            f"**Roblox Display Name:** {user_data['displayName']}\n"
-                            f"**Group Role:** {REQUIRED_ROLE_NAME}\n"
-                            f"**Discord Role:** {role.mention}"
-                        ),
-                        inline=False
-                    )
-                    
-                    embed.set_thumbnail(url=f"https://www.roblox.com/headshot-thumbnail/image?userId={user_id}&width=150&height=150&format=png")
-                    embed.set_footer(text="Verification completed successfully!")
-                    embed.timestamp = discord.utils.utcnow()
-                    
-                    await interaction.followup.send(embed=embed, ephemeral=True)
-                    
-                except Exception as e:
-                    embed = discord.Embed(
-                        title="⚠️ Role Error",
-                        description=f"Verification passed but couldn't give role: {str(e)}",
-                        color=COLOR_DANGER
-                    )
-                    await interaction.followup.send(embed=embed, ephemeral=True)
-            else:
-                embed = discord.Embed(
-                    title="⚠️ Configuration Error",
-                    description="Attuned Soul role not found. Please contact staff.",
-                    color=COLOR_DANGER
-                )
-                await interaction.followup.send(embed=embed, ephemeral=True)
+        try:
+            result = await job.future
+        except Exception as e:
+            log.exception("Error verifying %s", interaction.user)
+            result = VerificationResult("error", error=str(e))
         
-        else:
-            # FAILED - Show reason
-            embed = discord.Embed(
-                title="❌ Verification Failed",
-                description=(
-                    f"**Roblox Account:** {user_data['displayName']} (@{user_data['name']})\n"
-                    f"**Reason:** {role_info}\n\n"
-                    "**Requirements:**\n"
-                    "✅ Must join **SENSE of our heart** group\n"
-                    "✅ Must have role: **💚・Our Lovely Sense Member**\n\n"
-                    "🔗 [Join Group Here](https://www.roblox.com/communities/35908807/SENSE-of-our-heart#!/about)"
-                ),
-                color=COLOR_DANGER
-            )
-            
-            embed.set_thumbnail(url=f"https://www.roblox.com/headshot-thumbnail/image?userId={user_id}&width=150&height=150&format=png")
-            embed.set_footer(text="Join the group with correct role and try again!")
-            embed.timestamp = discord.utils.utcnow()
-            
+        will_retry = result.status == "unavailable" and verification_retries.add(interaction)
+        embed = build_verification_embed(result, will_retry)
+        if message is None:
             await interaction.followup.send(embed=embed, ephemeral=True)
+        else:
+            await message.edit(embed=embed)
     
-    @discord.ui.button(label="❓ Help!", style=discord.ButtonStyle.secondary, row=0)
+    @discord.ui.button(label="❓ Help!", style=discord.ButtonStyle.secondary, row=0, custom_id="sense:role:help")
     async def manual_help_button(self, interaction: discord.Interaction, button: Button):
         """Manual Role Request for Staff Help"""
-        role = interaction.guild.get_role(ATTUNED_SOUL_ROLE_ID)
-        
-        embed = discord.Embed(
-            title="❓ Manual Role Request",
-            description="**Staff assistance requested!**\n",
-            color=COLOR_INFO
-        )
+        status = staff_notifier.notify(interaction, "manual_role")
+        if status == "duplicate":
+            await interaction.response.send_message(embed=embed_templates.render("staff_already_notified"), ephemeral=True)
+            return
         
-        embed.add_field(
-            name="",
-            value=(
-                f"```text\n"
-                f"📋 Request Details:\n"
-                f"• Requested by: {interaction.user.display_name}\n"
-                f"• Type: Manual Role Verification\n"
-                f"• Status: 🟡 Pending Staff Review\n"
-                f"```"
-            ),
-            inline=False
-        )
+        staff = guild_configs.get(interaction.guild).staff_mention
         
-        embed.add_field(
-            name="",
-            value=f"👥 **Staff Notification:**\n{role.mention if role else '@Attuned Soul'} will assist you shortly.",
-            inline=False
+        embed = embed_templates.render(
+            "manual_role_request",
+            staff=staff,
+            display_name=interaction.user.display_name
         )
         
-        embed.set_footer(text="Thank you for your patience!")
-        embed.timestamp = discord.utils.utcnow()
-        
+        # Staff are pinged by the digest when a staff channel is configured
         await interaction.response.send_message(
-            content=f"{role.mention if role else '@Attuned Soul'}",
+            content=staff if status == "disabled" else None,
             embed=embed,
             ephemeral=False
         )
     
-    @discord.ui.button(label="⬅️ Back", style=discord.ButtonStyle.secondary, row=0)
+    @discord.ui.button(label="⬅️ Back", style=discord.ButtonStyle.secondary, row=0, custom_id="sense:role:back")
     async def back(self, interaction: discord.Interaction, button: Button):
         embed, view = get_main_menu_embed_and_view()
         await interaction.response.edit_message(embed=embed, view=view)
 
 
+# ============================================
+# PERSISTENT VIEW INSTANCES
+# ============================================
+
+# Built by build_persistent_views() from setup_hook, not at import time:
+# a View created before the event loop runs has no stop future, and
+# discord.py then silently drops every click dispatched to it
+main_menu_view = None
+back_to_main_view = None
+question_view = None
+back_to_question_view = None
+role_request_view = None
+
+PERSISTENT_VIEWS = ()
+
+
+def build_persistent_views():
+    """Create the shared menu views; must run on the bot's event loop"""
+    global main_menu_view, back_to_main_view, question_view, back_to_question_view
+    global role_request_view, PERSISTENT_VIEWS
+    if PERSISTENT_VIEWS:
+        return PERSISTENT_VIEWS
+    asyncio.get_running_loop()  # Raises outside the loop instead of building dead views
+    main_menu_view = MainMenuView()
+    back_to_main_view = BackToMainView()
+    question_view = QuestionView()
+    back_to_question_view = BackToQuestionView()
+    role_request_view = RoleRequestView()
+    PERSISTENT_VIEWS = (
+        main_menu_view,
+        back_to_main_view,
+        question_view,
+        back_to_question_view,
+        role_request_view,
+    )
+    return PERSISTENT_VIEWS
+
+
 # ============================================
 # SLASH COMMANDS
 # ============================================
 
 @bot.tree.command(name="sense", description="Open SENSE Support Center (Only in ticket channels)")
+@instrument_interaction("/sense")
 async def sense_command(interaction: discord.Interaction):
     """Slash command to open SENSE Support Center"""
     
     # Check if command is used in a ticket channel
-    if not (interaction.channel.category_id == TICKET_CATEGORY_ID and 
-            TICKET_CHANNEL_PREFIX in interaction.channel.name.lower()):
+    if not is_ticket_channel(interaction.channel):
         embed = discord.Embed(
             title="❌ Invalid Channel",
             description="This command can only be used in ticket channels!",
@@ -754,25 +4864,316 @@ async def sense_command(interaction: discord.Interaction):
     await interaction.response.send_message(embed=embed, view=view)
 
 
+@bot.tree.command(name="sense-refresh", description="Clear a member's cached Roblox verification result (Staff)")
+@app_commands.describe(member="Member whose Roblox group status changed")
+@app_commands.default_permissions(manage_roles=True)
+@app_commands.guild_only()
+@instrument_interaction("/sense-refresh")
+async def sense_refresh_command(interaction: discord.Interaction, member: discord.Member):
+    """Staff command to invalidate one member's cached group verdict"""
+    settings = guild_configs.get(interaction.guild)
+    if settings is None:
+        embed = discord.Embed(
+            title="⚠️ Not Configured",
+            description="Verification isn't set up for this server.",
+            color=COLOR_DANGER
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return
+
+    await interaction.response.defer(ephemeral=True)
+    group_id = settings.config.roblox_group_id
+
+    identity = member_identities.lookup(member)
+    try:
+        user_data = await member_identities.resolve(identity) if identity.username else None
+    except RobloxAPIError:
+        embed = discord.Embed(
+            title="⏳ Roblox Unavailable",
+            description="Roblox isn't responding right now. Try again in a few minutes.",
+            color=COLOR_WARNING
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        return
+
+    if not user_data:
+        embed = discord.Embed(
+            title="❌ Roblox Account Not Found",
+            description=f"Couldn't resolve a Roblox account from {member.mention}'s name.",
+            color=COLOR_DANGER
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        return
+
+    required_role = settings.config.required_role_name
+    was_cached = invalidate_group_membership(user_data['id'], group_id, required_role)
+    was_stored = await verification_store.get(member.id, group_id, required_role) is not None
+    verification_store.forget(member.id, group_id, required_role)
+    embed = discord.Embed(
+        title="🔄 Verification Cache Cleared",
+        description=(
+            f"**Member:** {member.mention}\n"
+            f"**Roblox Account:** {user_data['displayName']} (@{user_data['name']})\n"
+            f"**Cached Result:** {'Cleared' if was_cached or was_stored else 'Nothing cached'}\n\n"
+            "Their next verification will check Roblox again."
+        ),
+        color=COLOR_SUCCESS
+    )
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(name="sense-reconcile", description="Sync the verified role with the Roblox group (Staff)")
+@app_commands.describe(
+    dry_run="Only report what would change (default: True)",
+    resume="Continue an interrupted pass instead of starting over"
+)
+@app_commands.default_permissions(manage_roles=True)
+@app_commands.guild_only()
+@instrument_interaction("/sense-reconcile")
+async def sense_reconcile_command(interaction: discord.Interaction, dry_run: bool = True, resume: bool = False):
+    """Staff command to run a role reconciliation pass"""
+    if role_reconciler.is_running(interaction.guild.id):
+        embed = discord.Embed(
+            title="⏳ Already Running",
+            description="A reconciliation pass is already running for this server.",
+            color=COLOR_WARNING
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return
+
+    await interaction.response.defer(ephemeral=True)
+    message = await interaction.followup.send(
+        embed=discord.Embed(title="⏳ Building reconciliation plan...", color=COLOR_WARNING),
+        ephemeral=True,
+        wait=True
+    )
+
+    last_update = 0.0
+
+    async def report_progress(done, total, report):
+        nonlocal last_update
+        now = time.monotonic()
+        if done < total and now - last_update < RECONCILE_PROGRESS_INTERVAL:
+            return
+        last_update = now
+        with contextlib.suppress(discord.HTTPException):
+            await message.edit(embed=build_reconcile_embed(report, done, total))
+
+    try:
+        report = await role_reconciler.run(interaction.guild, dry_run=dry_run, resume=resume, progress=report_progress)
+    except Exception as e:
+        embed = discord.Embed(
+            title="❌ Reconciliation Failed",
+            description=f"{e}\n\nRun again with `resume: True` to continue where it stopped.",
+            color=COLOR_DANGER
+        )
+        await message.edit(embed=embed)
+        return
+
+    await message.edit(embed=build_reconcile_embed(report))
+
+
+@bot.tree.command(name="transcript", description="Archive this ticket's full history (Staff)")
+@app_commands.default_permissions(manage_messages=True)
+@app_commands.guild_only()
+@instrument_interaction("/transcript")
+async def transcript_command(interaction: discord.Interaction):
+    """Staff command to save a ticket transcript"""
+    if not is_ticket_channel(interaction.channel):
+        embed = discord.Embed(
+            title="❌ Invalid Channel",
+            description="This command can only be used in ticket channels!",
+            color=COLOR_DANGER
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return
+
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    result = await transcript_archiver.archive(interaction.channel, reason=f"requested by {interaction.user}")
+    if result is None:
+        embed = discord.Embed(
+            title="❌ Transcript Failed",
+            description="Couldn't read or save this ticket's history. Try again in a moment.",
+            color=COLOR_DANGER
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        return
+
+    embed = build_transcript_embed(result)
+    # Without a staff upload, hand the file straight to the requester
+    if result.upload_url is None and result.size <= interaction.guild.filesize_limit:
+        file = discord.File(result.path, filename=os.path.basename(result.path))
+        await interaction.followup.send(embed=embed, file=file, ephemeral=True)
+    else:
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+# ============================================
+# SLASH COMMAND SYNC
+# ============================================
+
+def command_tree_hash(tree, application_id):
+    """Stable hash of the command tree payload Discord would receive"""
+    commands_payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda command: (command.get('type', 1), command['name'])
+    )
+    blob = json.dumps(
+        {"application_id": application_id, "commands": commands_payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _read_command_tree_hash():
+    try:
+        with open(COMMAND_TREE_HASH_PATH, encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _write_command_tree_hash(tree_hash):
+    os.makedirs(os.path.dirname(COMMAND_TREE_HASH_PATH) or ".", exist_ok=True)
+    tmp_path = f"{COMMAND_TREE_HASH_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(tree_hash)
+    os.replace(tmp_path, COMMAND_TREE_HASH_PATH)
+
+
+async def sync_command_tree(client, force=False):
+    """Upload the command tree only when it changed since the last sync"""
+    started = time.perf_counter()
+    tree_hash = command_tree_hash(client.tree, client.application_id)
+
+    if not force and tree_hash == await asyncio.to_thread(_read_command_tree_hash):
+        log.info("Slash commands unchanged, sync skipped (%.1fms)", (time.perf_counter() - started) * 1000)
+        return
+
+    try:
+        synced = await client.tree.sync()
+    except Exception as e:
+        log.error("Failed to sync commands: %s", e)
+        return
+
+    await asyncio.to_thread(_write_command_tree_hash, tree_hash)
+    log.info("Synced %d slash command(s) in %.2fs", len(synced), time.perf_counter() - started)
+
+
+# ============================================
+# SHARD MONITORING
+# ============================================
+
+class ShardMonitor:
+    """Per-shard latency and handled-event rates"""
+
+    def __init__(self):
+        self.events = {}  # shard id -> events handled since start
+        self._last_report = {}  # shard id -> event count at the last report
+        self._last_report_at = time.monotonic()
+
+    def shard_for(self, guild_id):
+        """Shard that receives events for a guild (Discord's sharding formula)"""
+        shard_count = bot.shard_count or 1
+        return (guild_id >> 22) % shard_count if guild_id else 0
+
+    def record(self, guild_id):
+        shard_id = self.shard_for(guild_id)
+        self.events[shard_id] = self.events.get(shard_id, 0) + 1
+
+    def latencies(self):
+        if isinstance(bot, commands.AutoShardedBot):
+            return dict(bot.latencies)
+        return {0: bot.latency}
+
+    def report(self):
+        """Return {shard id: {latency, events, events_per_second}} since the last report"""
+        now = time.monotonic()
+        elapsed = max(now - self._last_report_at, 1e-9)
+        result = {}
+        for shard_id, latency in self.latencies().items():
+            total = self.events.get(shard_id, 0)
+            recent = total - self._last_report.get(shard_id, 0)
+            result[shard_id] = {
+                "latency_ms": round(latency * 1000, 1) if math.isfinite(latency) else None,
+                "events": total,
+                "events_per_second": round(recent / elapsed, 2),
+            }
+        self._last_report = dict(self.events)
+        self._last_report_at = now
+        return result
+
+
+shard_monitor = ShardMonitor()
+
+
+@tasks.loop(seconds=SHARD_REPORT_INTERVAL)
+async def shard_report_loop():
+    """Log per-shard latency and event rate"""
+    for shard_id, stats in shard_monitor.report().items():
+        log.info("Shard %s report", shard_id, extra={"shard_id": shard_id, **stats})
+
+
+@shard_report_loop.before_loop
+async def before_shard_report_loop():
+    await bot.wait_until_ready()
+
+
+@bot.listen('on_interaction')
+async def shard_count_interaction(interaction):
+    shard_monitor.record(interaction.guild_id)
+
+
+@bot.listen('on_message')
+async def shard_count_message(message):
+    shard_monitor.record(message.guild.id if message.guild else None)
+
+
+@bot.listen('on_guild_channel_create')
+async def shard_count_channel_create(channel):
+    shard_monitor.record(channel.guild.id)
+
+
+@bot.listen('on_shard_ready')
+async def shard_ready(shard_id):
+    log.info("Shard %s ready", shard_id, extra={"shard_id": shard_id})
+
+
+@bot.listen('on_shard_resumed')
+async def shard_resumed(shard_id):
+    log.info("Shard %s resumed", shard_id, extra={"shard_id": shard_id})
+
+
 # ============================================
 # BOT EVENTS
 # ============================================
 
 @bot.event
 async def on_ready():
-    print(f'✅ SENSE Bot Online')
-    print(f'🤖 Bot: {bot.user.name}')
-    print(f'📋 Servers: {len(bot.guilds)}')
-    print(f'🎮 Roblox Group: {ROBLOX_GROUP_ID}')
-    print(f'✅ Required Role: {REQUIRED_ROLE_NAME}')
-    print(f'🎫 Discord Verified Role: {DISCORD_VERIFIED_ROLE_ID}')
-    
-    # Sync slash commands
-    try:
-        synced = await bot.tree.sync()
-        print(f'✅ Synced {len(synced)} slash command(s)')
-    except Exception as e:
-        print(f'❌ Failed to sync commands: {e}')
+    log.info("SENSE bot online as %s", bot.user.name, extra={
+        "lean_mode": LEAN_MODE,
+        "guilds": len(bot.guilds),
+        "shard_count": bot.shard_count or 1,
+        "shard_ids": SHARD_IDS or "all",
+        "guild_config": guild_configs.stats(),
+    })
+    log.info("Component stats", extra={
+        "roblox_pool": roblox_http.pool_stats(),
+        "roblox_limits": roblox_http.limiter_stats(),
+        "roblox_user_cache": roblox_user_cache.stats(),
+        "username_batcher": username_batcher.stats(),
+        "group_membership_cache": group_membership_cache.stats(),
+        "rosters": {f"{roster.group_id}/{roster.role_name}": roster.stats() for roster in group_rosters},
+        "identity_index": member_identities.stats(),
+        "verification_store": verification_store.stats(),
+        "ticket_greeter": ticket_greeter.stats(),
+        "verification_queue": verification_queue.stats(),
+        "staff_notifier": staff_notifier.stats(),
+        "transcripts": transcript_archiver.stats(),
+        "tickets": ticket_lifecycle.stats(),
+    })
 
 
 @bot.event
@@ -783,15 +5184,30 @@ async def on_command_error(ctx, error):
         return
     
     # Log other errors
-    print(f'Error: {error}')
+    log.error("Command error: %s", error, exc_info=error)
 
 
 # ============================================
 # RUN BOT
 # ============================================
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SENSE Ticket Handler bot")
+    parser.add_argument(
+        "--sync-commands",
+        action="store_true",
+        help="Upload slash commands on startup even if they haven't changed"
+    )
+    args = parser.parse_args()
+    FORCE_COMMAND_SYNC = args.sync_commands
+    
     # Get token from environment variables
     token = os.getenv('DISCORD_BOT_TOKEN')
     if not token:
         raise ValueError("No token found. Make sure DISCORD_BOT_TOKEN is set in .env file")
-    bot.run(token)
\ No newline at end of file
+
+    log_listener = setup_logging()
+    try:
+        # discord.py logs through the root logger's queue handler instead of its own
+        bot.run(token, log_handler=None)
+    finally:
+        log_listener.stop()
\ No newline at end of file